@@ -49,6 +49,43 @@ def infer_archive_format(file_name: FSPathType) -> ArchivalFormat:
     )
 
 
+_BLOSC_SHUFFLE = {
+    Blosc.NOSHUFFLE: "noshuffle",
+    Blosc.SHUFFLE: "shuffle",
+    Blosc.BITSHUFFLE: "bitshuffle",
+    Blosc.AUTOSHUFFLE: "shuffle",
+}
+
+
+def to_zarr_array_kwargs(**kwargs) -> dict[str, Any]:
+    """
+    Translate compression kwargs for `zarr.Group.create_array`.
+
+    zarr>=3 takes a list of zarr codecs as `compressors`, and rejects
+    numcodecs compressors passed as `compressor`, as in zarr 2.
+    A numcodecs Blosc compressor is converted to the equivalent
+    `zarr.codecs.BloscCodec`.
+
+    Parameters
+    -----------
+    **kwargs : compression kwargs, e.g., from `Archiver.get_default_compression`
+
+    Returns
+    -----------
+    dict of kwargs accepted by `zarr.Group.create_array`
+    """
+    if (compressor := kwargs.pop("compressor", None)) is not None:
+        if isinstance(compressor, Blosc):
+            compressor = zarr.codecs.BloscCodec(
+                cname=compressor.cname,
+                clevel=compressor.clevel,
+                shuffle=_BLOSC_SHUFFLE[compressor.shuffle],
+                blocksize=compressor.blocksize,
+            )
+        kwargs["compressors"] = [compressor]
+    return kwargs
+
+
 class Archiver(BaseModel):
     """Define base archival methods."""
 
@@ -62,7 +99,9 @@ class Archiver(BaseModel):
             }
         elif format == ArchivalFormat.ZARR:
             return {
-                "compressor": Blosc(clevel=9),
+                "compressors": [
+                    zarr.codecs.BloscCodec(cname="lz4", clevel=9, shuffle="shuffle")
+                ],
             }
         return {}
 
@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
+import zlib
+from contextlib import nullcontext
+from functools import cache
 from typing import TYPE_CHECKING
 
 import h5py
 import numpy as np
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pathlib import Path
 import zarr
 
@@ -16,14 +20,23 @@ from emmet.archival.base import Archiver
 from emmet.archival.utils import CompressionType
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
+    from contextlib import AbstractContextManager
     from os import PathLike
+    from typing import Any, BinaryIO
     from typing_extensions import Self
     from types import ModuleType
 
 DEFAULT_RAW_ARCHIVE_NAME = Path("calc_archive")
+DEFAULT_STREAM_CHUNK_SIZE = 8 * 1024**2
+DEFAULT_STREAM_THRESHOLD = 64 * 1024**2
+# Files at most this size are compressed with a zstd dictionary, if one is set
+ZSTD_DICT_MAX_SIZE = 128 * 1024
+# Group at the root of an archive holding the zstd dictionaries used in it
+ZSTD_DICTIONARY_GROUP = "_zstd_dictionaries"
 
 
+@cache
 def _get_compress_lib(compression: CompressionType) -> ModuleType:
     """Get standard compression library."""
     if compression == CompressionType.GZIP:
@@ -40,6 +53,170 @@ def _get_compress_lib(compression: CompressionType) -> ModuleType:
         raise ValueError(f"Unknown compression scheme: {compression}")
 
 
+class ZstdDictionaryError(ValueError):
+    """Raised when data needs a zstd dictionary which is not registered."""
+
+
+class _GzipCodec:
+    """Compress and decompress single-member gzip data."""
+
+    compression = CompressionType.GZIP
+
+    def compress(self, data: bytes, zstd_dict_id: int | None = None) -> bytes:
+        # wbits = 31 writes a gzip header and trailer
+        return zlib.compress(data, 9, wbits=31)
+
+    def decompress(self, data: bytes) -> bytes:
+        try:
+            return zlib.decompress(data, wbits=31)
+        except zlib.error:
+            # e.g., multi-member gzip files
+            return _get_compress_lib(self.compression).decompress(data)
+
+
+class _ZstdCodec:
+    """Compress and decompress zstd data, reusing compression contexts.
+
+    Compressors are cached per thread and per dictionary. Dictionaries
+    used to decompress a frame are looked up from the ID in its header.
+    """
+
+    compression = CompressionType.ZSTD
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self.dictionaries: dict[int, Any] = {}
+
+    def _get_compressor(self, zstd_dict_id: int | None) -> Any:
+        if not hasattr(self._local, "compressors"):
+            self._local.compressors = {}
+        if (compressor := self._local.compressors.get(zstd_dict_id)) is None:
+            zstd = _get_compress_lib(self.compression)
+            compressor = zstd.ZstdCompressor(
+                zstd_dict=self.dictionaries[zstd_dict_id] if zstd_dict_id else None
+            )
+            self._local.compressors[zstd_dict_id] = compressor
+        return compressor
+
+    def compress(self, data: bytes, zstd_dict_id: int | None = None) -> bytes:
+        return self._get_compressor(zstd_dict_id).compress(
+            data, mode=_get_compress_lib(self.compression).ZstdCompressor.FLUSH_FRAME
+        )
+
+    def decompress(self, data: bytes) -> bytes:
+        zstd = _get_compress_lib(self.compression)
+        if dict_id := zstd.get_frame_info(data).dictionary_id:
+            if dict_id not in self.dictionaries:
+                raise ZstdDictionaryError(
+                    f"Data was compressed with zstd dictionary {dict_id}, "
+                    "which has not been registered."
+                )
+            return zstd.decompress(data, zstd_dict=self.dictionaries[dict_id])
+        return zstd.decompress(data)
+
+
+_ZSTD_CODEC = _ZstdCodec()
+_CODECS: dict[CompressionType, _GzipCodec | _ZstdCodec] = {
+    CompressionType.GZIP: _GzipCodec(),
+    CompressionType.ZSTD: _ZSTD_CODEC,
+}
+# All magic bytes differ in their first two bytes
+_CODECS_BY_PREFIX = {k.value[:2]: v for k, v in _CODECS.items()}
+
+
+def detect_compression(data: bytes) -> CompressionType | None:
+    """Identify the compression of data from its magic bytes, if any."""
+    if (codec := _CODECS_BY_PREFIX.get(data[:2])) and data.startswith(
+        codec.compression.value
+    ):
+        return codec.compression
+    return None
+
+
+def to_compression_type(
+    compression: CompressionType | str | None,
+) -> CompressionType | None:
+    """Convert the name or value of a compression method to a CompressionType."""
+    if isinstance(compression, str):
+        return (
+            CompressionType[compression]
+            if compression in CompressionType.__members__
+            else CompressionType(compression)
+        )
+    return compression
+
+
+def register_zstd_dictionary(dict_content: bytes) -> int:
+    """Register a zstd dictionary for compression and decompression.
+
+    Dictionaries used to compress files are also written to the archive,
+    and are registered automatically when those files are read.
+
+    Parameters
+    -----------
+    dict_content : bytes
+        The content of the dictionary, e.g., from `train_zstd_dictionary`.
+
+    Returns
+    -----------
+    int, the ID of the dictionary, to use as `FileArchiveBase.zstd_dict_id`.
+    """
+    zstd_dict = _get_compress_lib(CompressionType.ZSTD).ZstdDict(dict_content)
+    _ZSTD_CODEC.dictionaries[zstd_dict.dict_id] = zstd_dict
+    return zstd_dict.dict_id
+
+
+def train_zstd_dictionary(
+    samples: Iterable[str | bytes], dict_size: int = 16 * 1024
+) -> bytes:
+    """Train a zstd dictionary on samples of small files, e.g., INCARs.
+
+    Parameters
+    -----------
+    samples : Iterable of str or bytes
+        The contents of representative files.
+    dict_size : int
+        The maximum size of the dictionary in bytes.
+
+    Returns
+    -----------
+    bytes, the content of the dictionary.
+    """
+    return (
+        _get_compress_lib(CompressionType.ZSTD)
+        .train_dict(
+            [s.encode() if isinstance(s, str) else s for s in samples], dict_size
+        )
+        .dict_content
+    )
+
+
+def _get_compressor(compression: CompressionType) -> Any:
+    """Get a streaming compressor with `compress` and `flush` methods."""
+    if compression == CompressionType.GZIP:
+        # wbits = 31 writes a gzip header and trailer
+        return zlib.compressobj(9, zlib.DEFLATED, 31)
+    return _get_compress_lib(compression).ZstdCompressor()
+
+
+class FileArchivalReport(BaseModel):
+    """Summary of a single file written to an archive."""
+
+    archive: str | None = Field(None, description="The archive the file is in.")
+    group_key: str | None = Field(
+        None, description="The group in the archive holding the calculation."
+    )
+    file_key: str = Field(description="The key of the file within its group.")
+    bytes_in: int = Field(description="The number of uncompressed bytes read.")
+    bytes_out: int | None = Field(
+        None,
+        description=(
+            "The number of bytes written to the archive, "
+            "before any compression by the archive format itself."
+        ),
+    )
+
+
 def _scan_dir(fsspec: PathLike, depth: int | None) -> list[Path]:
     """Recursively scan a directory, accounting for depth relative to the parent.
 
@@ -106,6 +283,108 @@ def _get_path_relative_to_parent(path: Path, parent: Path) -> Path:
     return Path(leaf)
 
 
+def _to_attr_value(value: Any) -> Any:
+    """Convert an HDF5 attribute to a JSON-serializable zarr attribute."""
+    if isinstance(value, np.ndarray | np.generic):
+        value = value.tolist()
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, list):
+        return [_to_attr_value(v) for v in value]
+    return value
+
+
+def copy_hdf5_like(
+    source: h5py.Group | h5py.Dataset | zarr.Group | zarr.Array,
+    dest: h5py.Group | zarr.Group,
+    name: str,
+) -> None:
+    """Recursively copy a group or dataset between HDF5 and zarr hierarchies.
+
+    Parameters
+    -----------
+    source : h5py or zarr Group, or h5py.Dataset or zarr.Array
+        The group or dataset to copy.
+    dest : h5py or zarr Group
+        The group to copy `source` into.
+    name : str
+        The name of the copy within `dest`.
+
+    Returns
+    -----------
+    None, all data written to `dest`.
+    """
+    if isinstance(source, h5py.HLObject) and isinstance(dest, h5py.Group):
+        dest.copy(source, dest, name=name)
+        return
+
+    copied: h5py.HLObject | zarr.Group | zarr.Array
+    if isinstance(source, h5py.Dataset | zarr.Array) and (
+        source.ndim == 0 or source.dtype.kind == "O"
+    ):
+        data = np.asarray(source[()])
+        if isinstance(dest, h5py.Group):
+            copied = dest.create_dataset(name, data=data)
+        else:
+            copied = dest.create_array(name, shape=data.shape, dtype=data.dtype)
+            copied[...] = data
+    elif isinstance(source, h5py.Dataset | zarr.Array):
+        # copy blocks of rows, so that large datasets are never fully in memory
+        if isinstance(dest, h5py.Group):
+            copied = dest.create_dataset(name, shape=source.shape, dtype=source.dtype)
+        else:
+            copied = dest.create_array(name, shape=source.shape, dtype=source.dtype)
+        num_rows = max(source.shape[0], 1)
+        row_bytes = max(source.dtype.itemsize * source.size // num_rows, 1)
+        rows_per_block = max(DEFAULT_STREAM_CHUNK_SIZE // row_bytes, 1)
+        for start in range(0, source.shape[0], rows_per_block):
+            stop = min(start + rows_per_block, source.shape[0])
+            copied[start:stop] = source[start:stop]
+    else:
+        copied = dest.create_group(name)
+        for key in source:
+            copy_hdf5_like(source[key], copied, key)  # type: ignore[arg-type]
+
+    if isinstance(dest, h5py.Group):
+        copied.attrs.update(dict(source.attrs))
+    else:
+        copied.attrs.update({k: _to_attr_value(v) for k, v in source.attrs.items()})
+
+
+def _register_archived_zstd_dictionaries(
+    dset: h5py.Dataset | zarr.Array,
+) -> bool:
+    """Register the zstd dictionaries stored closest to a dataset.
+
+    Parameters
+    -----------
+    dset : h5py.Dataset or zarr.Array
+        The dataset to look for dictionaries above, in its parent groups.
+
+    Returns
+    -----------
+    bool, whether any dictionaries were found.
+    """
+    parts = (dset.name if isinstance(dset, h5py.Dataset) else dset.path).split("/")
+    for iparent in range(len(parts) - 1, -1, -1):
+        parent_path = "/".join(parts[:iparent])
+        if isinstance(dset, h5py.Dataset):
+            parent = dset.file[parent_path or "/"]
+        else:
+            try:
+                parent = zarr.open_group(store=dset.store, path=parent_path, mode="r")
+            except zarr.errors.GroupNotFoundError:
+                continue
+        if ZSTD_DICTIONARY_GROUP in parent:
+            dictionaries = parent[ZSTD_DICTIONARY_GROUP]
+            for dict_key in dictionaries:
+                register_zstd_dictionary(
+                    np.asarray(dictionaries[dict_key][:]).tobytes()
+                )
+            return True
+    return False
+
+
 def walk_hierarchical_data(
     hd: h5py.Group | zarr.Group,
     key: str = "/",
@@ -129,6 +408,9 @@ def walk_hierarchical_data(
     datasets: list[str] = []
 
     def _walk_hierarchical_data(g, k):
+        if os.path.basename(k) == ZSTD_DICTIONARY_GROUP:
+            # archive metadata, rather than a file
+            return
         if isinstance(g[k], h5py.Dataset | zarr.Array):
             datasets.append(k)
         elif isinstance(g[k], h5py.Group | zarr.Group):
@@ -144,6 +426,13 @@ class FileArchiveBase(Archiver):
     compression: CompressionType | None = Field(
         CompressionType.ZSTD, description="Which compression method to use, if any."
     )
+    zstd_dict_id: int | None = Field(
+        None,
+        description=(
+            "The ID of a registered zstd dictionary, used to compress small files "
+            "with zstd. See `register_zstd_dictionary`."
+        ),
+    )
 
     def _compress(self, data: str | bytes) -> bytes:
         """Compress string or byte data if needed."""
@@ -151,8 +440,12 @@ class FileArchiveBase(Archiver):
             (not self.compression) or data.startswith(self.compression.value)
         ):
             return data
-        return _get_compress_lib(self.compression).compress(
-            data.encode() if isinstance(data, str) else data
+        data = data.encode() if isinstance(data, str) else data
+        return _CODECS[self.compression].compress(  # type: ignore[index]
+            data,
+            zstd_dict_id=(
+                self.zstd_dict_id if len(data) <= ZSTD_DICT_MAX_SIZE else None
+            ),
         )
 
     @staticmethod
@@ -161,22 +454,46 @@ class FileArchiveBase(Archiver):
     ) -> bytes:
         """Decompress byte data if needed."""
 
-        try_compress = []
         if compression == CompressionType.AUTO_DETECT:
-            try_compress.extend(
-                [v for v in CompressionType if v != CompressionType.AUTO_DETECT]
-            )
-        elif compression in CompressionType:
-            try_compress.append(compression)
+            compression = detect_compression(data)
+        elif compression is not None and not data.startswith(compression.value):
+            compression = None
 
-        for compress_method in [v for v in try_compress if data.startswith(v.value)]:
+        if compression is not None:
             try:
-                return _get_compress_lib(compress_method).decompress(data)
+                return _CODECS[compression].decompress(data)
+            except ZstdDictionaryError:
+                raise
             except Exception:
                 pass
 
         return data
 
+    def _write_zstd_dictionary(self, group: h5py.Group | zarr.Group) -> None:
+        """Store the zstd dictionary used to compress files, if any, in `group`.
+
+        Parameters
+        -----------
+        group : h5py or zarr Group
+            The root of the archive.
+
+        Returns
+        -----------
+        None, the dictionary is written to `group`.
+        """
+        if not self.zstd_dict_id or self.compression != CompressionType.ZSTD:
+            return
+        dict_key = f"{ZSTD_DICTIONARY_GROUP}/{self.zstd_dict_id}"
+        if dict_key in group:
+            return
+        dict_content = np.frombuffer(
+            _ZSTD_CODEC.dictionaries[self.zstd_dict_id].dict_content, dtype=np.uint8
+        )
+        if isinstance(group, h5py.Group):
+            group.create_dataset(dict_key, data=dict_content)
+        else:
+            group.create_array(dict_key, data=dict_content)
+
     def _writeout(
         self,
         group: h5py.Group | zarr.Group,
@@ -203,26 +520,109 @@ class FileArchiveBase(Archiver):
         -----------
         None, all data written to `group`.
         """
-        dset_cnstr = (
-            group.create_dataset
-            if isinstance(group, h5py.Group)
-            else group.create_array
-        )
         compressed = self._compress(data) if compress else data
         orig_len = len(compressed)
-        dset = dset_cnstr(
-            file_key,
-            data=compressed,  # type: ignore[arg-type]
-            dtype=h5py.string_dtype(length=orig_len),
-        )
+        if isinstance(group, h5py.Group):
+            dset = group.create_dataset(
+                file_key,
+                data=compressed,  # type: ignore[arg-type]
+                dtype=h5py.string_dtype(length=orig_len),
+            )
+        else:
+            # zarr has no fixed-length byte strings, so write a byte
+            # dataset as `_stream_writeout` does
+            dset = group.create_array(
+                file_key, data=np.frombuffer(compressed, dtype=np.uint8)
+            )
         dset.attrs["len"] = orig_len
 
+    def _stream_writeout(
+        self,
+        group: h5py.Group | zarr.Group,
+        file_key: str,
+        stream: BinaryIO,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        lock: AbstractContextManager | None = None,
+    ) -> tuple[int, int]:
+        """Compress a file chunk-by-chunk into a byte dataset.
+
+        Unlike `_writeout`, the file and its compressed form are never
+        held in memory in full. The compressed bytes are appended to a
+        resizable, one-dimensional uint8 dataset.
+
+        Parameters
+        -----------
+        group : h5py or zarr Group
+            The hierarchical data structure to add data to.
+        file_key : str
+            The name of the dataset / name of the file.
+        stream : binary file-like
+            The open file to read from.
+        chunk_size : int
+            The number of bytes to read and write at a time.
+        lock : context manager or None (default)
+            If specified, held whenever the archive is written to,
+            so that several files can be compressed concurrently.
+
+        Returns
+        -----------
+        The number of bytes read and written.
+        """
+        lock = lock or nullcontext()
+        with lock:
+            if isinstance(group, h5py.Group):
+                dset = group.create_dataset(
+                    file_key,
+                    shape=(0,),
+                    maxshape=(None,),
+                    dtype=np.uint8,
+                    chunks=(chunk_size,),
+                )
+            else:
+                dset = group.create_array(
+                    file_key, shape=(0,), dtype=np.uint8, chunks=(chunk_size,)
+                )
+
+        bytes_in = 0
+        bytes_out = 0
+        compressor = None
+        buffer = bytearray()
+
+        def _flush(final: bool = False) -> None:
+            nonlocal bytes_out, buffer
+            while buffer and (final or len(buffer) >= chunk_size):
+                piece = bytes(buffer[:chunk_size])
+                buffer = buffer[chunk_size:]
+                with lock:
+                    dset.resize((bytes_out + len(piece),))
+                    dset[bytes_out:] = np.frombuffer(piece, dtype=np.uint8)
+                bytes_out += len(piece)
+
+        while data := stream.read(chunk_size):
+            if (
+                bytes_in == 0
+                and self.compression
+                and (not data.startswith(self.compression.value))
+            ):
+                compressor = _get_compressor(self.compression)
+            bytes_in += len(data)
+            buffer += compressor.compress(data) if compressor else data
+            _flush()
+
+        if compressor:
+            buffer += compressor.flush()
+        _flush(final=True)
+
+        with lock:
+            dset.attrs["len"] = bytes_out
+        return bytes_in, bytes_out
+
     @classmethod
     def _readout(
         cls,
         group: h5py.Group | zarr.Group,
         file_key: str,
-        decompress: CompressionType | None = CompressionType.AUTO_DETECT,
+        decompress: CompressionType | str | None = CompressionType.AUTO_DETECT,
     ) -> bytes:
         """Read and decompress string from a hierarchical dataset.
 
@@ -232,10 +632,10 @@ class FileArchiveBase(Archiver):
             The hierarchical data structure to read data from.
         file_key : str
             The name of the h5py.dataset or zarr.Array to extract.
-        compress : CompressionType | None = CompressionType.AUTO_DETECT
+        decompress : CompressionType | str | None = CompressionType.AUTO_DETECT
             Whether to decompress data.
-            With `decompress` set to a CompressionType, will attempt to
-            decompress data using that standard.
+            With `decompress` set to a CompressionType, or its name, will
+            attempt to decompress data using that standard.
             If set to CompressionType.AUTO_DETECT, will attempt to infer
             the compression type.
             If set to None, will not attempt to decompress data.
@@ -244,14 +644,28 @@ class FileArchiveBase(Archiver):
         -----------
         bytes : the byte content of the dataset
         """
-        if (
-            len(data := np.array(group[file_key]).tolist())  # type: ignore[operator]
-            < group[file_key].attrs["len"]
-        ):
-            # h5py strips out null bytes
-            data += b"\x00" * (group[file_key].attrs["len"] - len(data))  # type: ignore[operator]
+        dset = group[file_key]
+        if dset.dtype == np.uint8:
+            # Written by `_stream_writeout`
+            data = np.asarray(dset[:]).tobytes()  # type: ignore[index]
+        else:
+            # Read the fixed-length bytes directly, as converting to a bytes
+            # scalar strips trailing null bytes.
+            if isinstance(dset, h5py.Dataset):
+                buffer = np.empty(dset.shape, dtype=dset.dtype)
+                dset.read_direct(buffer)
+            else:
+                buffer = np.asarray(dset[()])  # type: ignore[index]
+            data = buffer.tobytes()[: dset.attrs["len"]]  # type: ignore[union-attr]
 
-        return cls._decompress(data) if decompress else data
+        if not (decompress := to_compression_type(decompress)):
+            return data
+        try:
+            return cls._decompress(data, compression=decompress)
+        except ZstdDictionaryError:
+            if not _register_archived_zstd_dictionaries(dset):
+                raise
+            return cls._decompress(data, compression=decompress)
 
 
 class FileArchive(FileArchiveBase):
@@ -300,6 +714,7 @@ class FileArchive(FileArchiveBase):
             else:
                 stem = str(_stem)
             self._writeout(group[stem], f.name, f.read_bytes())
+        self._write_zstd_dictionary(group)
 
     @classmethod
     def _extract_from_hdf5_like(
@@ -307,7 +722,7 @@ class FileArchive(FileArchiveBase):
         group: h5py.Group | zarr.Group,
         keys: Sequence[str] | None = None,
         output_dir: PathLike | None = None,
-        compression: CompressionType | None = CompressionType.AUTO_DETECT,
+        compression: CompressionType | str | None = CompressionType.AUTO_DETECT,
     ) -> list[Path]:
         """Extract all files in a hierarchical archive.
 
@@ -320,7 +735,7 @@ class FileArchive(FileArchiveBase):
             If None, retrieves all files.
         output_dir : Pathlike or None (default)
             Where to extract data to, defaults to `calc_archive`.
-        compression : CompressionType | None= CompressionType.AUTO_DETECT
+        compression : CompressionType | str | None = CompressionType.AUTO_DETECT
             Decompression method to use, see `_readout` for an explanation.
 
         Returns
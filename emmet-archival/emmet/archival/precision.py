@@ -0,0 +1,391 @@
+"""Define lossy precision policies for archiving floating point data."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pa_co
+import pyarrow.parquet as pq
+import zarr
+from pydantic import BaseModel, Field, model_validator
+
+from emmet.core.types.enums import ValueEnum
+
+from emmet.archival.base import ArchivalFormat, Archiver
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+    from typing_extensions import Self
+
+    from emmet.core.types.typing import FSPathType
+
+PRECISION_METADATA_KEY = "emmet_precision"
+
+
+class FloatPrecision(ValueEnum):
+    """How floating point data is stored in an archive."""
+
+    FLOAT64 = "float64"
+    FLOAT32 = "float32"
+    QUANTIZED = "quantized"
+
+
+def _smallest_int_dtype(values: np.ndarray) -> type[np.signedinteger]:
+    """Get the smallest signed integer type which can hold `values`."""
+    lo, hi = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32):
+        if np.iinfo(dtype).min <= lo and hi <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _map_float_leaves(
+    array: pa.Array, func: Callable[[pa.Array], pa.Array]
+) -> pa.Array:
+    """Apply `func` to every floating point leaf of a possibly nested array."""
+    typ = array.type
+    mask = array.is_null() if array.null_count else None
+    if pa.types.is_struct(typ):
+        children = [_map_float_leaves(child, func) for child in array.flatten()]
+        return pa.StructArray.from_arrays(
+            children,
+            fields=[
+                pa.field(field.name, child.type, field.nullable, field.metadata)
+                for field, child in zip(typ, children)
+            ],
+            mask=mask,
+        )
+    if pa.types.is_map(typ):
+        return pa.MapArray.from_arrays(
+            array.offsets,
+            _map_float_leaves(array.keys, func),
+            _map_float_leaves(array.items, func),
+        )
+    if pa.types.is_fixed_size_list(typ):
+        return pa.FixedSizeListArray.from_arrays(
+            _map_float_leaves(array.flatten(), func), typ.list_size, mask=mask
+        )
+    if pa.types.is_list(typ) or pa.types.is_large_list(typ):
+        return type(array).from_arrays(
+            array.offsets, _map_float_leaves(array.values, func), mask=mask
+        )
+    if pa.types.is_floating(typ):
+        return func(array)
+    return array
+
+
+def _parquet_leaf_paths(typ: pa.DataType, path: str) -> list[tuple[str, pa.DataType]]:
+    """Get the Parquet column path and type of every leaf of a possibly nested type."""
+    if pa.types.is_struct(typ):
+        return [
+            leaf
+            for field in typ
+            for leaf in _parquet_leaf_paths(field.type, f"{path}.{field.name}")
+        ]
+    if pa.types.is_map(typ):
+        return _parquet_leaf_paths(
+            typ.key_type, f"{path}.key_value.key"
+        ) + _parquet_leaf_paths(typ.item_type, f"{path}.key_value.value")
+    if (
+        pa.types.is_list(typ)
+        or pa.types.is_large_list(typ)
+        or pa.types.is_fixed_size_list(typ)
+    ):
+        return _parquet_leaf_paths(typ.value_type, f"{path}.list.element")
+    return [(path, typ)]
+
+
+class PrecisionPolicy(BaseModel):
+    """Opt-in policy for storing floating point data with reduced precision.
+
+    With `precision = "quantized"`, values are stored as the nearest integer
+    multiple of a step size just under `2 * abs_tol` or `2 * rel_tol * max(|x|)`,
+    so that the error on each value, including that of rounding when decoding,
+    is bounded by `abs_tol` or `rel_tol * max(|x|)`.
+    The error actually achieved is recorded alongside the data.
+    """
+
+    precision: FloatPrecision = Field(
+        FloatPrecision.FLOAT64, description="How floating point data is stored."
+    )
+    abs_tol: float | None = Field(
+        None, description="The maximum absolute error of quantized values."
+    )
+    rel_tol: float | None = Field(
+        None,
+        description=(
+            "The maximum error of quantized values, "
+            "relative to the largest absolute value."
+        ),
+    )
+    compression_level: int = Field(
+        9, description="The compression level of the byte-shuffled zstd codec."
+    )
+
+    @model_validator(mode="after")
+    def check_tolerances(self) -> Self:
+        if self.precision == FloatPrecision.QUANTIZED:
+            if (self.abs_tol is None) == (self.rel_tol is None):
+                raise ValueError(
+                    "Exactly one of `abs_tol` or `rel_tol` must be set "
+                    "for quantized precision."
+                )
+            if (self.abs_tol or self.rel_tol or 0.0) <= 0.0:
+                raise ValueError("Quantization tolerances must be positive.")
+        return self
+
+    @property
+    def is_lossless(self) -> bool:
+        """Whether data is stored at full precision."""
+        return self.precision == FloatPrecision.FLOAT64
+
+    def get_compression(self, format: ArchivalFormat) -> dict:
+        """Get compression kwargs for a format, using a byte-shuffled codec.
+
+        HDF5 has no built-in zstd filter, so its gzip filter is used
+        with byte shuffling instead. For Parquet, the byte stream split
+        encoding is resolved to the floating point columns of a table
+        when it is written by `PrecisionArchiver`.
+        """
+        if self.is_lossless:
+            return Archiver.get_default_compression(format)
+        if format == ArchivalFormat.HDF5:
+            return {
+                "compression": "gzip",
+                "compression_opts": min(self.compression_level, 9),
+                "shuffle": True,
+                "chunks": True,
+            }
+        elif format == ArchivalFormat.ZARR:
+            return {
+                "compressors": [
+                    zarr.codecs.BloscCodec(
+                        cname="zstd", clevel=self.compression_level, shuffle="shuffle"
+                    )
+                ],
+            }
+        return {
+            "compression": "zstd",
+            "compression_level": self.compression_level,
+            "use_byte_stream_split": True,
+        }
+
+    def get_step(self, max_abs: float) -> float:
+        """Get the quantization step for data with a given maximum magnitude."""
+        if self.abs_tol is not None:
+            tol = self.abs_tol
+        elif max_abs > 0.0:
+            tol = self.rel_tol * max_abs  # type: ignore[operator]
+        else:
+            return 1.0
+        # Rounding to a multiple of the step is exact to within half a step,
+        # but decoding can be off by a few ULPs of the largest value
+        margin = 4.0 * np.finfo(np.float64).eps * max(max_abs, tol)
+        if margin >= tol:
+            raise ValueError(
+                f"A tolerance of {tol} is below the resolution of float64 "
+                f"for values as large as {max_abs}."
+            )
+        return 2.0 * (tol - margin)
+
+    def _encode(self, values: np.ndarray, step: float | None) -> np.ndarray:
+        if self.precision == FloatPrecision.FLOAT32:
+            return values.astype(np.float32)
+        if self.precision == FloatPrecision.QUANTIZED:
+            if not np.all(np.isfinite(values)):
+                raise ValueError("Only finite values can be quantized.")
+            quantized = np.rint(values / step)
+            return quantized.astype(_smallest_int_dtype(quantized))
+        return values
+
+    def _get_metadata(
+        self, max_abs_error: float, max_abs: float, step: float | None
+    ) -> dict[str, Any]:
+        metadata: dict[str, Any] = {
+            "precision": self.precision.value,
+            "max_abs_error": max_abs_error,
+            "max_rel_error": max_abs_error / max_abs if max_abs > 0.0 else 0.0,
+        }
+        if step is not None:
+            metadata["scale"] = step
+        return metadata
+
+    def encode_array(self, values: np.ndarray) -> tuple[np.ndarray, dict[str, Any]]:
+        """Encode an array of floats according to this policy.
+
+        Returns
+        -----------
+        The encoded array, and metadata needed to decode it, including the
+        maximum absolute and relative errors achieved.
+        """
+        if self.is_lossless:
+            return values, {"precision": self.precision.value}
+
+        values = np.asarray(values, dtype=np.float64)
+        max_abs = float(np.abs(values).max()) if values.size else 0.0
+        step = (
+            self.get_step(max_abs)
+            if self.precision == FloatPrecision.QUANTIZED
+            else None
+        )
+        encoded = self._encode(values, step)
+        decoded = self.decode_array(encoded, {"scale": step})
+        max_abs_error = float(np.abs(decoded - values).max()) if values.size else 0.0
+        return encoded, self._get_metadata(max_abs_error, max_abs, step)
+
+    @staticmethod
+    def decode_array(values: np.ndarray, metadata: dict[str, Any]) -> np.ndarray:
+        """Decode an array written by `encode_array`.
+
+        Arrays which were not quantized are returned as-is, without a copy.
+        """
+        if (scale := metadata.get("scale")) is not None:
+            return values * scale
+        return values
+
+    def encode_table(self, table: pa.Table) -> pa.Table:
+        """Encode all floating point data in an arrow table.
+
+        Quantization steps are set per column, and the metadata for
+        each column is stored in the schema metadata of the table.
+        """
+        if self.is_lossless:
+            return table
+
+        columns: list[pa.ChunkedArray] = []
+        column_metadata: dict[str, dict[str, Any]] = {}
+        for name, column in zip(table.column_names, table.columns):
+            leaves: list[np.ndarray] = []
+
+            def _collect(leaf: pa.Array) -> pa.Array:
+                leaves.append(leaf.drop_null().to_numpy(zero_copy_only=False))
+                return leaf
+
+            for chunk in column.chunks:
+                _map_float_leaves(chunk, _collect)
+            if not leaves:
+                columns.append(column)
+                continue
+
+            max_abs = max(
+                (float(np.abs(leaf).max()) for leaf in leaves if leaf.size),
+                default=0.0,
+            )
+            step = (
+                self.get_step(max_abs)
+                if self.precision == FloatPrecision.QUANTIZED
+                else None
+            )
+            max_abs_error = 0.0
+
+            def _encode_leaf(leaf: pa.Array) -> pa.Array:
+                nonlocal max_abs_error
+                values = leaf.fill_null(0.0).to_numpy(zero_copy_only=False)
+                encoded = self._encode(values, step)
+                if values.size:
+                    max_abs_error = max(
+                        max_abs_error,
+                        float(
+                            np.abs(
+                                self.decode_array(encoded, {"scale": step}) - values
+                            ).max()
+                        ),
+                    )
+                return pa.array(
+                    encoded,
+                    mask=(
+                        leaf.is_null().to_numpy(zero_copy_only=False)
+                        if leaf.null_count
+                        else None
+                    ),
+                )
+
+            columns.append(
+                pa.chunked_array(
+                    [_map_float_leaves(chunk, _encode_leaf) for chunk in column.chunks]
+                )
+            )
+            column_metadata[name] = self._get_metadata(max_abs_error, max_abs, step)
+
+        return pa.table(
+            columns,
+            names=table.column_names,
+            metadata={
+                **(table.schema.metadata or {}),
+                PRECISION_METADATA_KEY: json.dumps(column_metadata),
+            },
+        )
+
+    @staticmethod
+    def decode_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+        """Decode a table written by `encode_table` to its full-precision schema."""
+        if PRECISION_METADATA_KEY.encode() not in (
+            metadata := table.schema.metadata or {}
+        ):
+            return table
+
+        column_metadata = json.loads(metadata[PRECISION_METADATA_KEY.encode()])
+        table = table.cast(schema)
+        for name, col_meta in column_metadata.items():
+            if (scale := col_meta.get("scale")) is None:
+                continue
+
+            def _decode_leaf(leaf: pa.Array) -> pa.Array:
+                return pa_co.multiply(leaf, scale)
+
+            idx = table.column_names.index(name)
+            table = table.set_column(
+                idx,
+                table.field(idx),
+                pa.chunked_array(
+                    [
+                        _map_float_leaves(chunk, _decode_leaf)
+                        for chunk in table.column(idx).chunks
+                    ]
+                ),
+            )
+        return table
+
+    @staticmethod
+    def get_table_metadata(table: pa.Table) -> dict[str, dict[str, Any]]:
+        """Get the precision metadata of each encoded column in a table."""
+        metadata = (table.schema.metadata or {}).get(PRECISION_METADATA_KEY.encode())
+        return json.loads(metadata) if metadata else {}
+
+
+class PrecisionArchiver(Archiver):
+    """Archiver whose floating point data can be stored with reduced precision."""
+
+    precision: PrecisionPolicy = Field(
+        default_factory=PrecisionPolicy,
+        description="The policy for storing floating point data.",
+        exclude=True,
+    )
+
+    def get_default_compression(self, format: ArchivalFormat) -> dict:  # type: ignore[override]
+        return self.precision.get_compression(format)
+
+    def _to_parquet(self, file_name: FSPathType, **kwargs) -> None:
+        """Write data to a parquet file, byte stream splitting float columns."""
+        table = self.to_arrow()
+        if kwargs.get("use_byte_stream_split") is True:
+            # Only fixed-width columns support the encoding, and dictionary
+            # encoding would otherwise take precedence over it
+            leaves = [
+                leaf
+                for field in table.schema
+                for leaf in _parquet_leaf_paths(field.type, field.name)
+            ]
+            kwargs["use_byte_stream_split"] = [
+                path for path, typ in leaves if pa.types.is_floating(typ)
+            ]
+            kwargs.setdefault(
+                "use_dictionary",
+                [path for path, typ in leaves if not pa.types.is_floating(typ)],
+            )
+        pq.write_table(table, file_name, **kwargs)
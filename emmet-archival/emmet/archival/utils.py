@@ -2,12 +2,36 @@
 
 from __future__ import annotations
 
+import bz2
+import gzip
+import hashlib
+import lzma
+import os
+import shutil
+from contextlib import contextmanager
 from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from typing import TYPE_CHECKING
 
 from monty.os.path import zpath as _monty_zpath
 
 from emmet.core.types.enums import ValueEnum
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # type: ignore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from typing import Any, BinaryIO
+
+# tmpfs mount used for in-memory directories, where available
+_SHM_DIR = Path("/dev/shm")
+# The tmpfs is only used if it has at least this much free space,
+# as it is often small, e.g., 64 MB in containers
+DEFAULT_MIN_FREE_SHM = 512 * 1024**2
+
 
 class CompressionType(ValueEnum):
     """Magic bytes for commonly-used compression methods."""
@@ -31,3 +55,131 @@ def zpath(target_path: str | Path) -> Path:
     zip extension if that path exists.
     """
     return Path(_monty_zpath(str(target_path)))
+
+
+# Openers for compressed files, by extension, as used by monty's zopen
+_DECOMPRESSORS: dict[str, Callable[[Any], BinaryIO]] = {
+    ".bz2": lambda f: bz2.BZ2File(f, "rb"),  # type: ignore[dict-item]
+    ".gz": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),  # type: ignore[dict-item]
+    ".z": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),  # type: ignore[dict-item]
+    ".xz": lambda f: lzma.LZMAFile(f, "rb"),  # type: ignore[dict-item]
+    ".lzma": lambda f: lzma.LZMAFile(f, "rb"),  # type: ignore[dict-item]
+}
+
+
+class _HashingReader:
+    """Binary file wrapper which hashes all bytes read through it."""
+
+    def __init__(self, file: BinaryIO, hasher: Any) -> None:
+        self._file = file
+        self.hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self.hasher.update(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+
+@contextmanager
+def open_hashed(
+    file_path: str | Path, chunk_size: int = 4 * 1024 * 1024
+) -> Generator[tuple[BinaryIO, Any], None, None]:
+    """
+    Open a file for reading, decompressing it as monty's zopen does,
+    while hashing the bytes read from disk.
+
+    Once the context exits, the hasher holds the same digest as
+    `emmet.core.utils.get_hash_blocked`, so that a file need not be
+    read a second time to hash it.
+
+    Parameters
+    -----------
+    file_path : str or Path
+        The file to open.
+    chunk_size : int
+        The number of bytes to read at a time when hashing any data
+        which was not read through the stream.
+
+    Returns
+    -----------
+    The binary stream of (decompressed) data, and the hasher.
+    """
+    hasher = blake3.blake3() if blake3 else hashlib.md5()
+    with open(file_path, "rb") as raw:
+        reader = _HashingReader(raw, hasher)
+        decompressor = _DECOMPRESSORS.get(os.path.splitext(file_path)[1].lower())
+        stream = decompressor(reader) if decompressor else reader
+        try:
+            yield stream, hasher  # type: ignore[misc]
+        finally:
+            if stream is not reader:
+                stream.close()
+        while reader.read(chunk_size):
+            pass
+
+
+@contextmanager
+def in_memory_file(data: bytes, name: str = "") -> Generator[Path, None, None]:
+    """
+    Expose bytes as a readable file path without writing to disk.
+
+    On Linux, the data is held in an anonymous memory-backed file
+    (see `os.memfd_create`), which is accessed through `/proc`.
+    Elsewhere, this falls back to a named temporary file.
+
+    Parameters
+    -----------
+    data : bytes
+        The (uncompressed) file contents.
+    name : str
+        Name of the file, used only for debugging.
+
+    Returns
+    -----------
+    Path which can be opened by parsers until the context exits.
+    """
+    if hasattr(os, "memfd_create") and Path("/proc/self/fd").is_dir():
+        fd = os.memfd_create(name or "emmet", 0)
+        try:
+            with os.fdopen(os.dup(fd), "wb") as f:
+                f.write(data)
+            yield Path(f"/proc/self/fd/{fd}")
+        finally:
+            os.close(fd)
+    else:
+        with NamedTemporaryFile() as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            yield Path(temp_file.name)
+
+
+@contextmanager
+def in_memory_directory(
+    min_free_bytes: int = DEFAULT_MIN_FREE_SHM,
+) -> Generator[Path, None, None]:
+    """
+    Create a temporary directory on a memory-backed file system.
+
+    Uses the `/dev/shm` tmpfs where available and it has at least
+    `min_free_bytes` of free space, and the default temporary
+    directory otherwise.
+
+    Parameters
+    -----------
+    min_free_bytes : int
+        The free space needed on the tmpfs to use it.
+
+    Returns
+    -----------
+    Path of the directory, which is removed when the context exits.
+    """
+    shm_dir = None
+    if os.access(_SHM_DIR, os.W_OK) and (
+        shutil.disk_usage(_SHM_DIR).free >= min_free_bytes
+    ):
+        shm_dir = str(_SHM_DIR)
+    with TemporaryDirectory(dir=shm_dir) as tmp_dir:
+        yield Path(tmp_dir)
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import errno
+import io
 import orjson
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryDirectory
+from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING
 
 import h5py
 import numpy as np
 import zarr
-from monty.io import zopen
 from pydantic import Field
 from emmet.core.io.pymatgen import (
     Structure,
@@ -24,13 +30,29 @@ from emmet.core.io.pymatgen import (
     Vasprun,
 )
 
-from emmet.archival.core import walk_hierarchical_data, FileArchiveBase
+from emmet.archival.base import ArchivalFormat, infer_archive_format
+from emmet.archival.core import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    DEFAULT_STREAM_THRESHOLD,
+    FileArchivalReport,
+    FileArchiveBase,
+    copy_hdf5_like,
+    walk_hierarchical_data,
+)
+from emmet.archival.utils import (
+    _DECOMPRESSORS,
+    CompressionType,
+    in_memory_directory,
+    in_memory_file,
+    open_hashed,
+)
 from emmet.core.tasks import TaskDoc
 from emmet.core.vasp.calculation import PotcarSpec
 from emmet.core.vasp.utils import VASP_RAW_DATA_ORG, FileMetadata, discover_vasp_files
 
 if TYPE_CHECKING:
     from collections.abc import MutableMapping, Sequence
+    from contextlib import AbstractContextManager
     from os import PathLike
     from typing import Any
 
@@ -113,63 +135,249 @@ class RawArchive(FileArchiveBase):
 
         return cls(file_paths=file_paths)
 
-    def _to_hdf5_like(self, group: h5py.Group | zarr.Group, **kwargs) -> None:
-        """Add VASP files to an existing archival group."""
+    def _archive_file(
+        self,
+        group: h5py.Group | zarr.Group,
+        file_arch: str,
+        file_meta: FileMetadata,
+        lock: AbstractContextManager | None = None,
+        stream_threshold: int | None = DEFAULT_STREAM_THRESHOLD,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ) -> FileArchivalReport | None:
+        """Add a single VASP file to an existing archival group.
 
-        for file_arch, file_meta in self.file_paths.items():
-            if ".h5" in file_arch:
-                file_key = file_arch
-                # insert HDF5 files into output
-                arch = Path(file_arch)
-                base_group = str(arch.parent)
-                with zopen(file_meta.path, "rb") as vhf_b, h5py.File(
-                    vhf_b, "r"
-                ) as vh5f:
+        Parameters
+        -----------
+        group : h5py or zarr Group
+            The group to add the file to.
+        file_arch : str
+            The hierarchical key of the file, e.g., "output/vasprun.xml".
+        file_meta : FileMetadata
+            The file to archive.
+        lock : context manager or None (default)
+            If specified, held whenever `group` is written to, so that
+            files can be read and compressed concurrently.
+        stream_threshold : int or None
+            Files larger than this many bytes on disk are compressed in
+            chunks of `chunk_size`, rather than read into memory.
+            If None, files are never streamed.
+        chunk_size : int
+            The number of bytes to read at a time when streaming.
+
+        Returns
+        -----------
+        FileArchivalReport, or None if the file was empty.
+        """
+        lock = lock or nullcontext()
+        file_key = file_arch
+        bytes_out: int | None = None
+        if ".h5" in file_arch:
+            # insert HDF5 files into output, reading them before taking
+            # the lock, so that only writes are serialized
+            arch = Path(file_arch)
+            base_group = str(arch.parent)
+            bytes_in = file_meta.path.stat().st_size
+            h5_source: Path | io.BytesIO
+            if file_meta.path.suffix.lower() in _DECOMPRESSORS:
+                # HDF5 needs random access, so compressed files are buffered
+                with open_hashed(file_meta.path) as (vhf_b, hasher):
+                    h5_source = io.BytesIO(vhf_b.read())
+            else:
+                # hash uncompressed files in chunks, and let h5py read
+                # datasets from disk as they are copied
+                with open_hashed(file_meta.path, chunk_size=chunk_size) as (_, hasher):
+                    pass  # the whole file is hashed in chunks on exit
+                h5_source = file_meta.path
+            with h5py.File(h5_source, "r") as vh5f:
+                pspec = None
+                if "vaspout" in file_arch:
+                    pdata = np.asarray(vh5f["input/potcar/content"][()])
+                    pspec = self.convert_potcar_to_spec(pdata.tolist().decode())
+
+                with lock:
                     if base_group not in group:
                         group.create_group(base_group)
-                    vh5f.copy("/", group[base_group], name=arch.name)
-                if "vaspout" in file_arch:
-                    ppath = str(arch / "input/potcar/content")
-                    pdata = np.array(group[ppath]).tolist().decode()
-                    pspec = self.convert_potcar_to_spec(pdata)
-
-                    # mypy has a lot of issues with h5py / zarr Group-like objects
-                    if "spec" in group[file_arch]["input/potcar"]:  # type: ignore[operator,index]
-                        old_spec = group[file_arch]["input/potcar/spec"]  # type: ignore[index]
-                        old_spec[...] = pspec  # type: ignore[index]
-                    else:
-                        self._writeout(
-                            group[file_arch]["input/potcar"],  # type: ignore[index]
-                            "spec",
-                            pspec,
-                            compress=False,
-                        )
-                    del group[ppath]
+                    copy_hdf5_like(vh5f, group[base_group], arch.name)
+                    if pspec is not None:
+                        # mypy has a lot of issues with h5py / zarr Group-like objects
+                        if "spec" in group[file_arch]["input/potcar"]:  # type: ignore[operator,index]
+                            old_spec = group[file_arch]["input/potcar/spec"]  # type: ignore[index]
+                            old_spec[...] = pspec  # type: ignore[index]
+                        else:
+                            self._writeout(
+                                group[file_arch]["input/potcar"],  # type: ignore[index]
+                                "spec",
+                                pspec,
+                                compress=False,
+                            )
+                        del group[str(arch / "input/potcar/content")]
+
+        elif (
+            stream_threshold is not None
+            and "POTCAR" not in file_arch
+            and file_meta.path.stat().st_size > stream_threshold
+        ):
+            # compress large plaintext / binary files without reading them
+            # into memory, hashing them as they are read
+            with open_hashed(file_meta.path, chunk_size=chunk_size) as (_f, hasher):
+                bytes_in, bytes_out = self._stream_writeout(
+                    group, file_key, _f, chunk_size=chunk_size, lock=lock
+                )
+
+        else:
+            # insert plaintext / binary files into HDF5 datasets
+            with open_hashed(file_meta.path) as (_f, hasher):
+                data: bytes = _f.read()
+
+            if (bytes_in := len(data)) == 0:
+                return None
+
+            if "POTCAR" in file_arch and "spec" not in file_arch:
+                if len(_split_arch := file_arch.rsplit(".", 1)) > 1:
+                    file_key = f"{_split_arch[0]}.spec.{_split_arch[1]}"
+                else:
+                    file_key = f"{file_arch}.spec"
+
+                data = self.convert_potcar_to_spec(data.decode())
+
+            compressed = self._compress(data)
+            bytes_out = len(compressed)
+            with lock:
+                self._writeout(group, file_key, compressed, compress=False)
+
+        if file_meta.hash is None:
+            file_meta.hash = hasher.hexdigest()
+        md5 = str(file_meta.hash)
+        with lock:
+            group[file_key].attrs["file_path"] = str(file_meta.path)
+            group[file_key].attrs["md5"] = md5
 
-            else:
-                # insert plaintext / binary files into HDF5 datasets
-                with zopen(file_meta.path, "rb") as _f:
-                    data: bytes = _f.read()
+        return FileArchivalReport(
+            file_key=file_key, bytes_in=bytes_in, bytes_out=bytes_out
+        )
 
-                if len(data) == 0:
-                    continue
+    def _to_hdf5_like(self, group: h5py.Group | zarr.Group, **kwargs) -> None:
+        """Add VASP files to an existing archival group."""
+        for file_arch, file_meta in self.file_paths.items():
+            self._archive_file(group, file_arch, file_meta)
+        self._write_zstd_dictionary(group)
 
-                file_key = file_arch
-                if "POTCAR" in file_arch and "spec" not in file_arch:
-                    if len(_split_arch := file_arch.rsplit(".", 1)) > 1:
-                        file_key = f"{_split_arch[0]}.spec.{_split_arch[1]}"
-                    else:
-                        file_key = f"{file_arch}.spec"
+    @classmethod
+    def archive_calculations(
+        cls,
+        calc_dirs: Sequence[str | Path] | Mapping[str, str | Path],
+        archive_name: str | Path,
+        num_workers: int | None = None,
+        shard_size: int | None = None,
+        compression: CompressionType | None = CompressionType.ZSTD,
+        stream_threshold: int | None = DEFAULT_STREAM_THRESHOLD,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        zarr_store: MutableMapping | None = None,
+    ) -> list[FileArchivalReport]:
+        """Archive many calculation directories into one store.
 
-                    data = self.convert_potcar_to_spec(data.decode())
+        Each calculation is written to its own group within the archive,
+        which can be passed as `group_key` to, e.g., `to_task_doc`.
+        Files are read and compressed in a thread pool, while writes
+        to the archive are serialized.
 
-                self._writeout(group, file_key, data)
+        Parameters
+        -----------
+        calc_dirs : Sequence of paths, or Mapping of str to path
+            The calculation directories to archive. If a mapping, its keys
+            are used as group keys. Otherwise, the group key is the path
+            of each directory relative to the common path of all directories.
+        archive_name : str or Path
+            The name of the HDF5 or zarr archive. If `shard_size` is set
+            for an HDF5 archive, shards are named, e.g., `archive.00000.h5`.
+        num_workers : int or None (default)
+            The number of threads used to compress files.
+        shard_size : int or None (default)
+            The maximum number of calculations per HDF5 file.
+            Zarr archives are never sharded.
+        compression : CompressionType or None
+            Whether to compress data, defaults to zstd.
+        stream_threshold : int or None
+            Files larger than this many bytes are compressed in chunks.
+        chunk_size : int
+            The number of bytes to read at a time when streaming.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
 
-            group[file_key].attrs["file_path"] = str(file_meta.path)
-            group[file_key].attrs["md5"] = str(
-                file_meta.compute_hash() if file_meta.hash is None else file_meta.hash
+        Returns
+        -----------
+        list of FileArchivalReport, one per archived file.
+        """
+        if isinstance(calc_dirs, Mapping):
+            dirs_by_key = {k: Path(v).resolve() for k, v in calc_dirs.items()}
+        else:
+            resolved = [Path(calc_dir).resolve() for calc_dir in calc_dirs]
+            if len(resolved) == 1:
+                dirs_by_key = {resolved[0].name: resolved[0]}
+            else:
+                common = Path(os.path.commonpath(resolved))
+                dirs_by_key = {str(p.relative_to(common)): p for p in resolved}
+
+        fmt = infer_archive_format(archive_name)
+        archive_path = Path(archive_name)
+        group_keys = list(dirs_by_key)
+        if shard_size and fmt == ArchivalFormat.HDF5:
+            shards = {
+                archive_path.with_name(
+                    f"{archive_path.name.split('.h5')[0]}.{ishard:05d}.h5"
+                ): group_keys[istart : istart + shard_size]
+                for ishard, istart in enumerate(range(0, len(group_keys), shard_size))
+            }
+        else:
+            shards = {archive_path: group_keys}
+
+        reports: list[FileArchivalReport] = []
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            archives = dict(
+                zip(
+                    group_keys,
+                    pool.map(
+                        lambda key: cls.from_directory(dirs_by_key[key]).model_copy(
+                            update={"compression": compression}
+                        ),
+                        group_keys,
+                    ),
+                )
             )
 
+            for shard_path, shard_keys in shards.items():
+                with cls._open_hdf5_like(
+                    shard_path, fmt=fmt, mode="a", zarr_store=zarr_store
+                ) as root:
+                    futures = {}
+                    for group_key in shard_keys:
+                        if group_key in root:
+                            del root[group_key]
+                        group = root.create_group(group_key)
+                        for file_arch, file_meta in archives[
+                            group_key
+                        ].file_paths.items():
+                            futures[
+                                pool.submit(
+                                    archives[group_key]._archive_file,
+                                    group,
+                                    file_arch,
+                                    file_meta,
+                                    lock=lock,
+                                    stream_threshold=stream_threshold,
+                                    chunk_size=chunk_size,
+                                )
+                            ] = group_key
+
+                    for future in as_completed(futures):
+                        if report := future.result():
+                            report.archive = str(shard_path)
+                            report.group_key = futures[future]
+                            reports.append(report)
+
+        return reports
+
     @classmethod
     def _extract_from_hdf5_like(
         cls,
@@ -198,7 +406,7 @@ class RawArchive(FileArchiveBase):
             if ".h5" in (file_name := p.name):
                 with h5py.File(output_dir / file_name, "w") as f:
                     for _key in group[k]:  # type: ignore[union-attr]
-                        f.copy(group[k][_key], f, name=_key)  # type: ignore[index]
+                        copy_hdf5_like(group[k][_key], f, _key)  # type: ignore[index]
             else:
                 (output_dir / file_name).write_bytes(cls._readout(group, k))
 
@@ -207,37 +415,38 @@ class RawArchive(FileArchiveBase):
             )
         return extracted_files
 
+    @staticmethod
+    def _get_validation_files(fast: bool = False) -> list[str]:
+        """Get the minimal files needed for a (fast) validation."""
+        files = [f"input/{k}" for k in ("INCAR", "KPOINTS", "POSCAR", "POTCAR.spec")]
+        if not fast:
+            files += [f"output/{k}" for k in ("OUTCAR", "vasprun.xml")]
+        return files
+
     @classmethod
-    def _validate(
+    def _validate_group(
         cls,
-        archive_path: PathLike,
-        group_key: str | None = None,
+        group: h5py.Group | zarr.Group,
         files_to_extract: list[str] | None = None,
-        zarr_store: MutableMapping | None = None,
         **kwargs,
     ) -> VaspValidator:
         """
-        Validate a VASP calculation from an archive.
+        Validate a VASP calculation from an open archive group.
+
+        Files are decompressed in memory and never written to disk.
 
         Parameters
         -----------
-        archive_path : PathLike
-            Name of the archive.
-        group_key : str or None (default)
-            If a str, the name of the group in the archive to prefix from.
+        group : h5py or zarr Group
+            The group containing the calculation.
         files_to_extract : list[str] or None
-            If specified, this is a list of all keys in the archive which
+            If specified, this is a list of all keys in the group which
             should be extracted for validation.
             Defaults to the minimal files needed for a comprehensive validation.
-        zarr_store : MutableMapping or None (default)
-            If specified, the ZARR store to begin file root at.
         **kwargs to pass to VaspValidator.from_vasp_input
         """
 
-        files_to_extract = files_to_extract or [
-            *[f"input/{k}" for k in ("INCAR", "KPOINTS", "POSCAR", "POTCAR.spec")],
-            *[f"output/{k}" for k in ("OUTCAR", "vasprun.xml")],
-        ]
+        files_to_extract = files_to_extract or cls._get_validation_files()
 
         fname_to_type: dict[str, type] = {
             "incar": Incar,
@@ -249,50 +458,127 @@ class RawArchive(FileArchiveBase):
         }
 
         vasp_io: dict[str, dict[str, Any]] = {"user_input": {}}
-        with cls._open_hdf5_like(
-            archive_path, mode="r", group_key=group_key, zarr_store=zarr_store
-        ) as group:
-            for io_typ in ("input", "output"):
-                for key in [
-                    key for key in files_to_extract if io_typ in key and key in group
-                ]:
-                    if (fname := Path(key).name.lower()) not in fname_to_type:
-                        continue
-
-                    data = cls._readout(group, key)
-                    if io_typ == "input":
-                        # These methods can directly parse from in-memory str
-
-                        if fname == "potcar.spec":
-                            vasp_io["user_input"]["potcar"] = [
-                                PotcarSummaryStats(
-                                    keywords=ps["summary_stats"]["keywords"],
-                                    stats=ps["summary_stats"]["stats"],
-                                    titel=ps["titel"],
-                                    lexch=ps["lexch"],
-                                )
-                                for ps in orjson.loads(data)
-                            ]
-                        elif fname == "poscar":
-                            vasp_io["user_input"]["structure"] = Structure.from_str(
-                                data.decode(), fmt="poscar"
-                            )
-                        else:
-                            vasp_io["user_input"][fname] = fname_to_type[fname].from_str(  # type: ignore[attr-defined]
-                                data.decode(),
+        for io_typ in ("input", "output"):
+            for key in [
+                key for key in files_to_extract if io_typ in key and key in group
+            ]:
+                if (fname := Path(key).name.lower()) not in fname_to_type:
+                    continue
+
+                data = cls._readout(group, key)
+                if io_typ == "input":
+                    # These methods can directly parse from in-memory str
+
+                    if fname == "potcar.spec":
+                        vasp_io["user_input"]["potcar"] = [
+                            PotcarSummaryStats(
+                                keywords=ps["summary_stats"]["keywords"],
+                                stats=ps["summary_stats"]["stats"],
+                                titel=ps["titel"],
+                                lexch=ps["lexch"],
                             )
+                            for ps in orjson.loads(data)
+                        ]
+                    elif fname == "poscar":
+                        vasp_io["user_input"]["structure"] = Structure.from_str(
+                            data.decode(), fmt="poscar"
+                        )
                     else:
-                        # These methods must write to a temp file to parse
-                        with NamedTemporaryFile() as temp_file:
-                            temp_file.write(data)
-                            temp_file.seek(0)
-                            vasp_io[fname.split(".")[0]] = fname_to_type[fname](
-                                temp_file.name
-                            )
+                        vasp_io["user_input"][fname] = fname_to_type[fname].from_str(  # type: ignore[attr-defined]
+                            data.decode(),
+                        )
+                else:
+                    # These methods must parse from a file path
+                    with in_memory_file(data, name=fname) as file_path:
+                        vasp_io[fname.split(".")[0]] = fname_to_type[fname](
+                            str(file_path)
+                        )
 
         vasp_files = VaspFiles(**vasp_io)  # type: ignore[arg-type]
         return VaspValidator.from_vasp_input(vasp_files=vasp_files, **kwargs)
 
+    @classmethod
+    def _validate(
+        cls,
+        archive_path: PathLike,
+        group_key: str | None = None,
+        files_to_extract: list[str] | None = None,
+        zarr_store: MutableMapping | None = None,
+        **kwargs,
+    ) -> VaspValidator:
+        """
+        Validate a VASP calculation from an archive.
+
+        Parameters
+        -----------
+        archive_path : PathLike
+            Name of the archive.
+        group_key : str or None (default)
+            If a str, the name of the group in the archive to prefix from.
+        files_to_extract : list[str] or None
+            If specified, this is a list of all keys in the archive which
+            should be extracted for validation.
+            Defaults to the minimal files needed for a comprehensive validation.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
+        **kwargs to pass to VaspValidator.from_vasp_input
+        """
+        with cls._open_hdf5_like(
+            archive_path, mode="r", group_key=group_key, zarr_store=zarr_store
+        ) as group:
+            return cls._validate_group(
+                group, files_to_extract=files_to_extract, **kwargs
+            )
+
+    @staticmethod
+    def _get_calculation_keys(group: h5py.Group | zarr.Group) -> list[str]:
+        """Get the keys of all calculation groups at the root of an archive."""
+        return [
+            key
+            for key in group
+            if isinstance(group[key], h5py.Group | zarr.Group)
+            and any(k in group[key] for k in VASP_RAW_DATA_ORG)  # type: ignore[operator]
+        ]
+
+    @classmethod
+    def validate_many(
+        cls,
+        archive_path: PathLike,
+        group_keys: Sequence[str] | None = None,
+        fast: bool = False,
+        zarr_store: MutableMapping | None = None,
+        **kwargs,
+    ) -> dict[str, VaspValidator]:
+        """Validate many calculations in an archive, opening it only once.
+
+        Parameters
+        -----------
+        archive_path : PathLike
+            Name of the archive, e.g., as written by `archive_calculations`.
+        group_keys : Sequence of str, or None (default)
+            The groups of the calculations to validate.
+            Defaults to all calculations in the archive.
+        fast : bool = False
+            Whether to perform a fast validation using only input files.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
+        **kwargs to pass to VaspValidator.from_vasp_input
+
+        Returns
+        -----------
+        dict of group key to VaspValidator
+        """
+        with cls._open_hdf5_like(archive_path, mode="r", zarr_store=zarr_store) as root:
+            return {
+                group_key: cls._validate_group(
+                    root[group_key],
+                    files_to_extract=cls._get_validation_files(fast=fast),
+                    fast=fast,
+                    **kwargs,
+                )
+                for group_key in group_keys or cls._get_calculation_keys(root)
+            }
+
     @classmethod
     def fast_validate(
         cls, archive_path: PathLike, group_key: str | None = None
@@ -324,9 +610,7 @@ class RawArchive(FileArchiveBase):
         return cls._validate(
             archive_path,
             group_key=group_key,
-            files_to_extract=[
-                f"input/{k}" for k in ("INCAR", "KPOINTS", "POSCAR", "POTCAR.spec")
-            ],
+            files_to_extract=cls._get_validation_files(fast=True),
             fast=True,
         )
 
@@ -349,6 +633,37 @@ class RawArchive(FileArchiveBase):
             fast=True,
         )
 
+    @classmethod
+    def _task_doc_from_group(
+        cls, group: h5py.Group | zarr.Group, **task_doc_kwargs
+    ) -> TaskDoc:
+        """Create a TaskDoc from a calculation in an open archive group.
+
+        The files needed to build the TaskDoc are decompressed to a
+        memory-backed directory where one has enough free space, and
+        to a temporary directory on disk otherwise.
+        """
+        required_files = [
+            f"{calc_type}/{fname}"
+            for calc_type in ("input", "output", "workflow")
+            for fname in VASP_RAW_DATA_ORG[calc_type]
+        ]
+        with in_memory_directory() as _tmp_dir:
+            try:
+                cls._extract_from_hdf5_like(
+                    group, keys=required_files, output_dir=_tmp_dir
+                )
+            except OSError as exc:
+                if exc.errno != errno.ENOSPC:
+                    raise
+            else:
+                return TaskDoc.from_directory(_tmp_dir, **task_doc_kwargs)
+
+        # The memory-backed file system filled up
+        with TemporaryDirectory() as _tmp_dir:
+            cls._extract_from_hdf5_like(group, keys=required_files, output_dir=_tmp_dir)
+            return TaskDoc.from_directory(_tmp_dir, **task_doc_kwargs)
+
     @classmethod
     def to_task_doc(
         cls,
@@ -375,24 +690,40 @@ class RawArchive(FileArchiveBase):
         -----------
         TaskDoc representing the calculation in the archive.
         """
+        with cls._open_hdf5_like(
+            archive_path, mode="r", group_key=group_key, zarr_store=zarr_store
+        ) as group:
+            return cls._task_doc_from_group(group, **task_doc_kwargs)
 
-        required_files = []
-        group_key = group_key or ""
-        for calc_type in ("input", "output", "workflow"):
-            required_files.extend(
-                [
-                    f"{group_key}/{calc_type}/{fname}"
-                    for fname in VASP_RAW_DATA_ORG[calc_type]
-                ]
-            )
+    @classmethod
+    def to_task_docs(
+        cls,
+        archive_path: PathLike,
+        group_keys: Sequence[str] | None = None,
+        zarr_store: MutableMapping | None = None,
+        **task_doc_kwargs,
+    ) -> dict[str, TaskDoc]:
+        """
+        Create TaskDocs for many calculations in an archive, opening it only once.
 
-        with TemporaryDirectory() as _tmp_dir:
-            cls.extract(
-                archive_path,
-                keys=required_files,
-                output_dir=_tmp_dir,
-                zarr_store=zarr_store,
-            )
-            task = TaskDoc.from_directory(_tmp_dir, **task_doc_kwargs)
+        Parameters
+        -----------
+        archive_path : str | Path
+            The name of the archive, e.g., as written by `archive_calculations`.
+        group_keys : Sequence of str, or None (default)
+            The groups of the calculations to retrieve.
+            Defaults to all calculations in the archive.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
+        **task_doc_kwargs
+            kwargs to pass to TaskDoc.from_directory
 
-        return task
+        Returns
+        -----------
+        dict of group key to TaskDoc
+        """
+        with cls._open_hdf5_like(archive_path, mode="r", zarr_store=zarr_store) as root:
+            return {
+                group_key: cls._task_doc_from_group(root[group_key], **task_doc_kwargs)
+                for group_key in group_keys or cls._get_calculation_keys(root)
+            }
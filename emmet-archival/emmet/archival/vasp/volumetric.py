@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import h5py
 import pyarrow as pa
 import pyarrow.compute as pa_co
 from pydantic import Field
+import zarr
 
-from emmet.archival.base import Archiver
+from emmet.archival.precision import PrecisionArchiver, PrecisionPolicy
 from emmet.archival.utils import zpath
 from emmet.archival.vasp import PMG_OBJ
-from emmet.archival.volumetric import VolumetricArchive
+from emmet.archival.volumetric import VolumetricArchive, VolumetricGridReader
 from emmet.core.arrow import arrowize
 from emmet.core.band_theory import ElectronicBS, ElectronicDos
 from emmet.core.vasp.utils import VASP_VOLUMETRIC_FILES
 
 if TYPE_CHECKING:
 
-    from collections.abc import Sequence
+    from collections.abc import Generator, MutableMapping, Sequence
 
     from emmet.core.io.pymatgen import (
         BandStructure,
@@ -28,8 +31,10 @@ if TYPE_CHECKING:
     )
     from typing_extensions import Self
 
+    from emmet.core.types.typing import FSPathType
 
-class DosArchive(Archiver):
+
+class DosArchive(PrecisionArchiver):
     """Archive/extract an electronic density of states (DOS)."""
 
     dos: ElectronicDos = Field(
@@ -38,14 +43,17 @@ class DosArchive(Archiver):
 
     def to_arrow(self) -> pa.Table:
         """Convert DOS archive to arrow table."""
-        return pa.Table.from_pylist(
-            [self.dos.model_dump(context={"format": "arrow"})],
-            schema=pa.schema(arrowize(ElectronicDos)),
+        return self.precision.encode_table(
+            pa.Table.from_pylist(
+                [self.dos.model_dump(context={"format": "arrow"})],
+                schema=pa.schema(arrowize(ElectronicDos)),
+            )
         )
 
     @classmethod
     def from_arrow(cls, table: pa.Table) -> Dos | CompleteDos:
         """Extract a pymatgen DOS from an arrow table."""
+        table = PrecisionPolicy.decode_table(table, pa.schema(arrowize(ElectronicDos)))
         return ElectronicDos(**table.to_pylist(maps_as_pydicts="strict")[0]).to_pmg()
 
     @classmethod
@@ -54,19 +62,22 @@ class DosArchive(Archiver):
         return cls(dos=ElectronicDos.from_pmg(vasprun.complete_dos))
 
 
-class BandStructureArchive(Archiver):
+class BandStructureArchive(PrecisionArchiver):
     """Archive/extract an electronic bandstructure."""
 
     band_structure: ElectronicBS = Field(description="The electronic band structure.")
 
     def to_arrow(self) -> pa.Table:
-        return pa.Table.from_pylist(
-            [self.band_structure.model_dump(context={"format": "arrow"})],
-            schema=pa.schema(arrowize(ElectronicBS)),
+        return self.precision.encode_table(
+            pa.Table.from_pylist(
+                [self.band_structure.model_dump(context={"format": "arrow"})],
+                schema=pa.schema(arrowize(ElectronicBS)),
+            )
         )
 
     @classmethod
     def from_arrow(cls, table: pa.Table) -> BandStructure:
+        table = PrecisionPolicy.decode_table(table, pa.schema(arrowize(ElectronicBS)))
         return ElectronicBS(**table.to_pylist(maps_as_pydicts="strict")[0]).to_pmg()
 
     @classmethod
@@ -75,8 +86,11 @@ class BandStructureArchive(Archiver):
         return cls(band_structure=ElectronicBS.from_pmg(vasprun.get_band_structure()))
 
 
-class VaspVolumetricArchive(Archiver):
-    """Archive all CHGCAR-like volumetric data associated with a VASP calculation."""
+class VaspVolumetricArchive(PrecisionArchiver):
+    """Archive all CHGCAR-like volumetric data associated with a VASP calculation.
+
+    The `precision` policy of this archive is applied to all of its files.
+    """
 
     file_names: list[str] = Field(
         description="The names of the volumetric files included in the archive."
@@ -89,7 +103,12 @@ class VaspVolumetricArchive(Archiver):
     )
 
     @classmethod
-    def from_directory(cls, dir_name: str | Path, **kwargs) -> VaspVolumetricArchive:
+    def from_directory(
+        cls,
+        dir_name: str | Path,
+        precision: PrecisionPolicy | None = None,
+        **kwargs,
+    ) -> VaspVolumetricArchive:
         calc_dir = Path(dir_name).resolve()
         file_names: list[str] = []
         vol_archs = []
@@ -100,7 +119,17 @@ class VaspVolumetricArchive(Archiver):
                 vol_data = PMG_OBJ[file_name].from_file(file_path)
                 vol_archs.append(VolumetricArchive.from_pmg(vol_data))
 
-        return cls(file_names=file_names, volumetric_archives=vol_archs)
+        return cls(
+            file_names=file_names,
+            volumetric_archives=vol_archs,
+            precision=precision or PrecisionPolicy(),
+        )
+
+    def _get_volumetric_archive(self, idx: int) -> VolumetricArchive:
+        """Get a volumetric archive with the precision policy of this archive."""
+        return self.volumetric_archives[idx].model_copy(
+            update={"precision": self.precision}
+        )
 
     def to_arrow(self) -> pa.Table:
         """Create an arrow table of volumetric data."""
@@ -123,7 +152,7 @@ class VaspVolumetricArchive(Archiver):
         for idx in [schema_idx] + [
             i for i in range(len(self.file_names)) if i != schema_idx
         ]:
-            table = self.volumetric_archives[idx].to_arrow()
+            table = self._get_volumetric_archive(idx).to_arrow()
             table = table.append_column("file_name", pa.array([self.file_names[idx]]))
             table = table.append_column("identifier", pa.array([self.identifier]))
             tables.append(table)
@@ -162,3 +191,83 @@ class VaspVolumetricArchive(Archiver):
                 )
 
         return output_data
+
+    @staticmethod
+    def _grid_group_key(file_name: str, identifier: str | None = None) -> str:
+        """Get the group holding the grids of one file, one task per group."""
+        return f"{identifier}/{file_name}" if identifier else file_name
+
+    def _to_hdf5_like(self, group: h5py.Group | zarr.Group, **kwargs) -> None:
+        """Write each volumetric file to its own group of chunked grids.
+
+        Data for several calculations can share an archive, as the
+        grids are nested under the identifier of each calculation.
+        """
+        for idx, file_name in enumerate(self.file_names):
+            file_group = group.create_group(
+                self._grid_group_key(file_name, self.identifier)
+            )
+            file_group.attrs["file_name"] = file_name
+            self._get_volumetric_archive(idx)._to_hdf5_like(file_group, **kwargs)
+
+    @classmethod
+    def _extract_from_hdf5_like(
+        cls,
+        group: h5py.Group | zarr.Group,
+        file_names: Sequence[str] | None = None,
+    ) -> list[dict[str, PmgVolumetricData | str]]:
+        """Extract volumetric data from an HDF5-like archive.
+
+        Defaults to extracting all available data within an archive.
+        """
+        file_groups = []
+        for key in group:
+            if "file_name" in group[key].attrs:  # type: ignore[union-attr]
+                file_groups.append((None, group[key]))
+            else:
+                file_groups.extend(
+                    (key, group[key][file_key])  # type: ignore[index]
+                    for file_key in group[key]  # type: ignore[union-attr]
+                )
+
+        return [
+            {
+                "identifier": identifier,
+                "file_name": file_group.attrs["file_name"],
+                "data": VolumetricArchive._extract_from_hdf5_like(
+                    file_group, pmg_cls=PMG_OBJ[file_group.attrs["file_name"]]
+                ),
+            }
+            for identifier, file_group in file_groups
+            if file_names is None or file_group.attrs["file_name"] in file_names
+        ]
+
+    @classmethod
+    @contextmanager
+    def open_grids(
+        cls,
+        archive_path: FSPathType,
+        file_name: str,
+        identifier: str | None = None,
+        zarr_store: MutableMapping | None = None,
+    ) -> Generator[VolumetricGridReader, None, None]:
+        """Open the grids of one file for partial reads.
+
+        Parameters
+        -----------
+        archive_path : str or Path
+            The name of the HDF5 or zarr archive.
+        file_name : str
+            The name of the volumetric file, e.g., CHGCAR or LOCPOT.
+        identifier : str or None (default)
+            The identifier of the calculation, if the archive was
+            written with one.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
+        """
+        with VolumetricArchive.open_grids(
+            archive_path,
+            group_key=cls._grid_group_key(file_name, identifier),
+            zarr_store=zarr_store,
+        ) as reader:
+            yield reader
@@ -2,24 +2,134 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Type
+import json
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Type
 
+import h5py
 import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
+from pydantic import ConfigDict, Field, field_serializer, field_validator
+import zarr
 
-from emmet.core.io.pymatgen import BaseVolumetricData as PmgVolumetricData
+from emmet.core.io.pymatgen import BaseVolumetricData as PmgVolumetricData, Structure
 
 from emmet.core.vasp.models import ChgcarLike
 
-from emmet.archival.base import Archiver
 from emmet.archival.atoms import CrystalArchive
+from emmet.archival.base import to_zarr_array_kwargs
+from emmet.archival.precision import PrecisionArchiver, PrecisionPolicy
 
 if TYPE_CHECKING:
+    from collections.abc import Generator, MutableMapping
     from pathlib import Path
 
+    from emmet.core.types.typing import FSPathType
 
-class VolumetricArchive(Archiver, ChgcarLike):
+DEFAULT_GRID_CHUNKS: tuple[int, int, int] = (32, 32, 32)
+
+
+class VolumetricGridReader:
+    """Read parts of volumetric grids from an HDF5-like group.
+
+    The grids are stored as chunked 3D datasets, so that only the
+    chunks intersecting a requested region are decompressed.
+
+    Parameters
+    -----------
+    group : h5py or zarr .Group
+        A group written by VolumetricArchive._to_hdf5_like.
+    """
+
+    def __init__(self, group: h5py.Group | zarr.Group) -> None:
+        self.group = group
+
+    @property
+    def labels(self) -> list[str]:
+        """The spin resolution labels of the stored grids."""
+        return [str(label) for label in self.group.attrs["labels"]]
+
+    def dataset(self, label: str = "total") -> h5py.Dataset | zarr.Array:
+        """Get the lazily-loaded dataset for a single grid."""
+        return self.group["data"][label]  # type: ignore[index]
+
+    def shape(self, label: str = "total") -> tuple[int, int, int]:
+        """Get the shape of a single grid."""
+        return tuple(self.dataset(label).shape)  # type: ignore[return-value]
+
+    def region(self, *index: int | slice, label: str = "total") -> np.ndarray:
+        """Read a sub-volume of a grid, indexed as a 3D NumPy array."""
+        dataset = self.dataset(label)
+        return PrecisionPolicy.decode_array(
+            np.asarray(dataset[index]), dict(dataset.attrs)
+        )
+
+    def plane(
+        self, axis: int, index: int, label: str = "total", stride: int = 1
+    ) -> np.ndarray:
+        """Read the 2D plane of a grid at `index` along `axis`.
+
+        Parameters
+        -----------
+        axis : int
+            The axis normal to the plane, 0, 1, or 2.
+        index : int
+            The index of the plane along `axis`.
+        label : str = "total"
+            The grid to read from.
+        stride : int = 1
+            If greater than 1, only every `stride`-th point in the plane is read.
+        """
+        selection: list[int | slice] = [slice(None, None, stride)] * 3
+        selection[axis] = index
+        return self.region(*selection, label=label)
+
+    def line(
+        self, axis: int, position: tuple[int, int], label: str = "total"
+    ) -> np.ndarray:
+        """Read the 1D profile of a grid along `axis`.
+
+        Parameters
+        -----------
+        axis : int
+            The axis along which the profile is taken, 0, 1, or 2.
+        position : tuple of int
+            The indices of the line along the two remaining axes, in order.
+        label : str = "total"
+            The grid to read from.
+        """
+        selection: list[int | slice] = list(position)
+        selection.insert(axis, slice(None))
+        return self.region(*selection, label=label)
+
+    def downsample(
+        self, stride: int | tuple[int, int, int], label: str = "total"
+    ) -> np.ndarray:
+        """Read every `stride`-th point of a grid along each axis."""
+        strides = (stride,) * 3 if isinstance(stride, int) else stride
+        return self.region(*(slice(None, None, s) for s in strides), label=label)
+
+    def planar_average(self, axis: int, label: str = "total") -> np.ndarray:
+        """Average a grid over the planes normal to `axis`.
+
+        The grid is read one chunk-thick slab at a time, so that the
+        full grid is never held in memory.
+        """
+        dataset = self.dataset(label)
+        npts = dataset.shape[axis]
+        step = (dataset.chunks or dataset.shape)[axis]
+        other_axes = tuple(i for i in range(3) if i != axis)
+        averages = np.empty(npts)
+        for start in range(0, npts, step):
+            selection: list[slice] = [slice(None)] * 3
+            selection[axis] = slice(start, min(start + step, npts))
+            slab = self.region(*selection, label=label)
+            averages[start : start + slab.shape[axis]] = slab.mean(axis=other_axes)
+        return averages
+
+
+class VolumetricArchive(PrecisionArchiver, ChgcarLike):
     """Archive a volumetric data / CHGCAR-like object.
 
     Can archive pymatgen.io.common.VolumetricData
@@ -28,8 +138,97 @@ class VolumetricArchive(Archiver, ChgcarLike):
     While the name of this file suggests a common I/O purpose,
     the structure of the pymatgen object and its Archiver are meant
     for VASP data.
+
+    Grids are held as flat NumPy arrays and stored in arrow as a single
+    buffer of float64 values, so that neither archiving nor extraction
+    passes through python lists.
+
+    With a lossy `precision` policy, grids are stored as float32 or
+    quantized integers, and the achieved error of each grid is recorded
+    in the `data_precision` column or in the attributes of its dataset.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: list[np.ndarray | None] | None = Field(  # type: ignore[assignment]
+        description="The primary volumetric data, as flattened float64 arrays."
+    )
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _coerce_to_arrays(cls, v: Any) -> Any:
+        """Hold grids as flat arrays rather than lists of python floats."""
+        if v is None:
+            return v
+        return [
+            None if grid is None else np.asarray(grid, dtype=np.float64).ravel()
+            for grid in v
+        ]
+
+    @field_serializer("data", when_used="json")
+    def _serialize_data(self, data: list[np.ndarray | None] | None) -> Any:
+        if data is None:
+            return None
+        return [None if grid is None else grid.tolist() for grid in data]
+
+    def _data_to_arrow(self) -> tuple[pa.Array, list[dict[str, Any] | None]]:
+        """Encode the grids of a single row as a list<list<...>> array.
+
+        The grid values are handed to arrow as a single NumPy buffer,
+        with their boundaries recorded as list offsets.
+
+        Returns
+        -----------
+        The encoded grids, and the precision metadata of each grid.
+        """
+        grids: list[np.ndarray | None] = []
+        precision_meta: list[dict[str, Any] | None] = []
+        for grid in self.data or []:
+            if grid is None:
+                grids.append(None)
+                precision_meta.append(None)
+            else:
+                encoded, meta = self.precision.encode_array(grid)
+                grids.append(encoded)
+                precision_meta.append(meta)
+        offsets: list[int] = [0]
+        for grid in grids:
+            offsets.append(offsets[-1] + (0 if grid is None else grid.size))
+        nonnull = [grid for grid in grids if grid is not None]
+        values = (
+            nonnull[0]
+            if len(nonnull) == 1
+            else np.concatenate(nonnull) if nonnull else np.empty(0)
+        )
+        # A null offset marks the corresponding grid as null.
+        grid_offsets = pa.array(
+            offsets,
+            type=pa.int32(),
+            mask=np.array([grid is None for grid in grids] + [False]),
+        )
+        data = pa.ListArray.from_arrays(
+            [0, len(grids)],
+            pa.ListArray.from_arrays(grid_offsets, pa.array(values)),
+        )
+        return data, precision_meta
+
+    @staticmethod
+    def _data_from_arrow(column: pa.ChunkedArray) -> list[np.ndarray | None]:
+        """Decode the grids in the first row of a `data` column.
+
+        The arrays returned are read-only views of the arrow buffers.
+        """
+        row = next(chunk for chunk in column.chunks if len(chunk))[0]
+        grids = row.values
+        values = grids.flatten().to_numpy(zero_copy_only=True)
+        offsets = grids.offsets.to_numpy()
+        offsets = offsets - offsets[0]
+        is_null = grids.is_null().to_pylist()
+        return [
+            None if is_null[i] else values[offsets[i] : offsets[i + 1]]
+            for i in range(len(grids))
+        ]
+
     def to_arrow(self) -> pa.Table:
         config = {
             k: (
@@ -37,8 +236,11 @@ class VolumetricArchive(Archiver, ChgcarLike):
                 if k != "labels"
                 else pa.array([[v.value for v in (self.labels or [])]])
             )
-            for k, v in self.model_dump().items()
+            for k, v in self.model_dump(exclude={"data"}).items()
         }
+        config["data"], precision_meta = self._data_to_arrow()
+        if not self.precision.is_lossless:
+            config["data_precision"] = pa.array([json.dumps(precision_meta)])
 
         crystal_archive = CrystalArchive.from_pmg(self.structure)
         config.update(crystal_archive._to_arrow_arrays(prefix="structure_"))
@@ -52,7 +254,14 @@ class VolumetricArchive(Archiver, ChgcarLike):
         cls_config: dict[str, dict[str, np.ndarray]] = {
             k: {} for k in ("data", "data_aug")
         }
-        data = table["data"].to_numpy()[0]
+        data = cls._data_from_arrow(table["data"])
+        if "data_precision" in table.column_names and (
+            precision_meta := table["data_precision"].to_pylist()[0]
+        ):
+            data = [
+                grid if meta is None else PrecisionPolicy.decode_array(grid, meta)
+                for grid, meta in zip(data, json.loads(precision_meta))
+            ]
         aug_data = (
             table["data_aug"].to_pylist()[0]
             if "data_aug" in table.column_names
@@ -60,7 +269,8 @@ class VolumetricArchive(Archiver, ChgcarLike):
         )
         ranks = table["data_rank"].to_pylist()[0]
         for i, vol_label in enumerate(table["labels"].to_pylist()[0]):
-            cls_config["data"][vol_label] = data[i].reshape(ranks[i])
+            if (grid := data[i]) is not None:
+                cls_config["data"][vol_label] = grid.reshape(ranks[i])
             if aug_data and aug_data[i]:
                 cls_config["data_aug"][vol_label] = np.array(aug_data[i])
 
@@ -69,6 +279,110 @@ class VolumetricArchive(Archiver, ChgcarLike):
             **cls_config,
         )
 
+    def _to_hdf5_like(
+        self,
+        group: h5py.Group | zarr.Group,
+        chunks: tuple[int, int, int] | bool | None = None,
+        **kwargs,
+    ) -> None:
+        """Write each grid to a chunked 3D dataset in `group`.
+
+        Parameters
+        -----------
+        group : h5py or zarr .Group
+        chunks : tuple of int, bool, or None (default)
+            The chunk shape of the grids. If not a tuple, including
+            HDF5's default of `chunks=True`, DEFAULT_GRID_CHUNKS is used.
+            Chunks are truncated to the shape of each grid.
+        **kwargs : compression kwargs to pass to the dataset constructor.
+        """
+        if not isinstance(chunks, tuple | list):
+            chunks = DEFAULT_GRID_CHUNKS
+        labels = [label.value for label in self.labels or []]
+        group.attrs["labels"] = labels
+        if self.identifier:
+            group.attrs["identifier"] = self.identifier
+        group.attrs["structure"] = self.structure.to_json()  # type: ignore[union-attr]
+        if self.data_aug:
+            group.attrs["data_aug"] = json.dumps(
+                [
+                    None if aug is None else [chg.model_dump() for chg in aug]
+                    for aug in self.data_aug
+                ]
+            )
+
+        data_group = group.create_group("data")
+        if isinstance(data_group, h5py.Group):
+            dset_cnstr = data_group.create_dataset
+        else:
+            dset_cnstr = data_group.create_array
+            kwargs = to_zarr_array_kwargs(**kwargs)
+        for i, label in enumerate(labels):
+            if (grid := (self.data or [])[i]) is None:
+                continue
+            shape = tuple(self.data_rank[i])  # type: ignore[index]
+            encoded, precision_meta = self.precision.encode_array(grid)
+            dataset = dset_cnstr(
+                label,
+                data=encoded.reshape(shape),
+                **{
+                    **kwargs,
+                    "chunks": tuple(min(c, n) for c, n in zip(chunks, shape)),
+                },
+            )
+            if not self.precision.is_lossless:
+                dataset.attrs.update(precision_meta)
+
+    @classmethod
+    def _extract_from_hdf5_like(
+        cls,
+        group: h5py.Group | zarr.Group,
+        pmg_cls: Type[PmgVolumetricData] = PmgVolumetricData,
+    ) -> PmgVolumetricData:
+        """Extract the full volumetric data from an HDF5-like group."""
+        reader = VolumetricGridReader(group)
+        cls_config: dict[str, dict[str, np.ndarray]] = {
+            "data": {
+                label: reader.region(label=label)
+                for label in reader.labels
+                if label in group["data"]  # type: ignore[operator]
+            },
+            "data_aug": {},
+        }
+        if aug_data := group.attrs.get("data_aug"):
+            for label, aug in zip(reader.labels, json.loads(aug_data)):
+                if aug:
+                    cls_config["data_aug"][label] = np.array(aug)
+
+        return pmg_cls(
+            Structure.from_dict(json.loads(group.attrs["structure"])),
+            **cls_config,
+        )
+
+    @classmethod
+    @contextmanager
+    def open_grids(
+        cls,
+        archive_path: FSPathType,
+        group_key: str | None = None,
+        zarr_store: MutableMapping | None = None,
+    ) -> Generator[VolumetricGridReader, None, None]:
+        """Open an HDF5 or zarr archive for partial reads of its grids.
+
+        Parameters
+        -----------
+        archive_path : str or Path
+            The name of the archive file.
+        group_key : str or None (default)
+            If not None, the group within the archive holding the grids.
+        zarr_store : MutableMapping or None (default)
+            If specified, the ZARR store to begin file root at.
+        """
+        with cls._open_hdf5_like(
+            archive_path, mode="r", group_key=group_key, zarr_store=zarr_store
+        ) as group:
+            yield VolumetricGridReader(group)
+
     @classmethod
     def _extract_from_parquet(
         cls,
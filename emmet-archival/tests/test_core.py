@@ -1,9 +1,19 @@
 """Test core archival features."""
 
 from pathlib import Path
+
+import h5py
 import pytest
+import zarr
 
-from emmet.archival.core import FileArchive, _get_path_relative_to_parent
+import emmet.archival.core as core_module
+from emmet.archival.core import (
+    FileArchive,
+    _get_path_relative_to_parent,
+    detect_compression,
+    register_zstd_dictionary,
+    train_zstd_dictionary,
+)
 from emmet.archival.utils import CompressionType
 
 
@@ -69,3 +79,62 @@ def test_file_archiver(tmp_dir, compressor):
 
         assert set(extracted) == set(orig)
         assert all(v == extracted[k] for k, v in orig.items())
+
+
+def test_codec_registry(tmp_dir):
+    data = b"SYSTEM = test\nENCUT = 520\nISMEAR = 0\n" * 4
+    for compression in (CompressionType.GZIP, CompressionType.ZSTD):
+        archiver = FileArchive(files=[], compression=compression.name)
+        compressed = archiver._compress(data)
+        assert detect_compression(compressed) == compression
+        # already-compressed data is not compressed again
+        assert archiver._compress(compressed) == compressed
+        assert FileArchive._decompress(compressed) == data
+        assert FileArchive._decompress(compressed, compression=compression) == data
+    assert detect_compression(data) is None
+    assert FileArchive._decompress(data) == data
+
+    samples = [
+        f"SYSTEM = calc {i}\nENCUT = {500 + i}\nISMEAR = {i % 3}\nEDIFF = 1e-{i % 7}\n"
+        for i in range(1000)
+    ]
+    dict_id = register_zstd_dictionary(train_zstd_dictionary(samples, dict_size=2048))
+    dict_archiver = FileArchive(files=[], zstd_dict_id=dict_id)
+    sample = samples[0].encode()
+    compressed = dict_archiver._compress(sample)
+    assert len(compressed) < len(FileArchive(files=[])._compress(sample))
+    assert FileArchive._decompress(compressed) == sample
+
+    # data with trailing null bytes survives the round trip through a dataset
+    with h5py.File("codecs.h5", "w") as f:
+        dict_archiver._writeout(f, "INCAR", sample + b"\x00\x00", compress=False)
+        assert FileArchive._readout(f, "INCAR", decompress=None) == sample + b"\x00\x00"
+
+
+@pytest.mark.parametrize("archive_name", ["incars.h5", "incars.zarr"])
+def test_zstd_dictionary_stored_in_archive(tmp_dir, monkeypatch, archive_name):
+    samples = [
+        f"SYSTEM = calc {i}\nENCUT = {500 + i}\nISMEAR = {i % 3}\nEDIFF = 1e-{i % 7}\n"
+        for i in range(1000)
+    ]
+    dict_id = register_zstd_dictionary(train_zstd_dictionary(samples, dict_size=2048))
+    for i in range(3):
+        Path(f"root/calc_{i}").mkdir(parents=True)
+        Path(f"root/calc_{i}/INCAR").write_text(samples[i])
+    Path("root/README").write_text("INCARs of three calculations")
+
+    zarr_store = zarr.storage.LocalStore(".")
+    archiver = FileArchive.from_directory("root", depth=None).model_copy(
+        update={"zstd_dict_id": dict_id}
+    )
+    archiver.to_archive(archive_name, zarr_store=zarr_store)
+
+    # A new process has no dictionaries registered
+    monkeypatch.setattr(core_module._ZSTD_CODEC, "dictionaries", {})
+    extracted = FileArchive.extract(
+        archive_name, zarr_store=zarr_store, output_dir=Path("extracted").absolute()
+    )
+    assert sorted(p.name for p in extracted) == ["INCAR"] * 3 + ["README"]
+    for i in range(3):
+        assert Path(f"extracted/calc_{i}/INCAR").read_text() == samples[i]
+    assert dict_id in core_module._ZSTD_CODEC.dictionaries
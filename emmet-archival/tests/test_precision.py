@@ -0,0 +1,120 @@
+"""Test lossy precision policies."""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from emmet.archival.base import ArchivalFormat
+from emmet.archival.precision import (
+    FloatPrecision,
+    PrecisionArchiver,
+    PrecisionPolicy,
+)
+
+
+def test_precision_policy_validation():
+    with pytest.raises(ValueError, match="Exactly one"):
+        PrecisionPolicy(precision="quantized")
+    with pytest.raises(ValueError, match="Exactly one"):
+        PrecisionPolicy(precision="quantized", abs_tol=1e-3, rel_tol=1e-3)
+    with pytest.raises(ValueError, match="positive"):
+        PrecisionPolicy(precision="quantized", abs_tol=-1.0)
+
+    assert PrecisionPolicy().is_lossless
+    assert PrecisionPolicy(precision="float32").get_compression(
+        ArchivalFormat.HDF5
+    )["shuffle"]
+
+
+@pytest.mark.parametrize(
+    "policy_kwargs",
+    [
+        {"precision": "float32"},
+        {"precision": "quantized", "abs_tol": 1e-4},
+        {"precision": "quantized", "rel_tol": 1e-5},
+    ],
+)
+def test_encode_array(policy_kwargs):
+    values = np.random.default_rng(0).normal(scale=10.0, size=1000)
+    policy = PrecisionPolicy(**policy_kwargs)
+    encoded, meta = policy.encode_array(values)
+    decoded = policy.decode_array(encoded, meta)
+
+    assert meta["precision"] == policy.precision.value
+    assert np.max(np.abs(decoded - values)) == pytest.approx(meta["max_abs_error"])
+    if policy.precision == FloatPrecision.QUANTIZED:
+        assert np.issubdtype(encoded.dtype, np.integer)
+        bound = policy.abs_tol or policy.rel_tol * np.max(np.abs(values))
+        assert meta["max_abs_error"] <= bound * (1 + 1e-9)
+    else:
+        assert encoded.dtype == np.float32
+
+    with pytest.raises(ValueError, match="finite"):
+        PrecisionPolicy(precision="quantized", abs_tol=1e-3).encode_array(
+            np.array([1.0, np.nan])
+        )
+
+
+def test_encode_table():
+    schema = pa.schema(
+        [
+            ("energies", pa.list_(pa.float64())),
+            (
+                "densities",
+                pa.struct([("up", pa.list_(pa.float64())), ("n", pa.int64())]),
+            ),
+            ("label", pa.string()),
+        ]
+    )
+    table = pa.Table.from_pylist(
+        [
+            {
+                "energies": [-1.23456, 0.5, 7.891011],
+                "densities": {"up": [0.1234567, None, 2.5], "n": 3},
+                "label": "dos",
+            }
+        ],
+        schema=schema,
+    )
+    policy = PrecisionPolicy(precision="quantized", abs_tol=1e-3)
+    encoded = policy.encode_table(table)
+
+    assert pa.types.is_integer(encoded.schema.field("energies").type.value_type)
+    # integer fields are left alone
+    assert encoded.schema.field("densities").type.field("n").type == pa.int64()
+    meta = PrecisionPolicy.get_table_metadata(encoded)
+    assert set(meta) == {"energies", "densities"}
+
+    decoded = PrecisionPolicy.decode_table(encoded, schema)
+    assert decoded.schema == schema
+    orig, new = table.to_pylist()[0], decoded.to_pylist()[0]
+    assert np.allclose(orig["energies"], new["energies"], atol=1e-3)
+    assert new["densities"]["up"][1] is None
+    assert new["densities"]["n"] == 3
+    assert new["label"] == "dos"
+
+
+def test_parquet_byte_stream_split(tmp_path):
+    class _TableArchive(PrecisionArchiver):
+        def to_arrow(self) -> pa.Table:
+            return self.precision.encode_table(
+                pa.Table.from_pylist(
+                    [{"energies": [-1.5, 0.25], "densities": {"up": [0.5], "n": 1}}]
+                )
+            )
+
+    archive = _TableArchive(precision=PrecisionPolicy(precision="float32"))
+    assert archive.get_default_compression(ArchivalFormat.PARQ)[
+        "use_byte_stream_split"
+    ]
+    archive.to_archive(tmp_path / "archive.parquet")
+
+    metadata = pq.ParquetFile(tmp_path / "archive.parquet").metadata.row_group(0)
+    encodings = {
+        metadata.column(i).path_in_schema: metadata.column(i).encodings
+        for i in range(metadata.num_columns)
+    }
+    assert "BYTE_STREAM_SPLIT" in encodings["energies.list.element"]
+    assert "BYTE_STREAM_SPLIT" in encodings["densities.up.list.element"]
+    assert "BYTE_STREAM_SPLIT" not in encodings["densities.n"]
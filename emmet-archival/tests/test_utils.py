@@ -0,0 +1,30 @@
+"""Test archival utilities."""
+
+from pathlib import Path
+
+import emmet.archival.utils as utils_module
+from emmet.archival.utils import in_memory_directory, in_memory_file
+
+
+def test_in_memory_file():
+    with in_memory_file(b"some data", name="OUTCAR") as file_path:
+        assert file_path.read_bytes() == b"some data"
+        # parsers may open the same path more than once
+        with open(file_path, "rb") as f:
+            assert f.read() == b"some data"
+
+
+def test_in_memory_directory():
+    with in_memory_directory() as tmp_dir:
+        (tmp_dir / "INCAR").write_text("ENCUT = 520")
+        assert (tmp_dir / "INCAR").read_text() == "ENCUT = 520"
+    assert not Path(tmp_dir).exists()
+
+
+def test_in_memory_directory_without_space(monkeypatch, tmp_path):
+    monkeypatch.setattr(utils_module, "_SHM_DIR", tmp_path)
+    with in_memory_directory(min_free_bytes=0) as tmp_dir:
+        assert tmp_dir.parent == tmp_path
+    # fall back to the default temporary directory without enough space
+    with in_memory_directory(min_free_bytes=2**62) as tmp_dir:
+        assert tmp_dir.parent != tmp_path
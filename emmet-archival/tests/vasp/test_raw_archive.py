@@ -1,10 +1,16 @@
+import errno
+import shutil
+
 import h5py
+import numpy as np
 import orjson
+import zarr
 from monty.io import zopen
 
 from emmet.archival.utils import zpath
 from emmet.archival.vasp.raw import RawArchive
 from emmet.core.tasks import TaskDoc
+from emmet.core.vasp.utils import FileMetadata
 from emmet.core.utils import get_hash_blocked
 
 
@@ -79,3 +85,106 @@ def test_from_directory(tmp_dir, test_dir):
         orig_task_dict[k] == extracted_task_dict[k]
         for k in set(TaskDoc.model_fields).difference(expected_diff_keys)
     )
+
+
+def test_archive_calculations(tmp_dir, test_dir, monkeypatch):
+    for calc_dir in ("calc_a", "calc_b"):
+        shutil.copytree(test_dir / "raw_vasp", calc_dir)
+
+    def _no_rehash(self):
+        raise AssertionError("Archived files should not be read again to hash them")
+
+    # Stream every file larger than 1 kB, in small chunks
+    with monkeypatch.context() as m:
+        m.setattr(FileMetadata, "compute_hash", _no_rehash)
+        reports = RawArchive.archive_calculations(
+            ["calc_a", "calc_b"],
+            "archive.h5",
+            num_workers=4,
+            stream_threshold=1024,
+            chunk_size=4096,
+        )
+    assert {report.group_key for report in reports} == {"calc_a", "calc_b"}
+    assert all(report.archive == "archive.h5" for report in reports)
+    vasprun_reports = [r for r in reports if r.file_key == "output/vasprun.xml"]
+    assert len(vasprun_reports) == 2
+    assert all(0 < r.bytes_out < r.bytes_in for r in vasprun_reports)
+
+    with h5py.File("archive.h5", "r") as f:
+        assert set(f) == {"calc_a", "calc_b"}
+        # large files are streamed to byte datasets
+        assert f["calc_a/output/vasprun.xml"].dtype == np.uint8
+        # files are hashed as they are read, rather than read again
+        for key in ("output/vasprun.xml", "output/vaspout.h5", "input/INCAR"):
+            dset = f[f"calc_a/{key}"]
+            assert dset.attrs["md5"] == get_hash_blocked(dset.attrs["file_path"])
+        with zopen(test_dir / "raw_vasp" / "vasprun.xml.gz", "rb") as vrun:
+            assert RawArchive._readout(f["calc_b"], "output/vasprun.xml") == vrun.read()
+
+    # extracted calculations are the same as those archived one at a time
+    task_doc = RawArchive.to_task_doc("archive.h5", group_key="calc_a")
+    assert task_doc.output.energy == TaskDoc.from_directory("calc_a").output.energy
+
+    # batch validation and TaskDoc creation open the archive once
+    validators = RawArchive.validate_many("archive.h5", fast=True)
+    assert set(validators) == {"calc_a", "calc_b"}
+    assert all(
+        validator.vasp_files.valid_input_set_name == "MP24RelaxSet"
+        for validator in validators.values()
+    )
+    task_docs = RawArchive.to_task_docs("archive.h5", group_keys=["calc_b"])
+    assert task_docs["calc_b"].output.energy == task_doc.output.energy
+
+    reports = RawArchive.archive_calculations(
+        {"mp-1": "calc_a", "mp-2": "calc_b"}, "sharded.h5", shard_size=1
+    )
+    assert {report.archive for report in reports} == {
+        "sharded.00000.h5",
+        "sharded.00001.h5",
+    }
+
+
+def test_archive_calculations_zarr(tmp_dir, test_dir):
+    shutil.copytree(test_dir / "raw_vasp", "calc_a")
+    zarr_store = zarr.storage.LocalStore(".")
+
+    # Write every file in full, rather than streaming it
+    reports = RawArchive.archive_calculations(
+        ["calc_a"], "archive.zarr", stream_threshold=None, zarr_store=zarr_store
+    )
+    assert {report.group_key for report in reports} == {"calc_a"}
+
+    group = zarr.open_group(store=zarr_store, path="archive.zarr/calc_a", mode="r")
+    with zopen(test_dir / "raw_vasp" / "INCAR.gz", "rb") as incar:
+        assert RawArchive._readout(group, "input/INCAR") == incar.read()
+    assert "input/potcar/content" not in group["output/vaspout.h5"]
+
+    extracted = {
+        file_meta.name: file_meta.path
+        for file_meta in RawArchive.extract("archive.zarr", zarr_store=zarr_store)
+    }
+    with h5py.File(extracted["vaspout.h5"], "r") as f:
+        assert "input/potcar/spec" in f
+
+    task_doc = RawArchive.to_task_doc(
+        "archive.zarr", group_key="calc_a", zarr_store=zarr_store
+    )
+    assert task_doc.output.energy == TaskDoc.from_directory("calc_a").output.energy
+
+
+def test_to_task_doc_without_tmpfs_space(tmp_dir, test_dir, monkeypatch):
+    RawArchive.from_directory(test_dir / "raw_vasp").to_archive("archive.h5")
+    expected = RawArchive.to_task_doc("archive.h5").output.energy
+
+    extract = RawArchive._extract_from_hdf5_like
+    output_dirs = []
+
+    def _extract_to_full_tmpfs(group, keys=None, output_dir=None):
+        output_dirs.append(output_dir)
+        if len(output_dirs) == 1:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return extract(group, keys=keys, output_dir=output_dir)
+
+    monkeypatch.setattr(RawArchive, "_extract_from_hdf5_like", _extract_to_full_tmpfs)
+    assert RawArchive.to_task_doc("archive.h5").output.energy == expected
+    assert len(output_dirs) == 2 and output_dirs[0] != output_dirs[1]
@@ -1,12 +1,22 @@
 """Test volumetric archival."""
 
+import json
 from tempfile import NamedTemporaryFile
 import numpy as np
+import pyarrow as pa
+import pytest
+import zarr
+from numcodecs import Blosc
 
 from emmet.core.io.pymatgen import StructureMatcher, Chgcar, Vasprun
 
+from emmet.archival.precision import PrecisionPolicy
 from emmet.archival.volumetric import VolumetricArchive
-from emmet.archival.vasp.volumetric import DosArchive, BandStructureArchive
+from emmet.archival.vasp.volumetric import (
+    BandStructureArchive,
+    DosArchive,
+    VaspVolumetricArchive,
+)
 
 chgcar_str = """Fake CHGCAR
     4.0
@@ -69,6 +79,82 @@ def test_volumetric_archive():
     # ensure structure is same on round trip
     assert chg.structure == chg_arch.structure
 
+    # grids should be decoded from arrow without copies
+    table = chg_arch.to_arrow()
+    assert table["data"].type == pa.list_(pa.list_(pa.float64()))
+    chg_from_arrow = VolumetricArchive.from_arrow(table)
+    for k, v in chg.data.items():
+        assert not chg_from_arrow.data[k].flags.writeable
+        assert np.all(np.abs(chg_from_arrow.data[k] - v) < 1e-6)
+
+
+@pytest.mark.parametrize(
+    "archive_name, compression, chunks",
+    [
+        ("volumetric.h5", {"chunks": (1, 1, 2)}, (1, 1, 2)),
+        ("volumetric.zarr", None, (2, 2, 3)),
+        ("volumetric.zarr", {"chunks": (1, 1, 2), "compressor": Blosc()}, (1, 1, 2)),
+    ],
+)
+def test_volumetric_subvolume_reads(tmp_dir, archive_name, compression, chunks):
+    with NamedTemporaryFile(mode="wt") as f:
+        f.write(chgcar_str)
+        f.seek(0)
+        chg = Chgcar.from_file(f.name)
+
+    vol_arch = VaspVolumetricArchive(
+        file_names=["CHGCAR"],
+        volumetric_archives=[VolumetricArchive.from_pmg(chg)],
+        identifier="mp-1",
+    )
+    zarr_store = (
+        zarr.storage.LocalStore(".") if archive_name.endswith(".zarr") else None
+    )
+    vol_arch.to_archive(archive_name, compression=compression, zarr_store=zarr_store)
+
+    with VaspVolumetricArchive.open_grids(
+        archive_name, "CHGCAR", identifier="mp-1", zarr_store=zarr_store
+    ) as reader:
+        assert set(reader.labels) == set(chg.data)
+        assert reader.dataset("total").chunks == chunks
+        grid = chg.data["total"]
+        assert np.allclose(reader.region(0, slice(None), slice(1, 3)), grid[0, :, 1:3])
+        assert np.allclose(reader.plane(2, 1), grid[:, :, 1])
+        assert np.allclose(reader.line(1, (1, 2)), grid[1, :, 2])
+        assert np.allclose(reader.downsample(2), grid[::2, ::2, ::2])
+        assert np.allclose(reader.planar_average(2), grid.mean(axis=(0, 1)))
+
+    extracted = VaspVolumetricArchive.extract(archive_name, zarr_store=zarr_store)
+    assert len(extracted) == 1
+    assert extracted[0]["identifier"] == "mp-1"
+    assert extracted[0]["file_name"] == "CHGCAR"
+    for k, v in chg.data.items():
+        assert np.allclose(extracted[0]["data"].data[k], v)
+
+
+def test_volumetric_precision(tmp_dir):
+    with NamedTemporaryFile(mode="wt") as f:
+        f.write(chgcar_str)
+        f.seek(0)
+        chg = Chgcar.from_file(f.name)
+
+    policy = PrecisionPolicy(precision="quantized", abs_tol=1e-3)
+    chg_arch = VolumetricArchive.from_pmg(chg, precision=policy)
+
+    table = chg_arch.to_arrow()
+    assert pa.types.is_integer(table["data"].type.value_type.value_type)
+    precision_meta = json.loads(table["data_precision"].to_pylist()[0])
+    assert all(meta["max_abs_error"] <= 1e-3 for meta in precision_meta)
+    chg_from_arrow = VolumetricArchive.from_arrow(table)
+    for k, v in chg.data.items():
+        assert np.all(np.abs(chg_from_arrow.data[k] - v) <= 1e-3)
+
+    chg_arch.to_archive("chg.h5")
+    with VolumetricArchive.open_grids("chg.h5") as reader:
+        assert np.issubdtype(reader.dataset("total").dtype, np.integer)
+        assert reader.dataset("total").attrs["max_abs_error"] <= 1e-3
+        assert np.all(np.abs(reader.region() - chg.data["total"]) <= 1e-3)
+
 
 def test_dos(test_dir, tmp_dir):
     vasprun = Vasprun(test_dir / "raw_vasp" / "vasprun.xml.gz")
@@ -5,6 +5,22 @@ from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from emmet.builders.base import BaseBuilderInput
 from emmet.builders.utils import filter_map, try_call
 from emmet.core.bonds import BondingDoc
+from emmet.core.io.pymatgen import Structure
+
+
+def _get_conventional_standard_structure(structure: Structure) -> Structure:
+    return SpacegroupAnalyzer(structure).get_conventional_standard_structure()
+
+
+def _build_bonding_doc(
+    deprecated: bool, material_id: str, structure: Structure, **kwargs
+) -> BondingDoc | None:
+    return BondingDoc.from_structure(
+        deprecated=deprecated,
+        material_id=material_id,
+        structure=try_call(_get_conventional_standard_structure, structure),
+        **kwargs
+    )
 
 
 def build_bonding_docs(
@@ -27,21 +43,8 @@ def build_bonding_docs(
        Iterator[BondingDoc]
     """
 
-    def _build(
-        deprecated: bool, material_id: str, structure, **kwargs
-    ) -> BondingDoc | None:
-        return BondingDoc.from_structure(
-            deprecated=deprecated,
-            material_id=material_id,
-            structure=try_call(
-                lambda s: SpacegroupAnalyzer(s).get_conventional_standard_structure(),
-                structure,
-            ),
-            **kwargs
-        )
-
     return filter_map(
-        _build,
+        _build_bonding_doc,
         input_documents,
         work_keys=["deprecated", "material_id", "structure"],
         **kwargs
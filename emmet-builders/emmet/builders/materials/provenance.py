@@ -1,10 +1,16 @@
 """Build provenance collection."""
 
+import json
 import logging
+import os
 from collections import defaultdict
+from dataclasses import dataclass
 from itertools import chain, groupby
-from typing import Iterator
+from pathlib import Path
+from typing import Any, Iterator
 
+import numpy as np
+from monty.io import zopen
 from emmet.core.io.pymatgen import ElementComparator, StructureMatcher, Structure
 
 from emmet.builders.base import BaseBuilderInput
@@ -14,6 +20,8 @@ from emmet.core.connectors.analysis import parse_cif
 from emmet.core.connectors.icsd.client import IcsdClient
 from emmet.core.connectors.icsd.enums import IcsdSubset
 from emmet.core.provenance import DatabaseSNL, ProvenanceDoc
+from emmet.core.types.typing import FSPathType
+from emmet.core.utils import requires_arrow
 
 SETTINGS = EmmetBuildSettings()
 structure_matcher = StructureMatcher(
@@ -27,6 +35,12 @@ structure_matcher = StructureMatcher(
     allow_subset=False,
 )
 
+# Fractional tolerance on volume-normalized, reduced lattice lengths used to
+# discard SNLs before calling `structure_matcher.fit`. This is deliberately
+# looser than LTOL: `fit` tolerates LTOL on any equivalent basis, which can
+# shift the reduced lengths by slightly more.
+PREFILTER_LTOL = 2 * SETTINGS.LTOL
+
 
 logger = logging.getLogger(__name__)
 
@@ -103,59 +117,274 @@ def update_experimental_icsd_structures(**client_kwargs) -> list[DatabaseSNL]:
     )
 
 
+def _get_snl_from_icsd_doc(doc: dict[str, Any]) -> DatabaseSNL | None:
+    """Build a database SNL from an ICSD client document with a CIF."""
+    if not doc.get("cif"):
+        return None
+    return _get_snl_from_cif(
+        doc["cif"],
+        snl_id=f"icsd-{doc['collection_code']}",
+        tags=[IcsdSubset(doc["subset"]).value],
+        source="icsd",
+    )
+
+
+def _write_snls_jsonl(snls: list[DatabaseSNL], sink: Path) -> None:
+    with zopen(sink, "at") as f:
+        for snl in snls:
+            f.write(snl.model_dump_json() + "\n")
+
+
+@requires_arrow
+def _write_snls_parquet(snls: list[DatabaseSNL], sink: Path, part_name: str) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pa_pq
+
+    from emmet.core.arrow import arrowize
+
+    # Parquet files cannot be appended to, so each chunk is written
+    # as a separate part file in the `sink` directory. Parts are named
+    # by the last ID they contain, so a part which was written before
+    # an interruption is not written again when its page is re-fetched.
+    sink.mkdir(parents=True, exist_ok=True)
+    part = sink / f"part-{part_name}.parquet"
+    if part.exists():
+        return
+    tmp_part = part.with_name(f".{part.name}.tmp")
+    pa_pq.write_table(
+        pa.Table.from_pylist(
+            [snl.model_dump(context={"format": "arrow"}) for snl in snls],
+            schema=pa.schema(arrowize(DatabaseSNL)),
+        ),
+        tmp_part,
+    )
+    os.replace(tmp_part, part)
+
+
+def _write_checkpoint(checkpoint: Path, state: dict[str, Any]) -> None:
+    tmp_checkpoint = checkpoint.with_name(checkpoint.name + ".tmp")
+    tmp_checkpoint.write_text(json.dumps(state))
+    os.replace(tmp_checkpoint, checkpoint)
+
+
+def stream_experimental_icsd_structures(
+    sink: FSPathType,
+    checkpoint: FSPathType | None = None,
+    subsets: tuple[IcsdSubset, ...] = (
+        IcsdSubset.EXPERIMENTAL_METALORGANIC,
+        IcsdSubset.EXPERIMENTAL_INORGANIC,
+    ),
+    client_kwargs: dict[str, Any] | None = None,
+    **kwargs,
+) -> int:
+    """Stream ICSD SNLs to a local JSONL or Parquet sink.
+
+    Unlike `update_experimental_icsd_structures`, the ICSD is paged through
+    with `IcsdClient.iter_search` and only one page of CIFs is held in memory
+    at a time. CIFs are parsed with `filter_map`, and each page of SNLs is
+    written to `sink` before the checkpoint is updated.
+
+    If `checkpoint` exists, it records the last ICSD internal ID processed
+    for each subset, and those entries are skipped. An interrupted run
+    can then be resumed by calling this function with the same arguments.
+    A page written to `sink` whose checkpoint was not saved is never
+    duplicated on resume: JSONL sinks are truncated to their size at the
+    last checkpoint, and Parquet part files are named by the last ID of
+    their page and are not rewritten.
+
+    Parameters
+    -----------
+    sink : FSPathType
+        If the path ends in ".parquet", a directory of Parquet part files,
+        one per page. Otherwise, a (optionally compressed) JSONL file
+        which is appended to.
+    checkpoint : FSPathType or None
+        JSON file used to record progress. Defaults to `sink` with a
+        ".checkpoint.json" suffix.
+    subsets : tuple of IcsdSubset
+        The ICSD subsets to retrieve.
+    client_kwargs : dict or None
+        kwargs to pass to `IcsdClient`
+    **kwargs to pass to `filter_map`, e.g., `executor="process"`
+
+    Returns
+    -----------
+    int, the number of SNLs written during this call
+    """
+    sink = Path(sink)
+    checkpoint = Path(checkpoint or f"{sink}.checkpoint.json")
+    is_parquet = sink.name.endswith(".parquet")
+
+    state: dict[str, Any] = {"last_ids": {}, "sink_size": 0}
+    if checkpoint.exists():
+        state = json.loads(checkpoint.read_text())
+
+    # Appends made after the last checkpoint are discarded, as
+    # the pages they came from are fetched and written again
+    if not is_parquet and sink.exists() and sink.stat().st_size > state["sink_size"]:
+        logger.warning(f"Discarding SNLs written to {sink} after the last checkpoint.")
+        with open(sink, "r+b") as f:
+            f.truncate(state["sink_size"])
+
+    num_written = 0
+    with IcsdClient(use_document_model=False, **(client_kwargs or {})) as client:
+        for icsd_subset in subsets:
+            for last_id, data in client.iter_search(
+                subset=icsd_subset,
+                space_group_number=(1, 230),
+                include_cif=True,
+                include_metadata=False,
+                start_after=state["last_ids"].get(icsd_subset.value),
+            ):
+                snls = list(filter_map(_get_snl_from_icsd_doc, data, **kwargs))
+                if snls:
+                    if is_parquet:
+                        part_name = f"{icsd_subset.value}-{last_id:010d}"
+                        _write_snls_parquet(snls, sink, part_name)
+                    else:
+                        _write_snls_jsonl(snls, sink)
+                    num_written += len(snls)
+
+                state["last_ids"][icsd_subset.value] = last_id
+                if not is_parquet and sink.exists():
+                    state["sink_size"] = sink.stat().st_size
+                _write_checkpoint(checkpoint, state)
+
+                logger.info(
+                    f"Wrote {len(snls)} SNLs from {icsd_subset.value} "
+                    f"up to internal ID {last_id}"
+                )
+
+    return num_written
+
+
 class ProvenanceBuilderInput(BaseBuilderInput):
     formula_pretty: str
 
 
-def _match_against_snls(
-    inputs: tuple[list[ProvenanceBuilderInput], list[DatabaseSNL]],
-) -> list[ProvenanceDoc]:
+@dataclass
+class StructureMatchKey:
     """
-    Structure match a set of ProvenanceBuilderInputs against a group of DatabaseSNLs
+    Cheap structure invariants used to reject SNLs before structure matching.
 
-    Should be used in conjunction with ``build_provenance_docs`` to ensure inputs
-    are correctly grouped by 'formula_pretty'.
+    `structure` is reduced the same way `structure_matcher` would reduce it
+    (Niggli, then primitive cell), so that it can be passed to `fit` with
+    `skip_structure_reduction=True`. If the invariants could not be
+    computed, every field other than `structure` is None and the key
+    never rejects a pair.
     """
-    input_documents, snls = inputs
-
-    results = []
-    for input_doc in input_documents:
-        authors = [[SETTINGS.DEFAULT_AUTHOR]]
-        database_ids = defaultdict(list)
-        history = [[SETTINGS.DEFAULT_HISTORY]]
-        references = [SETTINGS.DEFAULT_REFERENCE]
-        theoretical = True
-
-        if snls:
-            for snl in snls:
-                assert isinstance(snl.structure, Structure)
-                if structure_matcher.fit(input_doc.structure, snl.structure):
-                    if snl.source and snl.source in {"icsd", "pauling"}:
-                        theoretical = False
-                        database_ids[snl.source].append(snl.snl_id)
-
-                    if snl.about:
-                        authors.append(snl.about.authors or [])
-                        history.append(snl.about.history or [])
-                        # `SNLAbout` uses string for `references`,
-                        # `ProvenanceDoc` uses list of str
-                        if snl.about.references:
-                            references.append(snl.about.references)
-
-        results.append(
-            ProvenanceDoc.from_structure(
-                meta_structure=input_doc.structure,
-                material_id=input_doc.material_id,
-                deprecated=input_doc.deprecated,
-                database_IDs=database_ids,
-                theoretical=theoretical,
-                authors=list(chain.from_iterable(authors)),
-                history=list(chain.from_iterable(history)),
-                references=references,
+
+    structure: Structure
+    num_sites: int | None = None
+    lengths: np.ndarray | None = None
+
+    @classmethod
+    def from_structure(cls, structure: Structure) -> "StructureMatchKey":
+        try:
+            reduced = structure.get_reduced_structure(reduction_algo="niggli")
+            reduced = reduced.get_primitive_structure()
+        except Exception as e:
+            logger.warning(e)
+            return cls(structure=structure)
+
+        # `structure_matcher` rescales both structures to the same volume,
+        # so density is not an invariant; lattice lengths are compared
+        # per cube root of volume per site instead. Space groups are not
+        # invariant either: distortions within LTOL and STOL can lower
+        # the symmetry of a structure which still matches.
+        lengths = np.sort(reduced.lattice.get_niggli_reduced_lattice().abc)
+        return cls(
+            structure=reduced,
+            num_sites=len(reduced),
+            lengths=lengths / (reduced.volume / len(reduced)) ** (1 / 3),
+        )
+
+    @property
+    def is_reduced(self) -> bool:
+        return self.num_sites is not None
+
+    def may_match(self, other: "StructureMatchKey") -> bool:
+        """Return False only if `other` cannot match this structure."""
+        if not (self.is_reduced and other.is_reduced):
+            return True
+        if self.num_sites != other.num_sites:
+            return False
+        return bool(
+            np.all(
+                np.abs(self.lengths - other.lengths)  # type: ignore[operator]
+                <= PREFILTER_LTOL * np.minimum(self.lengths, other.lengths)  # type: ignore[type-var]
             )
         )
 
-    return results
+    def fit(self, other: "StructureMatchKey") -> bool:
+        if self.is_reduced and other.is_reduced:
+            return structure_matcher.fit(
+                self.structure, other.structure, skip_structure_reduction=True
+            )
+        return structure_matcher.fit(self.structure, other.structure)
+
+
+def _get_match_key(work: tuple[int, Structure]) -> tuple[int, StructureMatchKey]:
+    idx, structure = work
+    return idx, StructureMatchKey.from_structure(structure)
+
+
+def _get_match_keys(
+    structures: list[Structure], **kwargs: Any
+) -> list[StructureMatchKey]:
+    """Compute match keys for many structures, optionally in parallel."""
+    keys = dict(filter_map(_get_match_key, enumerate(structures), **kwargs))
+    return [
+        keys.get(idx) or StructureMatchKey(structure=structure)
+        for idx, structure in enumerate(structures)
+    ]
+
+
+def _match_input_against_snls(
+    inputs: tuple[
+        ProvenanceBuilderInput,
+        StructureMatchKey,
+        list[tuple[DatabaseSNL, StructureMatchKey]],
+    ],
+) -> ProvenanceDoc:
+    """
+    Structure match a single ProvenanceBuilderInput against a group of DatabaseSNLs.
+
+    SNLs which fail the `StructureMatchKey.may_match` prefilter are skipped
+    without calling the structure matcher.
+    """
+    input_doc, input_key, snls = inputs
+
+    authors = [[SETTINGS.DEFAULT_AUTHOR]]
+    database_ids = defaultdict(list)
+    history = [[SETTINGS.DEFAULT_HISTORY]]
+    references = [SETTINGS.DEFAULT_REFERENCE]
+    theoretical = True
+
+    for snl, snl_key in snls:
+        if input_key.may_match(snl_key) and input_key.fit(snl_key):
+            if snl.source and snl.source in {"icsd", "pauling"}:
+                theoretical = False
+                database_ids[snl.source].append(snl.snl_id)
+
+            if snl.about:
+                authors.append(snl.about.authors or [])
+                history.append(snl.about.history or [])
+                # `SNLAbout` uses string for `references`,
+                # `ProvenanceDoc` uses list of str
+                if snl.about.references:
+                    references.append(snl.about.references)
+
+    return ProvenanceDoc.from_structure(
+        meta_structure=input_doc.structure,
+        material_id=input_doc.material_id,
+        deprecated=input_doc.deprecated,
+        database_IDs=database_ids,
+        theoretical=theoretical,
+        authors=list(chain.from_iterable(authors)),
+        history=list(chain.from_iterable(history)),
+        references=references,
+    )
 
 
 def build_provenance_docs(
@@ -166,9 +395,15 @@ def build_provenance_docs(
     on each formula group, and constructs ProvenanceDocs for each group of
     ProvenanceBuilderInputs with matching structures within each formula group.
 
+    Structure invariants (primitive cell size and reduced lattice lengths within
+    ``PREFILTER_LTOL``) are computed once per structure, and only (material, SNL)
+    pairs whose invariants agree are passed to the structure matcher. Both stages are
+    distributed with ``filter_map``, one input document per work item.
+
     Args:
         input_documents: List of ProvenanceBuilderInput objects to process.
         snls: List of DatabaseSNL objects for structure matching against.
+        **kwargs: Passed to ``filter_map``, e.g., ``executor="process"``.
 
     Returns:
         Iterator[ProvenanceDoc]
@@ -177,14 +412,32 @@ def build_provenance_docs(
     input_documents.sort(key=lambda x: x.formula_pretty)
     snls.sort(key=lambda y: y.formula_pretty or "")
 
-    input_docs = dict()
-    for form, input_group in groupby(input_documents, key=lambda x: x.formula_pretty):
-        input_docs[form] = list(input_group)
+    for snl in snls:
+        assert isinstance(snl.structure, Structure)
+
+    input_keys = _get_match_keys([doc.structure for doc in input_documents], **kwargs)
+    snl_keys = _get_match_keys(
+        [snl.structure for snl in snls], **kwargs  # type: ignore[misc]
+    )
 
     snl_docs = dict()
-    for form, snl_group in groupby(snls, key=lambda y: y.formula_pretty):
+    for form, snl_group in groupby(
+        zip(snls, snl_keys), key=lambda y: y[0].formula_pretty
+    ):
         snl_docs[form] = list(snl_group)
 
-    inputs = [(inp, snl_docs.get(form, [])) for form, inp in input_docs.items()]
+    inputs = []
+    for input_doc, input_key in zip(input_documents, input_keys):
+        inputs.append(
+            (
+                input_doc,
+                input_key,
+                [
+                    (snl, snl_key)
+                    for snl, snl_key in snl_docs.get(input_doc.formula_pretty, [])
+                    if input_key.may_match(snl_key)
+                ],
+            )
+        )
 
-    return chain.from_iterable(filter_map(_match_against_snls, inputs, **kwargs))
+    return filter_map(_match_input_against_snls, inputs, **kwargs)
@@ -1,13 +1,22 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
 import numpy as np
 
+import emmet.core
 from emmet.builders.base import BaseBuilderInput
+from emmet.core.io.pymatgen import Structure
 from emmet.core.similarity import (
     CrystalNNSimilarity,
+    IVFIndex,
     M3GNetSimilarity,
     SimilarityDoc,
     SimilarityEntry,
     SimilarityMethod,
     SimilarityScorer,
+    get_closest_vectors_blocked,
 )
 
 SIM_METHOD_TO_SCORER: dict[SimilarityMethod, type[SimilarityScorer]] = {
@@ -26,17 +35,78 @@ class SimilarityBuilderInput(BaseBuilderInput):
     feature_vector: list[float]
 
 
+def _structure_hash(structure: Structure) -> str:
+    """Hash the lattice, species, and fractional coordinates of a structure."""
+    payload = json.dumps(
+        {
+            "lattice": (np.round(structure.lattice.matrix, 8) + 0.0).tolist(),
+            "species": [site.species_string for site in structure],
+            "frac_coords": (np.round(structure.frac_coords, 8) + 0.0).tolist(),
+        }
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _featurizer_key(scorer: SimilarityScorer) -> str:
+    """Identify the featurizer of a scorer and the emmet-core version running it.
+
+    Feature vectors from different models or featurizer implementations
+    are not comparable, so these are part of the cache key.
+    """
+    if isinstance(scorer, M3GNetSimilarity):
+        featurizer = scorer._model_path.name
+    elif isinstance(scorer, CrystalNNSimilarity):
+        featurizer = type(scorer.fingerprinter).__name__
+    else:
+        featurizer = type(scorer).__name__
+    version = getattr(emmet.core, "__version__", "unknown")
+    return f"{featurizer}-{version}".replace(os.sep, "_")
+
+
+def _feature_vector_cache_path(
+    cache_dir: Path,
+    similarity_method: SimilarityMethod,
+    featurizer_key: str,
+    structure_hash: str,
+) -> Path:
+    return (
+        cache_dir
+        / similarity_method.value
+        / featurizer_key
+        / structure_hash[:2]
+        / f"{structure_hash}.npy"
+    )
+
+
 # this could probably be parallelized over `similarity_method`
 def build_feature_vectors(
     input_documents: list[BaseBuilderInput],
     similarity_method: SimilarityMethod | str = SimilarityMethod.CRYSTALNN,
+    num_procs: int = 1,
+    chunk_size: int = 64,
+    cache_dir: str | Path | None = None,
 ) -> list[SimilarityBuilderInput]:
     """Generate similarity feature vectors.
 
+    All structures without a cached feature vector are featurized in a
+    single call, optionally in parallel, so that worker processes and
+    models are only set up once per build. If a `cache_dir` is given,
+    feature vectors are stored there keyed by a hash of each structure,
+    the similarity method, the featurizer model and the emmet-core version,
+    so that unchanged structures are not re-featurized on subsequent builds.
+
     Args:
         input_documents : list of BaseBuilderInput to process
         similarity_method : SimilarityMethod = SimilarityMethod.CRYSTALNN
             The method to use in building similarity docs.
+        num_procs : int = 1
+            Number of parallel processes used to featurize structures.
+        chunk_size : int = 64
+            Number of structures sent to each process at once
+            when num_procs > 1.
+        cache_dir : str, Path, or None (default)
+            Directory of the on-disk feature vector cache.
+            If None, no caching is performed.
     Returns:
         list of SimilarityBuilderInput
     """
@@ -52,33 +122,79 @@ def build_feature_vectors(
     else:
         raise ValueError(f"Unsupported {similarity_method=}")
 
-    return list(
-        map(
-            lambda x: SimilarityBuilderInput(
-                material_id=x.material_id,
-                structure=x.structure,
-                similarity_method=similarity_method,
-                feature_vector=scorer._featurize_structure(x.structure),
-            ),
-            input_documents,
+    feature_vectors: list[np.ndarray | None] = [None] * len(input_documents)
+    cache_paths: list[Path | None] = [None] * len(input_documents)
+    if cache_dir is not None:
+        featurizer_key = _featurizer_key(scorer)
+        for i, doc in enumerate(input_documents):
+            cache_paths[i] = _feature_vector_cache_path(
+                Path(cache_dir),
+                similarity_method,
+                featurizer_key,
+                _structure_hash(doc.structure),
+            )
+            if cache_paths[i].exists():  # type: ignore[union-attr]
+                feature_vectors[i] = np.load(cache_paths[i])  # type: ignore[arg-type]
+
+    to_featurize = [i for i, fv in enumerate(feature_vectors) if fv is None]
+    if to_featurize:
+        new_vectors = scorer.featurize_structures(
+            [input_documents[i].structure for i in to_featurize],
+            num_procs=num_procs,
+            chunk_size=chunk_size,
         )
-    )
+        for i, fv in zip(to_featurize, new_vectors):
+            feature_vectors[i] = fv
+            # Failed featurizations are not cached so that they are retried
+            if (cache_path := cache_paths[i]) is not None and not np.any(np.isnan(fv)):
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, fv)
+                os.replace(tmp_path, cache_path)
+
+    return [
+        SimilarityBuilderInput(
+            material_id=doc.material_id,
+            structure=doc.structure,
+            similarity_method=similarity_method,
+            feature_vector=feature_vectors[i],
+        )
+        for i, doc in enumerate(input_documents)
+    ]
 
 
 def build_similarity_docs(
     input_documents: list[SimilarityBuilderInput],
     num_closest: int = 100,
+    block_size: int = 1024,
+    ann_index: IVFIndex | str | Path | None = None,
+    num_probe: int = 8,
 ) -> list[SimilarityDoc]:
     """Generate similarity feature vectors.
 
     All input docs should use the same similarity method.
     A check is performed at the start to ensure this.
 
+    By default, the closest materials are found exactly, computing
+    distances `block_size` materials at a time. For very large sets of
+    materials, an approximate nearest-neighbor index can be used instead.
+
     Args:
         input_documents : list of SimilarityBuilderInput to process
         num_closest : int = 100
             The number of most similar materials to identify
             for each material
+        block_size : int = 1024
+            The number of materials for which distances are computed
+            at once in the exact search.
+        ann_index : IVFIndex, str, Path, or None (default)
+            If not None, an approximate nearest-neighbor index built
+            from the feature vectors of `input_documents` (in the same
+            order), or a path to a saved index.
+        num_probe : int = 8
+            The number of index cells to search per material when
+            using `ann_index`.
     Returns:
         list of SimilarityDoc
     """
@@ -92,15 +208,37 @@ def build_similarity_docs(
         )
 
     scorer_cls = SIM_METHOD_TO_SCORER[method := input_documents[0].similarity_method]  # type: ignore[attr-defined]
-    material_ids, vectors, structures = np.array(
-        [doc.material_id, doc.feature_vector, doc.structure] for doc in input_documents
-    ).T
+    material_ids = [doc.material_id for doc in input_documents]
+    structures = [doc.structure for doc in input_documents]
+    vectors = np.array([doc.feature_vector for doc in input_documents], dtype=float)
+
+    if isinstance(ann_index, str | Path):
+        ann_index = IVFIndex.load(ann_index)
+
+    if ann_index is None:
+        all_closest_idxs, all_closest_dist = get_closest_vectors_blocked(
+            vectors, num_closest, block_size=block_size
+        )
+    else:
+        if ann_index.vectors.shape != vectors.shape:
+            raise ValueError(
+                "The approximate nearest-neighbor index was not built "
+                "from the feature vectors of the input documents."
+            )
+        all_closest_idxs, all_closest_dist = zip(
+            *(
+                ann_index.query(i, num_closest, num_probe=num_probe)
+                for i in range(len(vectors))
+            )
+        )
+
+    nelements = [len(structure.composition.elements) for structure in structures]
+    formulas = [structure.formula for structure in structures]
 
     similarity_docs = []
     for i, material_id in enumerate(material_ids):
-        closest_idxs, closest_dist = scorer_cls._get_closest_vectors(
-            i, vectors, num_closest
-        )
+        closest_idxs = all_closest_idxs[i]
+        closest_dist = scorer_cls._post_process_distance(all_closest_dist[i])
         similarity_docs.append(
             SimilarityDoc.from_structure(
                 meta_structure=structures[i],
@@ -110,9 +248,9 @@ def build_similarity_docs(
                 sim=[
                     SimilarityEntry(
                         task_id=material_ids[jdx],
-                        nelements=len(structures[jdx].composition.elements),
+                        nelements=nelements[jdx],
                         dissimilarity=100.0 - closest_dist[j],
-                        formula=structures[jdx].formula,
+                        formula=formulas[jdx],
                     )
                     for j, jdx in enumerate(closest_idxs)
                 ],
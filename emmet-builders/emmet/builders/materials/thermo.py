@@ -1,6 +1,12 @@
+import json
 import logging
 import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from typing import Iterable, Iterator
 
+from monty.json import MontyEncoder
 from pydantic import BaseModel, ConfigDict, Field
 from emmet.core.io.pymatgen import (
     PhaseDiagram,
@@ -8,7 +14,7 @@ from emmet.core.io.pymatgen import (
     ComputedStructureEntry,
 )
 
-from emmet.builders.utils import HiddenPrints
+from emmet.builders.utils import HiddenPrints, chemsys_permutations
 from emmet.core.thermo import PhaseDiagramDoc, ThermoDoc
 from emmet.core.types.enums import ThermoType
 from emmet.core.types.pymatgen_types.computed_entries_adapter import (
@@ -43,23 +49,144 @@ class ThermoBuilderOutput(BaseModel):
     chemsys: str
     thermo_docs: dict[RunType | ThermoType, list[ThermoDoc] | None]
     phase_diagram_docs: dict[RunType | ThermoType, PhaseDiagramDoc | None]
+    fingerprints: dict[RunType | ThermoType, str] = Field(
+        {}, description="Fingerprint of the input entries for each thermo type."
+    )
+    skipped: list[RunType | ThermoType] = Field(
+        [],
+        description="Thermo types whose input entries were unchanged and were not rebuilt.",
+    )
 
     model_config = ConfigDict(revalidate_instances="never")
 
 
+class ThermoBuildManifest(BaseModel):
+    """
+    Record of the entry fingerprints used in a thermo build, used to skip
+    unchanged chemical systems in subsequent incremental builds.
+
+    Keys are of the form `{chemsys}_{thermo_type}`, as in PhaseDiagramDoc.phase_diagram_id.
+    """
+
+    fingerprints: dict[str, str] = Field(
+        {}, description="Fingerprint of the input entries for each chemsys and thermo type."
+    )
+    rebuilt: list[str] = Field(
+        [], description="Chemsys and thermo types which were (re)built."
+    )
+    skipped: list[str] = Field(
+        [], description="Chemsys and thermo types skipped because their entries were unchanged."
+    )
+    failed: list[str] = Field(
+        [],
+        description="Chemsys and thermo types which failed to build, and are retried in the next build.",
+    )
+
+
 ThermoPDPair = tuple[list[ThermoDoc] | None, PhaseDiagramDoc | None]
 
 logger = logging.getLogger(__name__)
 
 
+def _sorted_chemsys(chemsys: str) -> str:
+    return "-".join(sorted(chemsys.split("-")))
+
+
+def _manifest_key(chemsys: str, thermo_type: RunType | ThermoType) -> str:
+    return f"{chemsys}_{thermo_type.value}"
+
+
+def get_entries_fingerprint(
+    entries: list[ComputedStructureEntry], chemsys: str | None = None
+) -> str:
+    """
+    Fingerprint the data of a list of entries which ThermoDocs are built from.
+
+    Each entry is hashed as its canonical (key-sorted) JSON serialization,
+    so that any change to an entry, e.g., to its energy, structure or data,
+    changes the fingerprint. Entries are hashed separately for each chemical
+    subsystem they belong to, and the subsystem hashes are combined over all
+    subsystems of `chemsys`.
+    The fingerprint of a chemsys therefore only changes when an entry in
+    one of its subsystems is added, removed, or modified.
+
+    Args:
+        entries: Entries for a chemical system and its subsystems.
+        chemsys: Dash-delimited chemical system. Defaults to the union of all
+            elements in `entries`.
+
+    Returns:
+        str, the hex digest of the fingerprint.
+    """
+    entries_by_chemsys: dict[str, list[str]] = defaultdict(list)
+    for entry in entries:
+        entries_by_chemsys[entry.composition.chemical_system].append(
+            json.dumps(entry.as_dict(), cls=MontyEncoder, sort_keys=True)
+        )
+
+    if chemsys is None:
+        chemsys = "-".join(
+            sorted({el for sub in entries_by_chemsys for el in sub.split("-")})
+        )
+
+    hasher = sha256()
+    for subsystem in sorted(chemsys_permutations(chemsys)):
+        sub_hasher = sha256()
+        for serialized in sorted(entries_by_chemsys.get(subsystem, [])):
+            sub_hasher.update(serialized.encode())
+        hasher.update(f"{subsystem}:{sub_hasher.hexdigest()};".encode())
+    return hasher.hexdigest()
+
+
 def build_thermo_docs_and_phase_diagram_docs(
     thermo_input: ThermoBuilderInput,
+    previous_fingerprints: dict[str, str] | None = None,
+    subsystem_stable_entry_ids: (
+        dict[RunType | ThermoType, dict[str, set[str]]] | None
+    ) = None,
+    compute_decomposition_enthalpy: bool = True,
+    num_procs: int = 1,
 ) -> ThermoBuilderOutput:
+    """
+    Build ThermoDocs and PhaseDiagramDocs for a chemical system.
+
+    Args:
+        thermo_input: ThermoBuilderInput with all entries for the chemical system
+            and its subsystems, for each thermo type.
+        previous_fingerprints: If provided, fingerprints from a previous build
+            keyed by `{chemsys}_{thermo_type}`, e.g. `ThermoBuildManifest.fingerprints`.
+            Thermo types whose entries have the same fingerprint are not rebuilt,
+            and are listed in `ThermoBuilderOutput.skipped` instead.
+        subsystem_stable_entry_ids: If provided, for each thermo type, a map of
+            subsystem chemsys to the IDs of entries stable in that subsystem.
+            See `ThermoDoc.construct_phase_diagram`.
+        compute_decomposition_enthalpy: Whether to compute the decomposition
+            enthalpy of each material, see `ThermoDoc.from_entries`.
+        num_procs: Number of processes used to compute decomposition enthalpies.
+            Defaults to 1.
+
+    Returns:
+        ThermoBuilderOutput
+    """
     chemsys = thermo_input.chemsys
 
     thermo_docs = dict()
     phase_diagram_docs = dict()
+    fingerprints = dict()
+    skipped = []
     for thermo_type, entry_list in thermo_input.entries.items():
+        fingerprints[thermo_type] = get_entries_fingerprint(entry_list, chemsys)
+        if (
+            previous_fingerprints
+            and previous_fingerprints.get(_manifest_key(chemsys, thermo_type))
+            == fingerprints[thermo_type]
+        ):
+            logger.debug(
+                f"Skipping unchanged chemsys: {chemsys} and thermo type: {thermo_type}"
+            )
+            skipped.append(thermo_type)
+            continue
+
         logger.debug(
             f"Processing {len(entry_list)} entries for: {chemsys} and thermo type: {thermo_type}"
         )
@@ -68,7 +195,13 @@ def build_thermo_docs_and_phase_diagram_docs(
             warnings.simplefilter("ignore")
             with HiddenPrints():
                 _thermo_docs, _phase_diagram_doc = _produce_pair(
-                    entry_list, thermo_type
+                    entry_list,
+                    thermo_type,
+                    subsystem_stable_entry_ids=(subsystem_stable_entry_ids or {}).get(
+                        thermo_type
+                    ),
+                    compute_decomposition_enthalpy=compute_decomposition_enthalpy,
+                    num_procs=num_procs,
                 )
                 thermo_docs[thermo_type] = _thermo_docs
                 phase_diagram_docs[thermo_type] = _phase_diagram_doc
@@ -77,23 +210,182 @@ def build_thermo_docs_and_phase_diagram_docs(
         chemsys=chemsys,
         thermo_docs=thermo_docs,
         phase_diagram_docs=phase_diagram_docs,
+        fingerprints=fingerprints,
+        skipped=skipped,
     )
 
 
+def build_thermo_docs_incremental(
+    thermo_inputs: Iterable[ThermoBuilderInput],
+    manifest: ThermoBuildManifest | None = None,
+) -> tuple[list[ThermoBuilderOutput], ThermoBuildManifest]:
+    """
+    Incrementally build ThermoDocs and PhaseDiagramDocs for many chemical systems.
+
+    Only chemical systems for which an entry in the chemsys or one of its
+    subsystems has changed since the build recorded in `manifest` are rebuilt.
+
+    Args:
+        thermo_inputs: ThermoBuilderInputs, one per chemical system.
+        manifest: ThermoBuildManifest from a previous build. If None,
+            all chemical systems are built.
+
+    Returns:
+        list of ThermoBuilderOutput for the chemical systems which were
+            (at least partially) rebuilt, and a new ThermoBuildManifest
+            recording the fingerprints and which systems were skipped.
+            Fingerprints are only recorded for thermo types which were
+            skipped or built successfully, so that failures are retried.
+            Fingerprints of chemical systems not in `thermo_inputs` are
+            carried over from `manifest`.
+    """
+    previous_fingerprints = manifest.fingerprints if manifest else {}
+    new_manifest = ThermoBuildManifest(fingerprints=dict(previous_fingerprints))
+    outputs = []
+    for thermo_input in thermo_inputs:
+        output = build_thermo_docs_and_phase_diagram_docs(
+            thermo_input, previous_fingerprints=previous_fingerprints
+        )
+        for thermo_type, fingerprint in output.fingerprints.items():
+            key = _manifest_key(output.chemsys, thermo_type)
+            if thermo_type in output.skipped:
+                new_manifest.skipped.append(key)
+            elif (
+                output.thermo_docs.get(thermo_type) is None
+                and output.phase_diagram_docs.get(thermo_type) is None
+            ):
+                new_manifest.failed.append(key)
+                new_manifest.fingerprints.pop(key, None)
+                continue
+            else:
+                new_manifest.rebuilt.append(key)
+            new_manifest.fingerprints[key] = fingerprint
+        if len(output.skipped) < len(output.fingerprints):
+            outputs.append(output)
+    return outputs, new_manifest
+
+
+# Fingerprint of the entries used to build a chemsys' hull, and the entry IDs on that hull
+SubHullRecord = tuple[str, set[str]]
+
+
+def _build_with_subhulls(
+    thermo_input: ThermoBuilderInput,
+    subhulls: dict[RunType | ThermoType, dict[str, SubHullRecord]],
+) -> ThermoBuilderOutput:
+    """
+    Build a chemsys, reusing the stable sets of previously built subsystems
+    whose entries are identical to those in `thermo_input`.
+    """
+    subsystem_stable_entry_ids: dict[RunType | ThermoType, dict[str, set[str]]] = {}
+    for thermo_type, entry_list in thermo_input.entries.items():
+        subsystem_stable_entry_ids[thermo_type] = {}
+        for subsystem, (fingerprint, stable_ids) in subhulls.get(
+            thermo_type, {}
+        ).items():
+            elements = set(subsystem.split("-"))
+            sub_entries = [
+                entry
+                for entry in entry_list
+                if {el.symbol for el in entry.composition.elements} <= elements
+            ]
+            # Entry energies can depend on the chemsys they were corrected in,
+            # only reuse a sub-hull if it was built from the same entries
+            if get_entries_fingerprint(sub_entries, subsystem) == fingerprint:
+                subsystem_stable_entry_ids[thermo_type][subsystem] = stable_ids
+
+    return build_thermo_docs_and_phase_diagram_docs(
+        thermo_input, subsystem_stable_entry_ids=subsystem_stable_entry_ids
+    )
+
+
+def build_thermo_docs_by_order(
+    thermo_inputs: Iterable[ThermoBuilderInput],
+    num_procs: int = 1,
+) -> Iterator[ThermoBuilderOutput]:
+    """
+    Build ThermoDocs and PhaseDiagramDocs for many chemical systems, from
+    lowest to highest order.
+
+    Chemical systems with the same number of elements are independent and are
+    built in parallel. The stable entries of each hull are retained, and used to
+    shrink the set of entries passed to QHull for every higher-order system
+    containing it, see `ThermoDoc.construct_phase_diagram`.
+
+    Args:
+        thermo_inputs: ThermoBuilderInputs, one per chemical system.
+        num_procs: Number of worker processes. Defaults to 1 (serial).
+
+    Returns:
+        Iterator of ThermoBuilderOutput, ordered by number of elements in the chemsys.
+    """
+    inputs_by_order: dict[int, list[ThermoBuilderInput]] = defaultdict(list)
+    for thermo_input in thermo_inputs:
+        inputs_by_order[len(thermo_input.chemsys.split("-"))].append(thermo_input)
+
+    subhulls: dict[RunType | ThermoType, dict[str, SubHullRecord]] = defaultdict(dict)
+
+    def _relevant_subhulls(
+        chemsys: str,
+    ) -> dict[RunType | ThermoType, dict[str, SubHullRecord]]:
+        subsystems = chemsys_permutations(chemsys) - {_sorted_chemsys(chemsys)}
+        return {
+            thermo_type: {
+                subsystem: record
+                for subsystem, record in records.items()
+                if subsystem in subsystems
+            }
+            for thermo_type, records in subhulls.items()
+        }
+
+    pool = ProcessPoolExecutor(max_workers=num_procs) if num_procs > 1 else None
+    try:
+        for order in sorted(inputs_by_order):
+            work = [
+                (thermo_input, _relevant_subhulls(thermo_input.chemsys))
+                for thermo_input in inputs_by_order.pop(order)
+            ]
+            outputs = (
+                pool.map(_build_with_subhulls, *zip(*work))
+                if pool
+                else (_build_with_subhulls(*args) for args in work)
+            )
+            for output in outputs:
+                for thermo_type, pd_doc in output.phase_diagram_docs.items():
+                    if pd_doc is not None:
+                        subhulls[thermo_type][_sorted_chemsys(output.chemsys)] = (
+                            output.fingerprints[thermo_type],
+                            {
+                                entry.entry_id
+                                for entry in pd_doc.phase_diagram.stable_entries
+                            },
+                        )
+                yield output
+    finally:
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
 def _produce_pair(
     computed_structure_entries: list[ComputedStructureEntry],
     thermo_type: RunType | ThermoType,
+    subsystem_stable_entry_ids: dict[str, set[str]] | None = None,
+    compute_decomposition_enthalpy: bool = True,
+    num_procs: int = 1,
 ) -> ThermoPDPair:
     phase_diagram_doc = None
     try:
         phase_diagram: PhaseDiagram = ThermoDoc.construct_phase_diagram(
-            computed_structure_entries
+            computed_structure_entries,
+            subsystem_stable_entry_ids=subsystem_stable_entry_ids,
         )
         thermo_docs: list[ThermoDoc] = ThermoDoc.from_entries(
             computed_structure_entries,
             thermo_type,
             phase_diagram,
             use_max_chemsys=True,
+            compute_decomposition_enthalpy=compute_decomposition_enthalpy,
+            num_procs=num_procs,
             deprecated=False,
         )
 
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from hashlib import md5
 import os
 import sys
-from itertools import chain, combinations
-from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping, TypeVar
+from itertools import chain, combinations, islice
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    TypeVar,
+)
 
 import numpy as np
 from emmet.core.io.pymatgen import (
@@ -20,7 +35,7 @@ from emmet.core.tasks import CoreTaskDoc
 from emmet.core.types.typing import FSPathType
 
 if TYPE_CHECKING:
-    from typing import Any, Literal
+    from typing import Any
 
 
 def maximal_spanning_non_intersecting_subsets(sets) -> set[set[Any]]:
@@ -380,12 +395,70 @@ def try_call(
         return _default
 
 
+ExecutorBackend = Literal["serial", "thread", "process"]
+
+
+def _extract_work_kwargs(item: Any, keys: list[str]) -> dict[str, Any]:
+    return {
+        key: item[key] if isinstance(item, Mapping) else getattr(item, key)
+        for key in keys
+    }
+
+
+def _apply_one(
+    fn: Callable[..., T],
+    item: V,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    work_keys: list[str] | None,
+) -> T | None:
+    if work_keys is not None:
+        return try_call(  # type: ignore[misc]
+            fn,
+            *args,
+            **{
+                **try_call(_extract_work_kwargs, item, work_keys, _default={}),  # type: ignore[dict-item]
+                **kwargs,
+            },
+        )
+    return try_call(fn, item, *args, **kwargs)  # type: ignore[misc]
+
+
+def _apply_to_chunk(
+    fn: Callable[..., T],
+    chunk: list[V],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    work_keys: list[str] | None,
+) -> list[T]:
+    """Apply ``fn`` to each item of a chunk, dropping ``None`` results.
+
+    Defined at module level so that it can be pickled and sent to
+    worker processes.
+    """
+    return [
+        res
+        for item in chunk
+        if (res := _apply_one(fn, item, args, kwargs, work_keys)) is not None
+    ]
+
+
+def _chunked(work: Iterable[V], chunk_size: int) -> Iterator[list[V]]:
+    iterator = iter(work)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
 def filter_map(
     fn: Callable[..., T],
     work: Iterable[V],
     /,
     *args: Any,
     work_keys: list[str] | None = None,
+    executor: ExecutorBackend | Executor | None = None,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    max_in_flight: int | None = None,
     **kwargs: Any,
 ) -> Iterator[T]:
     """Apply a function to each item in an iterable, yielding non-None results.
@@ -399,44 +472,78 @@ def filter_map(
     item (via attribute access or dict lookup) and forwarded to ``fn`` as
     keyword arguments, merged with any extra ``**kwargs``.
 
+    Work can optionally be distributed over a ``concurrent.futures`` executor.
+    Items are submitted in chunks of ``chunk_size``, and at most
+    ``max_in_flight`` chunks are pending at any time, so ``work`` is still
+    consumed lazily. Results are yielded in the same order as ``work``.
+    Each item is still wrapped in ``try_call``: failures are dropped unless
+    ``_safe=False`` is passed, in which case the exception is re-raised in
+    the calling process.
+
+    When using the ``"process"`` backend, ``fn``, ``work`` and all extra
+    arguments must be picklable (i.e., no lambdas or locally defined functions).
+
     Args:
         fn: The function to apply to each item in ``work``.
         work: The iterable of items to process.
         *args: Additional positional arguments to forward to ``fn``.
         work_keys: If provided, a list of keys/attributes to extract from
             each item in ``work`` and pass as keyword arguments to ``fn``.
+        executor: The backend used to evaluate ``fn``. One of ``"serial"``
+            (default), ``"thread"``, ``"process"``, or a user-supplied
+            ``concurrent.futures.Executor``. User-supplied executors are
+            not shut down by ``filter_map``.
+        max_workers: Number of workers when ``executor`` is ``"thread"``
+            or ``"process"``. For a user-supplied executor, only used to
+            size ``max_in_flight``. Defaults to ``os.cpu_count()``.
+        chunk_size: Number of items sent to a worker at once. Defaults
+            to 1 for threads and 16 for processes.
+        max_in_flight: Maximum number of chunks pending at once.
+            Defaults to twice ``max_workers``.
         **kwargs: Additional keyword arguments to forward to ``fn``.
 
     Yields:
         Non-``None`` results from applying ``fn`` to each item in ``work``.
     """
 
-    def _extract_kwargs(item: Any, keys: list[str]) -> dict[str, Any]:
-        return {
-            key: item[key] if isinstance(item, Mapping) else getattr(item, key)
-            for key in keys
-        }
-
-    if work_keys is not None:
+    if executor is None or executor == "serial":
         yield from filter(
             lambda y: y is not None,  # type: ignore[arg-type]
-            map(
-                lambda x: try_call(
-                    fn,
-                    *args,
-                    **{
-                        **try_call(_extract_kwargs, x, work_keys, _default={}),  # type: ignore[dict-item]
-                        **kwargs,
-                    },
-                ),
-                work,
-            ),
+            map(lambda x: _apply_one(fn, x, args, kwargs, work_keys), work),
         )
+        return
+
+    if isinstance(executor, Executor):
+        pool = executor
+        owns_pool = False
+    elif executor in ("thread", "process"):
+        pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        pool = pool_cls(max_workers=max_workers)
+        owns_pool = True
     else:
-        yield from filter(
-            lambda y: y is not None,
-            map(
-                lambda x: try_call(fn, x, *args, **kwargs),
-                work,
-            ),
+        raise ValueError(
+            f"Unknown executor {executor!r}, expected one of "
+            "'serial', 'thread', 'process' or a concurrent.futures.Executor."
         )
+
+    if chunk_size is None:
+        chunk_size = 16 if isinstance(pool, ProcessPoolExecutor) else 1
+    max_in_flight = max_in_flight or 2 * (max_workers or os.cpu_count() or 1)
+
+    pending: deque[Future] = deque()
+    try:
+        for chunk in _chunked(work, chunk_size):
+            pending.append(
+                pool.submit(_apply_to_chunk, fn, chunk, args, kwargs, work_keys)
+            )
+            if len(pending) < max_in_flight:
+                continue
+            yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owns_pool:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,14 @@
+import os
+from collections import defaultdict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
 from itertools import groupby
-from typing import Iterator
+from typing import Iterable, Iterator
 
 from emmet.core.io.pymatgen import Structure
 
@@ -13,6 +22,7 @@ from emmet.core.vasp.material import MaterialsDoc
 def build_material_docs(
     input_documents: list[ValidationTaskDoc],
     settings: EmmetBuildSettings = EmmetBuildSettings(),
+    num_procs: int = 1,
 ) -> list[MaterialsDoc]:
     """
     Aggregate ValidationTaskDocs into MaterialsDocs by chemical formula.
@@ -31,6 +41,9 @@ def build_material_docs(
         settings: Builder configuration settings, defaults defined in EmmetBuildSettings.
             Relevant settings: VASP_STRUCTURE_QUALITY_SCORES, VASP_USE_STATICS,
             VASP_ALLOWED_VASP_TYPES, LTOL, STOL, ANGLE_TOL, and SYMPREC.
+        num_procs: Number of worker processes used for space group analysis
+            and structure matching within each formula group. A single pool
+            is shared by all formula groups. Defaults to 1.
 
     Returns:
         list[MaterialsDoc]
@@ -38,24 +51,125 @@ def build_material_docs(
 
     input_documents.sort(key=lambda x: x.formula_pretty or "")
     materials = []
-    for _, _group in groupby(input_documents, key=lambda x: x.formula_pretty):
-        # TODO: logging - task_ids = [task.task_id for task in group]
-        group = list(_group)
-        task_transformations = [task.transformations for task in group]
-        grouped_tasks = filter_and_group_tasks(group, task_transformations, settings)
-        for task_group in grouped_tasks:
-            try:
-                doc = MaterialsDoc.from_tasks(
-                    task_group,
-                    structure_quality_scores=settings.VASP_STRUCTURE_QUALITY_SCORES,
-                    use_statics=settings.VASP_USE_STATICS,
-                )
-                materials.append(doc)
-            except Exception as e:
-                # TODO: logging - failed_ids = list({t_.task_id for t_ in task_group})
-                doc = MaterialsDoc.construct_deprecated_material(task_group)
-                doc.warnings.append(str(e))
-                materials.append(doc)
+    executor = ProcessPoolExecutor(max_workers=num_procs) if num_procs > 1 else None
+    try:
+        for _, _group in groupby(input_documents, key=lambda x: x.formula_pretty):
+            # TODO: logging - task_ids = [task.task_id for task in group]
+            materials.extend(
+                _build_formula_group(list(_group), settings, executor=executor)
+            )
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return materials
+
+
+def stream_material_docs(
+    input_documents: Iterable[ValidationTaskDoc],
+    settings: EmmetBuildSettings | None = None,
+    num_procs: int | None = None,
+    max_in_flight: int | None = None,
+    sorted_by_formula: bool = False,
+) -> Iterator[MaterialsDoc]:
+    """
+    Aggregate ValidationTaskDocs into MaterialsDocs, building each formula
+    group in a separate worker process.
+
+    Formula groups are independent of one another, so they are dispatched to a
+    process pool and MaterialsDocs are yielded as soon as their formula group
+    finishes. The order of the output is therefore not deterministic, and at
+    most `max_in_flight` groups are pending at once, so the full set of
+    materials is never held in memory.
+
+    By default, all input tasks are read and grouped by formula before any
+    group is dispatched, since a group is only complete once every task has
+    been seen. Groups are then dispatched largest-first to balance load.
+    If the input is already sorted by formula_pretty, pass
+    `sorted_by_formula=True` to dispatch each group as soon as it has been
+    read instead, so that only the groups in flight are held in memory.
+
+    Args:
+        input_documents: Iterable of ValidationTaskDoc objects to process. Must
+            contain ALL documents for each unique formula_pretty value, as in
+            `build_material_docs`.
+        settings: Builder configuration settings, defaults defined in EmmetBuildSettings.
+        num_procs: Number of worker processes. Defaults to `os.cpu_count()`.
+        max_in_flight: Maximum number of formula groups submitted but not yet
+            completed. Defaults to twice the number of workers.
+        sorted_by_formula: Whether input_documents is sorted by formula_pretty,
+            so that it can be consumed lazily.
+
+    Returns:
+        Iterator[MaterialsDoc]
+    """
+    settings = settings or EmmetBuildSettings()
+    task_groups: Iterator[list[ValidationTaskDoc]]
+    if sorted_by_formula:
+        task_groups = (
+            list(group)
+            for _, group in groupby(input_documents, key=lambda x: x.formula_pretty)
+        )
+    else:
+        groups: dict[str | None, list[ValidationTaskDoc]] = defaultdict(list)
+        for task in input_documents:
+            groups[task.formula_pretty].append(task)
+        # Sorted descending so that the largest groups are submitted first,
+        # as these dominate the wall time. Popping releases each group's
+        # tasks once it is submitted.
+        formulas = sorted(groups, key=lambda form: len(groups[form]), reverse=True)
+        task_groups = (groups.pop(formula) for formula in formulas)
+
+    max_in_flight = max_in_flight or 2 * (num_procs or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=num_procs) as pool:
+        pending: set[Future] = set()
+        for tasks in task_groups:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(pool.submit(_build_formula_group, tasks, settings))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _build_formula_group(
+    tasks: list[ValidationTaskDoc],
+    settings: EmmetBuildSettings | None = None,
+    executor: Executor | None = None,
+) -> list[MaterialsDoc]:
+    """
+    Build the MaterialsDocs for a set of ValidationTaskDocs sharing a formula.
+
+    Args:
+        tasks: ValidationTaskDocs with the same formula_pretty.
+        settings: Builder configuration settings, defaults defined in EmmetBuildSettings.
+        executor: Optional process pool used in structure matching.
+
+    Returns:
+        list[MaterialsDoc]
+    """
+    settings = settings or EmmetBuildSettings()
+    materials = []
+    task_transformations = [task.transformations for task in tasks]
+    grouped_tasks = filter_and_group_tasks(
+        tasks, task_transformations, settings, executor=executor
+    )
+    for task_group in grouped_tasks:
+        try:
+            doc = MaterialsDoc.from_tasks(
+                task_group,
+                structure_quality_scores=settings.VASP_STRUCTURE_QUALITY_SCORES,
+                use_statics=settings.VASP_USE_STATICS,
+            )
+            materials.append(doc)
+        except Exception as e:
+            # TODO: logging - failed_ids = list({t_.task_id for t_ in task_group})
+            doc = MaterialsDoc.construct_deprecated_material(task_group)
+            doc.warnings.append(str(e))
+            materials.append(doc)
 
     return materials
 
@@ -80,6 +194,7 @@ def filter_and_group_tasks(
     tasks: list[ValidationTaskDoc],
     task_transformations: list[dict | None],
     settings: EmmetBuildSettings,
+    executor: Executor | None = None,
 ) -> Iterator[list[ValidationTaskDoc]]:
     """Groups tasks by structure matching"""
 
@@ -107,6 +222,7 @@ def filter_and_group_tasks(
         stol=settings.STOL,
         angle_tol=settings.ANGLE_TOL,
         symprec=settings.SYMPREC,
+        executor=executor,
     )
     for group in grouped_structures:
         grouped_tasks = [filtered_tasks[struct.index] for struct in group]  # type: ignore[call-overload]
@@ -0,0 +1,45 @@
+import gzip
+import json
+
+import pytest
+
+from emmet.builders.vasp.materials import build_material_docs, stream_material_docs
+from emmet.core.tasks import ValidationTaskDoc
+
+
+@pytest.fixture(scope="module")
+def tasks(test_dir):
+    with gzip.open(test_dir / "test_si_tasks.json.gz", "rt") as f:
+        data = json.load(f)
+
+    si_tasks = [ValidationTaskDoc(**d, is_valid=True) for d in data]
+    # Relabel copies of the Si tasks to give a second, independent formula group
+    relabelled = [
+        task.model_copy(
+            update={"formula_pretty": "Si2", "task_id": f"mp-{1000 + idx}"}
+        )
+        for idx, task in enumerate(si_tasks)
+    ]
+    return si_tasks + relabelled
+
+
+def _summarize(materials):
+    return sorted(
+        (doc.formula_pretty, sorted(str(t) for t in doc.task_ids), doc.deprecated)
+        for doc in materials
+    )
+
+
+@pytest.mark.parametrize("sorted_by_formula", [False, True])
+def test_stream_material_docs(tasks, sorted_by_formula):
+    expected = _summarize(build_material_docs(list(tasks)))
+    assert len(expected) == 2
+
+    inputs = sorted(tasks, key=lambda x: x.formula_pretty)
+    streamed = stream_material_docs(
+        iter(inputs),
+        num_procs=2,
+        max_in_flight=1,
+        sorted_by_formula=sorted_by_formula,
+    )
+    assert _summarize(streamed) == expected
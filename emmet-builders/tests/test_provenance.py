@@ -0,0 +1,283 @@
+import json
+from itertools import combinations
+
+import pytest
+from monty.io import zopen
+from monty.serialization import loadfn
+from pymatgen.io.cif import CifWriter
+
+import emmet.builders.materials.provenance as provenance
+from emmet.builders.materials.provenance import (
+    ProvenanceBuilderInput,
+    StructureMatchKey,
+    build_provenance_docs,
+    stream_experimental_icsd_structures,
+    structure_matcher,
+)
+from emmet.builders.settings import EmmetBuildSettings
+from emmet.core import ARROW_COMPATIBLE
+from emmet.core.connectors.icsd.enums import IcsdSubset
+from emmet.core.io.pymatgen import Lattice, Structure
+from emmet.core.provenance import (
+    Author,
+    DatabaseSNL,
+    History,
+    ProvenanceDoc,
+    SNLAbout,
+)
+from emmet.core.utils import utcnow
+
+if ARROW_COMPATIBLE:
+    import pyarrow.parquet as pa_pq
+
+SINK_NAMES = [
+    "snls.jsonl.gz",
+    pytest.param(
+        "snls.parquet",
+        marks=pytest.mark.skipif(
+            not ARROW_COMPATIBLE, reason="pyarrow must be installed to run this test."
+        ),
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def structures(test_dir):
+    return [
+        Structure(lattice=Lattice.cubic(3.0), species=["Fe"], coords=[[0, 0, 0]]),
+        Structure.from_file(test_dir / "Si_mp_149.cif"),
+        *(entry.structure for entry in loadfn(test_dir / "Li-Fe-O.json.gz")[:3]),
+    ]
+
+
+def _variants(structure):
+    yield structure
+    yield structure * [2, 1, 1]
+    yield structure.copy().make_supercell([[1, 1, 0], [0, 1, 0], [0, 0, 1]])
+    scaled = structure.copy()
+    scaled.scale_lattice(1.3 * structure.volume)
+    yield scaled
+    for strain in (0.05, 0.15):
+        strained = structure.copy()
+        strained.apply_strain([strain, 0, 0])
+        yield strained
+    perturbed = structure.copy()
+    perturbed.perturb(0.1, min_distance=0.05, seed=42)
+    yield perturbed
+
+
+def test_match_key_prefilter(structures):
+    pool = [variant for structure in structures for variant in _variants(structure)]
+    keys = [StructureMatchKey.from_structure(structure) for structure in pool]
+    assert all(key.is_reduced for key in keys)
+
+    num_matches = num_rejected = 0
+    for i, j in combinations(range(len(pool)), 2):
+        if structure_matcher.fit(pool[i], pool[j]):
+            num_matches += 1
+            assert keys[i].may_match(keys[j]), (i, j)
+            assert keys[i].fit(keys[j])
+        elif not keys[i].may_match(keys[j]):
+            num_rejected += 1
+
+    # Every variant matches its parent, and the prefilter is not vacuous
+    assert num_matches >= len(pool) - len(structures)
+    assert num_rejected > 0
+
+
+def _reference_provenance(input_doc, snls):
+    """Build a ProvenanceDoc by matching against every SNL, without prefiltering."""
+    settings = EmmetBuildSettings()
+    authors = [settings.DEFAULT_AUTHOR]
+    database_ids = {}
+    history = [settings.DEFAULT_HISTORY]
+    references = [settings.DEFAULT_REFERENCE]
+    theoretical = True
+    for snl in snls:
+        if snl.formula_pretty != input_doc.formula_pretty:
+            continue
+        if structure_matcher.fit(input_doc.structure, snl.structure):
+            if snl.source in {"icsd", "pauling"}:
+                theoretical = False
+                database_ids.setdefault(snl.source, []).append(snl.snl_id)
+            authors.extend(snl.about.authors or [])
+            history.extend(snl.about.history or [])
+            if snl.about.references:
+                references.append(snl.about.references)
+    return ProvenanceDoc.from_structure(
+        meta_structure=input_doc.structure,
+        material_id=input_doc.material_id,
+        deprecated=input_doc.deprecated,
+        database_IDs=database_ids,
+        theoretical=theoretical,
+        authors=authors,
+        history=history,
+        references=references,
+    )
+
+
+def _summarize_provenance(doc):
+    return (
+        {str(db): ids for db, ids in (doc.database_IDs or {}).items()},
+        doc.theoretical,
+        [author.model_dump() for author in doc.authors],
+        [node.model_dump() if node else None for node in doc.history],
+        doc.references,
+    )
+
+
+def test_build_provenance_docs(structures):
+    sources = ["icsd", "pauling", "user"]
+    snls = []
+    for istruct, structure in enumerate(structures):
+        for ivariant, variant in enumerate(_variants(structure)):
+            idx = 10 * istruct + ivariant
+            source = sources[idx % len(sources)]
+            snls.append(
+                DatabaseSNL.from_structure(
+                    meta_structure=variant,
+                    structure=variant,
+                    snl_id=f"{source}-{idx}",
+                    source=source,
+                    about=SNLAbout(
+                        references=f"@article{{ref{idx}, title={{Ref {idx}}}}}",
+                        authors=[Author(name=f"Author {idx}")],
+                        history=[History(name=f"node {idx}", url="example.com")],
+                        created_at=utcnow(),
+                    ),
+                )
+            )
+
+    # Inputs include supercells and distorted structures, and one which
+    # matches no SNL of its formula
+    input_structures = []
+    for structure in structures:
+        supercell = structure * [1, 1, 2]
+        distorted = structure.copy()
+        distorted.apply_strain([0.03, -0.02, 0])
+        distorted.perturb(0.05, seed=0)
+        input_structures.extend([structure, supercell, distorted])
+    unmatched = structures[1].copy()
+    unmatched.apply_strain([0.4, 0, 0])
+    input_structures.append(unmatched)
+    input_docs = [
+        ProvenanceBuilderInput(
+            material_id=f"mp-{idx}",
+            structure=structure,
+            formula_pretty=structure.composition.reduced_formula,
+        )
+        for idx, structure in enumerate(input_structures)
+    ]
+
+    reference = {
+        str(doc.material_id): _summarize_provenance(_reference_provenance(doc, snls))
+        for doc in input_docs
+    }
+    docs = {
+        str(doc.material_id): _summarize_provenance(doc)
+        for doc in build_provenance_docs(list(input_docs), list(snls))
+    }
+    assert docs == reference
+
+    # The comparison is not vacuous
+    assert any(not theoretical for _, theoretical, *_ in docs.values())
+    assert any(theoretical for _, theoretical, *_ in docs.values())
+
+
+class _FakeIcsdClient:
+    """Serves pages of CIFs as `IcsdClient.iter_search` does."""
+
+    docs: dict[str, list[dict]] = {}
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_search(self, subset, start_after=None, batch_size=2, **kwargs):
+        docs = [
+            doc
+            for doc in self.docs[subset.value]
+            if start_after is None or doc["collection_code"] > start_after
+        ]
+        for istart in range(0, len(docs), batch_size):
+            batch = docs[istart : istart + batch_size]
+            yield batch[-1]["collection_code"], [
+                {**doc, "subset": subset} for doc in batch
+            ]
+
+
+@pytest.fixture
+def icsd_client(monkeypatch, structures):
+    cifs = [str(CifWriter(structure)) for structure in structures]
+    _FakeIcsdClient.docs = {
+        subset.value: [
+            {"collection_code": 100 * isubset + idx, "cif": cif}
+            for idx, cif in enumerate(cifs)
+        ]
+        for isubset, subset in enumerate(
+            (IcsdSubset.EXPERIMENTAL_METALORGANIC, IcsdSubset.EXPERIMENTAL_INORGANIC)
+        )
+    }
+    # A document without a CIF is skipped
+    _FakeIcsdClient.docs[IcsdSubset.EXPERIMENTAL_INORGANIC.value].append(
+        {"collection_code": 150, "cif": None}
+    )
+    monkeypatch.setattr(provenance, "IcsdClient", _FakeIcsdClient)
+    return _FakeIcsdClient
+
+
+def _read_snl_ids(sink):
+    if sink.name.endswith(".parquet"):
+        return pa_pq.read_table(sink, columns=["snl_id"])["snl_id"].to_pylist()
+    with zopen(sink, "rt") as f:
+        return [json.loads(line)["snl_id"] for line in f]
+
+
+@pytest.mark.parametrize("sink_name", SINK_NAMES)
+def test_stream_experimental_icsd_structures(
+    tmp_path, icsd_client, structures, sink_name
+):
+    sink = tmp_path / sink_name
+    expected = sorted(
+        f"icsd-{doc['collection_code']}"
+        for docs in icsd_client.docs.values()
+        for doc in docs
+        if doc["cif"]
+    )
+    assert stream_experimental_icsd_structures(sink) == len(expected)
+    assert sorted(_read_snl_ids(sink)) == expected
+
+    # Nothing is written again once the checkpoint is complete
+    assert stream_experimental_icsd_structures(sink) == 0
+    assert sorted(_read_snl_ids(sink)) == expected
+
+
+@pytest.mark.parametrize("sink_name", SINK_NAMES)
+def test_stream_experimental_icsd_structures_resume(
+    tmp_path, icsd_client, monkeypatch, sink_name
+):
+    sink = tmp_path / sink_name
+    write_checkpoint = provenance._write_checkpoint
+    num_checkpoints = []
+
+    def _interrupted_write_checkpoint(*args):
+        # Interrupt between writing the third page and checkpointing it
+        if len(num_checkpoints) == 2:
+            raise KeyboardInterrupt
+        num_checkpoints.append(1)
+        write_checkpoint(*args)
+
+    monkeypatch.setattr(provenance, "_write_checkpoint", _interrupted_write_checkpoint)
+    with pytest.raises(KeyboardInterrupt):
+        stream_experimental_icsd_structures(sink)
+    assert len(_read_snl_ids(sink)) == 5
+
+    monkeypatch.setattr(provenance, "_write_checkpoint", write_checkpoint)
+    stream_experimental_icsd_structures(sink)
+    snl_ids = _read_snl_ids(sink)
+    assert len(snl_ids) == len(set(snl_ids)) == 10
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+import emmet.core
+from emmet.builders.base import BaseBuilderInput
+from emmet.builders.materials.similarity import (
+    SimilarityBuilderInput,
+    build_feature_vectors,
+    build_similarity_docs,
+)
+from emmet.core.io.pymatgen import Lattice, Structure
+from emmet.core.mpid import AlphaID
+from emmet.core.similarity import CrystalNNSimilarity, IVFIndex, SimilarityMethod
+
+
+@pytest.fixture
+def input_documents(test_dir):
+    si = Structure.from_file(test_dir / "Si_mp_149.cif")
+    strained = si.copy()
+    strained.scale_lattice(1.1 * si.volume)
+    return [
+        BaseBuilderInput(material_id=f"mp-{idx}", structure=structure)
+        for idx, structure in enumerate([si, strained, si.copy()])
+    ]
+
+
+@pytest.fixture
+def featurize_calls(monkeypatch):
+    calls = []
+    featurize_structures = CrystalNNSimilarity.featurize_structures
+
+    def _counting_featurize(self, structures, *args, **kwargs):
+        calls.append(len(structures))
+        return featurize_structures(self, structures, *args, **kwargs)
+
+    monkeypatch.setattr(
+        CrystalNNSimilarity, "featurize_structures", _counting_featurize
+    )
+    return calls
+
+
+def test_build_feature_vectors_cache(tmp_path, input_documents, featurize_calls):
+    docs = build_feature_vectors(
+        input_documents, "CrystalNN", chunk_size=1, cache_dir=tmp_path
+    )
+    # All misses are featurized together, regardless of chunk_size
+    assert featurize_calls == [3]
+    assert np.allclose(docs[0].feature_vector, docs[2].feature_vector)
+
+    cached = build_feature_vectors(input_documents, "CrystalNN", cache_dir=tmp_path)
+    assert featurize_calls == [3]
+    assert [doc.feature_vector for doc in cached] == [
+        doc.feature_vector for doc in docs
+    ]
+
+    # Vectors cached by another version of the featurizer are not reused
+    cache_files = sorted(tmp_path.rglob("*.npy"))
+    assert len(cache_files) == 2
+    assert all(emmet.core.__version__ in str(path) for path in cache_files)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(emmet.core, "__version__", "0.0.0", raising=False)
+        build_feature_vectors(input_documents, "CrystalNN", cache_dir=tmp_path)
+    assert featurize_calls == [3, 3]
+    assert len(list(tmp_path.rglob("*.npy"))) == 4
+
+
+@pytest.fixture
+def similarity_inputs(test_dir):
+    structures = [
+        Structure.from_file(test_dir / "Si_mp_149.cif"),
+        Structure(Lattice.cubic(3.0), ["Fe"], [[0, 0, 0]]),
+        Structure(Lattice.cubic(4.0), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]),
+    ]
+    vectors = np.random.default_rng(0).uniform(size=(20, 8))
+    return [
+        SimilarityBuilderInput(
+            material_id=f"mp-{idx}",
+            structure=structures[idx % len(structures)],
+            similarity_method=SimilarityMethod.CRYSTALNN,
+            feature_vector=vector.tolist(),
+        )
+        for idx, vector in enumerate(vectors)
+    ]
+
+
+def _summarize_sim(docs):
+    return [
+        [
+            (
+                int(AlphaID(entry.task_id)),
+                entry.nelements,
+                entry.formula,
+                entry.dissimilarity,
+            )
+            for entry in doc.sim
+        ]
+        for doc in docs
+    ]
+
+
+def _reference_sim(input_documents, num_closest):
+    """Find the closest materials row by row, as before blocked search."""
+    vectors = np.array([doc.feature_vector for doc in input_documents])
+    reference = []
+    for i in range(len(input_documents)):
+        closest_idxs, closest_dist = CrystalNNSimilarity._get_closest_vectors(
+            i, vectors, num_closest
+        )
+        reference.append(
+            [
+                (
+                    int(AlphaID(input_documents[jdx].material_id)),
+                    len(input_documents[jdx].structure.composition.elements),
+                    input_documents[jdx].structure.formula,
+                    pytest.approx(100.0 - closest_dist[j], abs=1e-8),
+                )
+                for j, jdx in enumerate(closest_idxs)
+            ]
+        )
+    return reference
+
+
+def test_build_similarity_docs(similarity_inputs, tmp_path):
+    reference = _reference_sim(similarity_inputs, 5)
+
+    docs = build_similarity_docs(similarity_inputs, num_closest=5, block_size=7)
+    assert [int(AlphaID(doc.material_id)) for doc in docs] == list(
+        range(len(similarity_inputs))
+    )
+    assert _summarize_sim(docs) == reference
+
+    # Probing every cell of the index makes the approximate search exact
+    vectors = np.array([doc.feature_vector for doc in similarity_inputs])
+    index = IVFIndex.from_vectors(vectors, num_lists=4)
+    index.save(tmp_path / "index.npz")
+    for ann_index in (index, tmp_path / "index.npz", str(tmp_path / "index.npz")):
+        docs = build_similarity_docs(
+            similarity_inputs, num_closest=5, ann_index=ann_index, num_probe=4
+        )
+        assert _summarize_sim(docs) == reference
+
+    with pytest.raises(ValueError, match="not built from the feature vectors"):
+        build_similarity_docs(
+            similarity_inputs[:-1], num_closest=5, ann_index=index, num_probe=4
+        )
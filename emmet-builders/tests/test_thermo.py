@@ -0,0 +1,212 @@
+from copy import deepcopy
+
+import pytest
+from monty.serialization import loadfn
+
+import emmet.builders.materials.thermo as thermo_module
+from emmet.builders.materials.thermo import (
+    ThermoBuilderInput,
+    ThermoBuildManifest,
+    build_thermo_docs_and_phase_diagram_docs,
+    build_thermo_docs_by_order,
+    build_thermo_docs_incremental,
+    get_entries_fingerprint,
+)
+from emmet.core.types.enums import ThermoType
+
+
+@pytest.fixture(scope="module")
+def entries(test_dir):
+    return loadfn(test_dir / "Li-Fe-O.json.gz")
+
+
+def _entries_in(entries, chemsys):
+    elements = set(chemsys.split("-"))
+    return [
+        entry
+        for entry in entries
+        if {el.symbol for el in entry.composition.elements} <= elements
+    ]
+
+
+def _thermo_input(entries, chemsys):
+    return ThermoBuilderInput(
+        chemsys=chemsys,
+        entries={ThermoType.GGA_GGA_U: _entries_in(entries, chemsys)},
+    )
+
+
+def test_get_entries_fingerprint(entries):
+    fe_o = _entries_in(entries, "Fe-O")
+    fingerprint = get_entries_fingerprint(fe_o, "Fe-O")
+    assert get_entries_fingerprint(fe_o[::-1], "O-Fe") == fingerprint
+    assert get_entries_fingerprint(fe_o) == fingerprint
+
+    # Entries outside the subsystems of the chemsys are ignored
+    assert get_entries_fingerprint(entries, "Fe-O") == fingerprint
+
+    # Any change to an entry in a subsystem changes the fingerprint
+    modified = fe_o[0].copy()
+    modified.correction += 0.1
+    assert get_entries_fingerprint([modified, *fe_o[1:]], "Fe-O") != fingerprint
+    assert get_entries_fingerprint(fe_o[1:], "Fe-O") != fingerprint
+
+    # Including data which ThermoDocs copy or use to select entries
+    aspherical = deepcopy(fe_o[0])
+    aspherical.data["aspherical"] = not aspherical.data.get("aspherical", False)
+    assert get_entries_fingerprint([aspherical, *fe_o[1:]], "Fe-O") != fingerprint
+    strained = deepcopy(fe_o[0])
+    strained.structure.apply_strain(0.01)
+    assert get_entries_fingerprint([strained, *fe_o[1:]], "Fe-O") != fingerprint
+
+
+def test_build_thermo_docs_incremental(entries):
+    thermo_inputs = [_thermo_input(entries, chemsys) for chemsys in ["Fe-O", "Li-O"]]
+    outputs, manifest = build_thermo_docs_incremental(thermo_inputs)
+    keys = ["Fe-O_GGA_GGA+U", "Li-O_GGA_GGA+U"]
+    assert len(outputs) == 2
+    assert sorted(manifest.rebuilt) == keys
+    assert sorted(manifest.fingerprints) == keys
+
+    # Manifests round-trip, and unchanged systems are skipped
+    manifest = ThermoBuildManifest.model_validate_json(manifest.model_dump_json())
+    outputs, new_manifest = build_thermo_docs_incremental(thermo_inputs, manifest)
+    assert outputs == []
+    assert sorted(new_manifest.skipped) == keys
+    assert new_manifest.fingerprints == manifest.fingerprints
+
+    # Only the system whose entries changed is rebuilt
+    li_o = thermo_inputs[1].entries[ThermoType.GGA_GGA_U]
+    thermo_inputs[1] = ThermoBuilderInput(
+        chemsys="Li-O", entries={ThermoType.GGA_GGA_U: li_o[1:]}
+    )
+    outputs, new_manifest = build_thermo_docs_incremental(thermo_inputs, manifest)
+    assert [output.chemsys for output in outputs] == ["Li-O"]
+    assert new_manifest.skipped == ["Fe-O_GGA_GGA+U"]
+    assert new_manifest.rebuilt == ["Li-O_GGA_GGA+U"]
+
+
+def test_build_thermo_docs_incremental_entry_data(entries):
+    thermo_inputs = [_thermo_input(entries, chemsys) for chemsys in ["Fe-O", "Li-O"]]
+    _, manifest = build_thermo_docs_incremental(thermo_inputs)
+
+    fe_o = thermo_inputs[0].entries[ThermoType.GGA_GGA_U]
+    aspherical = deepcopy(fe_o[-1])
+    aspherical.data["aspherical"] = not aspherical.data.get("aspherical", False)
+    strained = deepcopy(fe_o[-1])
+    strained.structure.apply_strain(0.01)
+    for modified in (aspherical, strained):
+        outputs, new_manifest = build_thermo_docs_incremental(
+            [
+                ThermoBuilderInput(
+                    chemsys="Fe-O",
+                    entries={ThermoType.GGA_GGA_U: [*fe_o[:-1], modified]},
+                ),
+                thermo_inputs[1],
+            ],
+            manifest,
+        )
+        assert [output.chemsys for output in outputs] == ["Fe-O"]
+        assert new_manifest.rebuilt == ["Fe-O_GGA_GGA+U"]
+
+
+def test_build_thermo_docs_incremental_partial(entries):
+    thermo_inputs = {
+        chemsys: _thermo_input(entries, chemsys) for chemsys in ["Fe-O", "Li-O"]
+    }
+    _, manifest = build_thermo_docs_incremental(thermo_inputs.values())
+
+    # A run over only some systems keeps the fingerprints of the others
+    outputs, partial_manifest = build_thermo_docs_incremental(
+        [thermo_inputs["Li-O"]], manifest
+    )
+    assert outputs == []
+    assert partial_manifest.skipped == ["Li-O_GGA_GGA+U"]
+    assert partial_manifest.fingerprints == manifest.fingerprints
+
+    # So that the next full run skips them
+    outputs, full_manifest = build_thermo_docs_incremental(
+        thermo_inputs.values(), partial_manifest
+    )
+    assert outputs == []
+    assert sorted(full_manifest.skipped) == ["Fe-O_GGA_GGA+U", "Li-O_GGA_GGA+U"]
+
+
+def test_build_thermo_docs_incremental_failure(entries, monkeypatch):
+    produce_pair = thermo_module._produce_pair
+
+    def _failing_produce_pair(entry_list, *args, **kwargs):
+        # As when a PhaseDiagramError is raised for Fe-O
+        if any(el.symbol == "Fe" for e in entry_list for el in e.composition):
+            return None, None
+        return produce_pair(entry_list, *args, **kwargs)
+
+    monkeypatch.setattr(thermo_module, "_produce_pair", _failing_produce_pair)
+    thermo_inputs = [_thermo_input(entries, chemsys) for chemsys in ["Fe-O", "Li-O"]]
+    _, manifest = build_thermo_docs_incremental(thermo_inputs)
+    assert manifest.failed == ["Fe-O_GGA_GGA+U"]
+    assert list(manifest.fingerprints) == ["Li-O_GGA_GGA+U"]
+
+    # Failed systems are retried in the next build
+    outputs, manifest = build_thermo_docs_incremental(thermo_inputs, manifest)
+    assert [output.chemsys for output in outputs] == ["Fe-O"]
+    assert manifest.failed == ["Fe-O_GGA_GGA+U"]
+    assert manifest.skipped == ["Li-O_GGA_GGA+U"]
+
+
+def _summarize(output):
+    return sorted(
+        (doc.material_id, round(doc.energy_above_hull, 8), doc.is_stable)
+        for doc in output.thermo_docs[ThermoType.GGA_GGA_U]
+    )
+
+
+@pytest.mark.parametrize("num_procs", [1, 2])
+def test_build_thermo_docs_by_order(entries, num_procs):
+    # Add a copy of the ground state of O with a different ID, which is ordered
+    # after the original in O but first in the higher-order systems, so that a
+    # different copy is the lowest-energy entry there than is stable in O
+    o_ground = min(_entries_in(entries, "O"), key=lambda e: e.energy_per_atom)
+    o_copy = o_ground.copy()
+    o_copy.entry_id = "mp-0-GGA+U"
+    o_copy.data["material_id"] = "mp-0"
+
+    chemsyses = ["Fe", "Li", "O", "Fe-Li", "Fe-O", "Li-O", "Fe-Li-O"]
+    thermo_inputs = [
+        _thermo_input(
+            [*entries, o_copy] if chemsys == "O" else [o_copy, *entries], chemsys
+        )
+        for chemsys in chemsyses
+    ]
+
+    full_rebuild = {
+        thermo_input.chemsys: _summarize(
+            build_thermo_docs_and_phase_diagram_docs(thermo_input)
+        )
+        for thermo_input in thermo_inputs
+    }
+    outputs = list(build_thermo_docs_by_order(thermo_inputs, num_procs=num_procs))
+    assert [output.chemsys for output in outputs] == chemsyses
+    assert {output.chemsys: _summarize(output) for output in outputs} == full_rebuild
+
+
+def test_build_thermo_docs_decomposition_enthalpy(entries):
+    thermo_input = _thermo_input(entries, "Fe-O")
+    serial = build_thermo_docs_and_phase_diagram_docs(thermo_input)
+    parallel = build_thermo_docs_and_phase_diagram_docs(thermo_input, num_procs=2)
+    assert [
+        (doc.material_id, doc.decomposition_enthalpy)
+        for doc in parallel.thermo_docs[ThermoType.GGA_GGA_U]
+    ] == [
+        (doc.material_id, doc.decomposition_enthalpy)
+        for doc in serial.thermo_docs[ThermoType.GGA_GGA_U]
+    ]
+
+    output = build_thermo_docs_and_phase_diagram_docs(
+        thermo_input, compute_decomposition_enthalpy=False
+    )
+    assert _summarize(output) == _summarize(serial)
+    assert all(
+        doc.decomposition_enthalpy is None
+        for doc in output.thermo_docs[ThermoType.GGA_GGA_U]
+    )
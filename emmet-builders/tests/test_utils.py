@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+import math
+
 import pytest
 from monty.serialization import dumpfn, loadfn
 from numpy.testing import assert_almost_equal
@@ -5,6 +8,7 @@ from emmet.core.io.pymatgen import MigrationGraph
 
 from emmet.builders.utils import (
     chemsys_permutations,
+    filter_map,
     get_hop_cutoff,
     get_potcar_stats,
     maximal_spanning_non_intersecting_subsets,
@@ -103,3 +107,42 @@ def test_get_potcar_stats(method: str, tmp_path):
             potcar_stats[calc_type] == new_potcar_stats[calc_type]
             for calc_type in potcar_stats
         )
+
+
+@pytest.mark.parametrize("executor", ("serial", "thread", "process"))
+def test_filter_map_executors(executor):
+    work = [4.0, -1.0, 9.0, -4.0, 16.0, 25.0]
+
+    # math.sqrt raises for negative inputs, which should be dropped
+    results = filter_map(
+        math.sqrt, work, executor=executor, max_workers=2, chunk_size=2
+    )
+    assert list(results) == [2.0, 3.0, 4.0, 5.0]
+
+    # base=1 is invalid and should be dropped
+    keyed = filter_map(
+        int,
+        [{"base": 2}, {"base": 1}, {"base": 16}],
+        "101",
+        work_keys=["base"],
+        executor=executor,
+        max_workers=2,
+    )
+    assert list(keyed) == [5, 257]
+
+    with pytest.raises(ValueError):
+        list(filter_map(math.sqrt, work, executor=executor, _safe=False))
+
+
+def test_filter_map_user_executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = filter_map(
+            math.sqrt, (float(i**2) for i in range(100)), executor=pool
+        )
+        assert next(results) == 0.0
+        assert list(results) == [float(i) for i in range(1, 100)]
+        # user-supplied executors are not shut down
+        assert pool.submit(math.sqrt, 4.0).result() == 2.0
+
+    with pytest.raises(ValueError, match="Unknown executor"):
+        list(filter_map(math.sqrt, [1.0], executor="gpu"))
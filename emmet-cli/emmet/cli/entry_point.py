@@ -3,6 +3,7 @@ import sys
 import click
 from pathlib import Path
 
+from emmet.cli.ingest import ingest
 from emmet.cli.submit import submit
 from emmet.cli.tasks import tasks
 from emmet.cli.utils import EmmetCliError
@@ -66,3 +67,4 @@ def safe_entry_point() -> None:
 # Add commands
 emmet.add_command(submit)
 emmet.add_command(tasks)
+emmet.add_command(ingest)
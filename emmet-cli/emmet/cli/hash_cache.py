@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+from emmet.core.utils import get_hash_blocked
+from emmet.core.vasp.utils import FileMetadata
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # type: ignore
+
+logger = logging.getLogger("emmet")
+
+DEFAULT_HASH_CACHE_NAME = "file_hashes.sqlite"
+
+# Hashes from different algorithms must never be mixed
+HASH_ALGORITHM = "blake3" if blake3 else "md5"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validations (
+    fingerprint TEXT PRIMARY KEY,
+    valid INTEGER NOT NULL,
+    reasons TEXT NOT NULL
+);
+"""
+
+# Files modified this recently may change again without their mtime
+# changing on file systems with coarse timestamps, so are not cached
+RACY_WINDOW_NS = 2_000_000_000
+
+# Stay well below SQLite's limit on the number of host parameters
+_MAX_QUERY_PARAMS = 900
+
+
+def _stat_key(stat: os.stat_result) -> tuple[int, int, int]:
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class FileHashCache:
+    """Persistent cache of file hashes, keyed on the stat of each file.
+
+    Validation results are also cached, keyed on a fingerprint of the
+    hashes of the files which were validated.
+
+    A cached hash is only reused if the size, modification time (in ns)
+    and inode of the file are unchanged since it was hashed, so that
+    re-hashing a large submission only reads the files which changed.
+    Misses are hashed concurrently in a thread pool.
+
+    The cache is an SQLite database, which is safe to share between
+    processes. Connections are opened lazily per process, so the cache
+    can be passed to forked or pickled workers.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = Path.home() / ".emmet" / DEFAULT_HASH_CACHE_NAME,
+        num_workers: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.num_workers = num_workers
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_conn": None, "_pid": None}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=60.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+    def _lookup(self, paths: list[str]) -> dict[str, tuple[tuple[int, int, int], str]]:
+        cached: dict[str, tuple[tuple[int, int, int], str]] = {}
+        for i in range(0, len(paths), _MAX_QUERY_PARAMS):
+            chunk = paths[i : i + _MAX_QUERY_PARAMS]
+            rows = self.connection.execute(
+                "SELECT path, size, mtime_ns, inode, hash FROM file_hashes "
+                f"WHERE algorithm = ? AND path IN ({','.join('?' * len(chunk))})",
+                [HASH_ALGORITHM, *chunk],
+            )
+            for path, size, mtime_ns, inode, file_hash in rows:
+                cached[path] = ((size, mtime_ns, inode), file_hash)
+        return cached
+
+    def _store(self, rows: list[tuple[str, tuple[int, int, int], str]]) -> None:
+        if not rows:
+            return
+        with self.connection as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes "
+                "(path, size, mtime_ns, inode, algorithm, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, *key, HASH_ALGORITHM, file_hash)
+                    for path, key, file_hash in rows
+                ],
+            )
+
+    def compute_hashes(self, files: Iterable[FileMetadata]) -> None:
+        """Set the hash of each file, only reading files whose stat changed.
+
+        Behaves like calling FileMetadata.compute_hash on each file:
+        a ValueError is raised if a file does not exist, and the hash
+        is set to None if a file cannot be read.
+        """
+        files = list(files)
+        stats: dict[str, os.stat_result] = {}
+        for fm in files:
+            fm.validate_path_exists()
+            path = str(fm.path.absolute())
+            if path not in stats:
+                stats[path] = fm.path.stat()
+
+        cached = self._lookup(list(stats))
+        hashes: dict[str, str | None] = {
+            path: cached[path][1]
+            for path, stat in stats.items()
+            if path in cached and cached[path][0] == _stat_key(stat)
+        }
+
+        def _hash(path: str) -> tuple[str, str | None, bool]:
+            try:
+                file_hash = get_hash_blocked(path)
+                stat = os.stat(path)
+            except Exception:
+                return path, None, False
+            # Only cache the hash if the file did not change while it was read
+            cacheable = _stat_key(stat) == _stat_key(stats[path]) and (
+                time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS
+            )
+            return path, file_hash, cacheable
+
+        misses = [path for path in stats if path not in hashes]
+        if misses:
+            logger.debug(
+                f"Hashing {len(misses)} of {len(stats)} files, "
+                f"{len(hashes)} hashes were cached."
+            )
+            to_store = []
+            with ThreadPoolExecutor(max_workers=self.num_workers) as pool:
+                for path, file_hash, cacheable in pool.map(_hash, misses):
+                    hashes[path] = file_hash
+                    if file_hash is not None and cacheable:
+                        to_store.append((path, _stat_key(stats[path]), file_hash))
+            self._store(to_store)
+
+        for fm in files:
+            fm.hash = hashes[str(fm.path.absolute())]
+
+    def get_validations(
+        self, fingerprints: Iterable[str]
+    ) -> dict[str, tuple[bool, list[str]]]:
+        """Get cached validation results, as (valid, reasons), by fingerprint."""
+        fingerprints = list(fingerprints)
+        cached: dict[str, tuple[bool, list[str]]] = {}
+        for i in range(0, len(fingerprints), _MAX_QUERY_PARAMS):
+            chunk = fingerprints[i : i + _MAX_QUERY_PARAMS]
+            for fingerprint, valid, reasons in self.connection.execute(
+                "SELECT fingerprint, valid, reasons FROM validations "
+                f"WHERE fingerprint IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                cached[fingerprint] = (bool(valid), json.loads(reasons))
+        return cached
+
+    def put_validations(
+        self, validations: Iterable[tuple[str, bool, list[str]]]
+    ) -> None:
+        """Cache (fingerprint, valid, reasons) validation results."""
+        with self.connection as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO validations (fingerprint, valid, reasons) "
+                "VALUES (?, ?, ?)",
+                [
+                    (fingerprint, int(valid), json.dumps(reasons))
+                    for fingerprint, valid, reasons in validations
+                ],
+            )
@@ -0,0 +1,88 @@
+import logging
+from pathlib import Path
+import click
+from emmet.cli.ingestion import ingest_calculations
+from emmet.cli.utils import EmmetCliError
+
+logger = logging.getLogger("emmet")
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option(
+    "--output-dir",
+    "-o",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="Directory to write TaskDoc shards and the ingestion manifest to.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["jsonl", "parquet"]),
+    default="jsonl",
+    help="Format of the TaskDoc shards. Defaults to gzipped JSON lines.",
+)
+@click.option(
+    "--num-workers",
+    type=int,
+    default=None,
+    help="Number of calculations to parse at once. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--timeout",
+    type=float,
+    default=None,
+    help="Maximum time in seconds to spend parsing a single calculation.",
+)
+@click.option(
+    "--memory-limit",
+    type=int,
+    default=None,
+    help="Maximum memory in MB for the process parsing a single calculation.",
+)
+@click.option(
+    "--shard-size", type=int, default=1000, help="Maximum number of TaskDocs per shard."
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    default=False,
+    help="Retry calculations which failed to parse in a previous run.",
+)
+@click.pass_context
+def ingest(
+    ctx: click.Context,
+    paths: list[Path],
+    output_dir: str,
+    fmt: str,
+    num_workers: int | None,
+    timeout: float | None,
+    memory_limit: int | None,
+    shard_size: int,
+    retry_failed: bool,
+) -> None:
+    """Parses all calculations in the provided paths into TaskDocs asynchronously.
+
+    Calculations are recursively discovered in the provided directory paths.
+    Progress is recorded in a manifest in the output directory, so rerunning
+    the same command skips calculations whose files have not changed.
+
+    Returns a task ID that can be used to check the status."""
+    if not paths:
+        raise EmmetCliError("Must provide at least one file or directory path to ingest")
+
+    task_manager = ctx.obj["task_manager"]
+    task_id = task_manager.start_task(
+        ingest_calculations,
+        [str(p) for p in paths],
+        output_dir,
+        fmt=fmt,
+        num_workers=num_workers,
+        timeout=timeout,
+        memory_limit=memory_limit * 1024**2 if memory_limit else None,
+        shard_size=shard_size,
+        retry_failed=retry_failed,
+    )
+    click.echo(f"Ingestion started. Task ID: {task_id}")
+    click.echo("Use 'emmet tasks status <task_id>' to check the status")
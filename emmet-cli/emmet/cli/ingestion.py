@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import resource
+import time
+from collections import defaultdict
+from multiprocessing import get_context
+from multiprocessing.connection import Connection, wait
+from os import PathLike, cpu_count
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal
+
+from pydantic import BaseModel, Field
+
+from emmet.cli.hash_cache import DEFAULT_HASH_CACHE_NAME, FileHashCache
+from emmet.cli.submission import find_all_calculations
+from emmet.cli.utils import EmmetCliError
+from emmet.core.tasks import TaskDoc
+from emmet.core.vasp.utils import FileMetadata
+
+logger = logging.getLogger("emmet")
+
+IngestionFormat = Literal["jsonl", "parquet"]
+
+
+class IngestionRecord(BaseModel):
+    """Record of a single calculation directory in an ingestion manifest."""
+
+    path: str = Field(description="The path to the calculation directory")
+    fingerprint: str = Field(
+        description="Hash of the names and hashes of all VASP files in the directory"
+    )
+    status: Literal["parsed", "failed"] = Field(
+        description="Whether the directory was parsed into a TaskDoc"
+    )
+    shard: str | None = Field(
+        description="The shard the TaskDoc was written to", default=None
+    )
+    row: int | None = Field(
+        description="The index of the TaskDoc within its shard", default=None
+    )
+    error: str | None = Field(
+        description="The reason parsing failed, if applicable", default=None
+    )
+
+
+class IngestionManifest:
+    """Append-only checkpoint of ingested calculation directories.
+
+    Each line of the manifest is an IngestionRecord. Records are appended
+    once the shard holding their TaskDoc is complete, so an interrupted
+    ingestion can be resumed. Later records for a path take precedence:
+    a TaskDoc in a shard is only current if the latest record for its
+    path points to it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.records: dict[str, IngestionRecord] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        record = IngestionRecord.model_validate_json(line)
+                        self.records[record.path] = record
+
+    def is_current(self, path: str, fingerprint: str, retry_failed: bool) -> bool:
+        """Whether the directory at `path` was ingested with the same files."""
+        record = self.records.get(path)
+        return (
+            record is not None
+            and record.fingerprint == fingerprint
+            and not (retry_failed and record.status == "failed")
+        )
+
+    def current_rows(self) -> dict[str, set[int]]:
+        """Get the rows of the current TaskDoc in each shard."""
+        rows: dict[str, set[int]] = defaultdict(set)
+        for record in self.records.values():
+            if record.status == "parsed" and record.shard and record.row is not None:
+                rows[record.shard].add(record.row)
+        return rows
+
+    def add(self, records: Iterable[IngestionRecord]) -> None:
+        with open(self.path, "a") as f:
+            for record in records:
+                self.records[record.path] = record
+                f.write(record.model_dump_json() + "\n")
+            f.flush()
+
+
+class ShardWriter:
+    """Write serialized TaskDocs to sharded JSONL or Parquet files.
+
+    JSONL shards are written as documents arrive and Parquet shards are
+    buffered. Either is written to a temporary file which is only moved
+    into place once the shard is full or the writer is closed, so a shard
+    is never left truncated. `add` and `close` return the path, shard and
+    row of each calculation directory whose document is now on disk.
+    """
+
+    def __init__(self, output_dir: Path, fmt: IngestionFormat, shard_size: int) -> None:
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self._ishard = len(list(output_dir.glob(f"tasks-*.{self._suffix}")))
+        self._paths: list[str] = []
+        self._buffer: list[str] = []
+        self._file: Any = None
+
+    @property
+    def _suffix(self) -> str:
+        return "jsonl.gz" if self.fmt == "jsonl" else "parquet"
+
+    @property
+    def shard_name(self) -> str:
+        return f"tasks-{self._ishard:05d}.{self._suffix}"
+
+    @property
+    def _partial_path(self) -> Path:
+        return self.output_dir / f"{self.shard_name}.partial"
+
+    def add(self, path: str, doc_json: str) -> list[tuple[str, str, int]]:
+        if self.fmt == "parquet":
+            self._buffer.append(doc_json)
+        else:
+            if self._file is None:
+                self._file = gzip.open(self._partial_path, "wt")
+            self._file.write(doc_json + "\n")
+        self._paths.append(path)
+
+        if len(self._paths) >= self.shard_size:
+            return self._finish_shard()
+        return []
+
+    def _write_parquet(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pa_pq
+
+        from emmet.core.arrow import arrowize
+
+        pa_pq.write_table(
+            pa.Table.from_pylist(
+                [
+                    TaskDoc.model_validate_json(doc_json).model_dump(
+                        context={"format": "arrow"}
+                    )
+                    for doc_json in self._buffer
+                ],
+                schema=pa.schema(arrowize(TaskDoc)),
+            ),
+            self._partial_path,
+        )
+        self._buffer = []
+
+    def _finish_shard(self) -> list[tuple[str, str, int]]:
+        if not self._paths:
+            return []
+
+        if self.fmt == "parquet":
+            self._write_parquet()
+        else:
+            self._file.close()
+            self._file = None
+        os.replace(self._partial_path, self.output_dir / self.shard_name)
+
+        written = [(path, self.shard_name, row) for row, path in enumerate(self._paths)]
+        self._paths = []
+        self._ishard += 1
+        return written
+
+    def close(self) -> list[tuple[str, str, int]]:
+        return self._finish_shard()
+
+
+def iter_task_docs(output_dir: PathLike | str) -> Iterator[TaskDoc]:
+    """Read the current TaskDocs written by `ingest_calculations`.
+
+    When a calculation directory changes and is ingested again, its new
+    TaskDoc is written to a new shard and the old one is left in place.
+    Only the TaskDocs which the manifest points to are yielded, so there
+    is exactly one per calculation directory.
+
+    Args:
+        output_dir: The output directory of `ingest_calculations`.
+
+    Returns:
+        Iterator over the current TaskDocs, in order of shard and row.
+    """
+    output_dir = Path(output_dir)
+    current_rows = IngestionManifest(output_dir / "manifest.jsonl").current_rows()
+    for shard in sorted(current_rows):
+        rows = current_rows[shard]
+        if shard.endswith(".parquet"):
+            import pyarrow.parquet as pa_pq
+
+            table = pa_pq.read_table(output_dir / shard).take(sorted(rows))
+            for doc in table.to_pylist(maps_as_pydicts="strict"):
+                yield TaskDoc(**doc)
+        else:
+            with gzip.open(output_dir / shard, "rt") as f:
+                for row, line in enumerate(f):
+                    if row in rows:
+                        yield TaskDoc.model_validate_json(line)
+
+
+def _fingerprint_calculation(files: list[FileMetadata]) -> str:
+    """Hash the names and hashes of all files belonging to a calculation.
+
+    The hash of each file must already be set, e.g., by a FileHashCache.
+    """
+    digest = hashlib.sha256()
+    for file_meta in sorted(files, key=lambda fm: str(fm.path)):
+        digest.update(f"{file_meta.path.name}:{file_meta.hash};".encode())
+    return digest.hexdigest()
+
+
+def _parse_task_doc(
+    dir_name: str,
+    conn: Connection,
+    memory_limit: int | None,
+    task_doc_kwargs: dict[str, Any],
+) -> None:
+    """Parse a TaskDoc in a child process and send back its JSON."""
+    try:
+        if memory_limit:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        doc = TaskDoc.from_directory(dir_name, **task_doc_kwargs)
+        conn.send((True, doc.model_dump_json()))
+    except BaseException as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _parse_in_pool(
+    dir_names: list[str],
+    num_workers: int,
+    timeout: float | None,
+    memory_limit: int | None,
+    task_doc_kwargs: dict[str, Any],
+) -> Iterable[tuple[str, bool, str]]:
+    """Parse directories in child processes, yielding results as they finish.
+
+    Each directory is parsed in its own process so that it can be killed
+    once `timeout` has elapsed, and so that a process exceeding
+    `memory_limit` does not take down the rest of the ingestion.
+
+    Yields tuples of (directory, success, TaskDoc JSON or error message).
+    """
+    ctx = get_context("fork")
+    queue = list(reversed(dir_names))
+    running: dict[Connection, tuple[str, Any, float]] = {}
+
+    try:
+        while queue or running:
+            while queue and len(running) < num_workers:
+                dir_name = queue.pop()
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                proc = ctx.Process(
+                    target=_parse_task_doc,
+                    args=(dir_name, send_conn, memory_limit, task_doc_kwargs),
+                )
+                proc.start()
+                send_conn.close()
+                running[recv_conn] = (dir_name, proc, time.monotonic())
+
+            for conn in wait(list(running), timeout=1.0):
+                assert isinstance(conn, Connection)
+                dir_name, proc, _ = running.pop(conn)
+                try:
+                    success, result = conn.recv()
+                except EOFError:
+                    # The process died without reporting, e.g., it was
+                    # killed by the OS for exceeding its memory.
+                    proc.join()
+                    success, result = False, f"Parser exited with code {proc.exitcode}"
+                conn.close()
+                proc.join()
+                yield dir_name, success, result
+
+            if timeout:
+                now = time.monotonic()
+                for conn, (dir_name, proc, started) in list(running.items()):
+                    if now - started > timeout:
+                        proc.kill()
+                        proc.join()
+                        conn.close()
+                        running.pop(conn)
+                        yield dir_name, False, f"Timed out after {timeout} s"
+    finally:
+        for conn, (_, proc, _) in running.items():
+            proc.kill()
+            proc.join()
+            conn.close()
+
+
+def ingest_calculations(
+    paths: Iterable[PathLike | str],
+    output_dir: PathLike | str,
+    fmt: IngestionFormat = "jsonl",
+    num_workers: int | None = None,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+    shard_size: int = 1000,
+    retry_failed: bool = False,
+    hash_cache: FileHashCache | None = None,
+    **task_doc_kwargs: Any,
+) -> dict[str, int]:
+    """Parse all calculations found under `paths` into sharded TaskDocs.
+
+    Calculations are discovered recursively, and each calculation directory
+    is parsed with TaskDoc.from_directory in a separate process. Progress is
+    recorded in `output_dir / "manifest.jsonl"`, keyed on a hash of the
+    directory's VASP files, so rerunning skips directories which are
+    unchanged since they were last ingested. Files are only read again
+    to hash them if their size, modification time or inode changed.
+
+    The TaskDoc of a directory which changed is written to a new shard,
+    leaving the old one in place; use `iter_task_docs` to read only the
+    current TaskDocs.
+
+    Args:
+        paths: Files or directories to search for calculations.
+        output_dir: Directory to write shards and the manifest to.
+        fmt: Either "jsonl" (gzipped JSON lines) or "parquet".
+        num_workers: Number of calculations to parse at once.
+            Defaults to the number of CPUs.
+        timeout: Time in seconds after which a single parse is killed.
+        memory_limit: Address space limit in bytes for each parsing process.
+        shard_size: Maximum number of TaskDocs per shard.
+        retry_failed: Whether to retry unchanged directories which failed
+            to parse in a previous run.
+        hash_cache: Cache of file hashes used to fingerprint directories.
+            Defaults to a cache in `output_dir`.
+        **task_doc_kwargs: Passed to TaskDoc.from_directory.
+
+    Returns:
+        The number of directories parsed, failed and skipped.
+    """
+    if fmt not in ("jsonl", "parquet"):
+        raise EmmetCliError(f"Unknown ingestion format {fmt!r}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = IngestionManifest(output_dir / "manifest.jsonl")
+
+    files_by_dir: dict[str, list[FileMetadata]] = defaultdict(list)
+    for locator, cm in find_all_calculations(paths):
+        files_by_dir[str(locator.path)].extend(cm.files)
+
+    num_workers = num_workers or cpu_count() or 1
+    if hash_cache is None:
+        hash_cache = FileHashCache(
+            output_dir / DEFAULT_HASH_CACHE_NAME, num_workers=num_workers
+        )
+    hash_cache.compute_hashes(
+        file_meta for files in files_by_dir.values() for file_meta in files
+    )
+    fingerprints = {
+        dir_name: _fingerprint_calculation(files)
+        for dir_name, files in files_by_dir.items()
+    }
+
+    to_parse = [
+        dir_name
+        for dir_name, fingerprint in fingerprints.items()
+        if not manifest.is_current(dir_name, fingerprint, retry_failed)
+    ]
+    summary = {
+        "parsed": 0,
+        "failed": 0,
+        "skipped": len(fingerprints) - len(to_parse),
+    }
+    logger.info(
+        f"Parsing {len(to_parse)} calculations, skipping {summary['skipped']} "
+        "which are unchanged since the last ingestion."
+    )
+
+    writer = ShardWriter(output_dir, fmt, shard_size)
+
+    def _commit(written: list[tuple[str, str, int]]) -> None:
+        manifest.add(
+            IngestionRecord(
+                path=dir_name,
+                fingerprint=fingerprints[dir_name],
+                status="parsed",
+                shard=shard,
+                row=row,
+            )
+            for dir_name, shard, row in written
+        )
+
+    try:
+        for dir_name, success, result in _parse_in_pool(
+            to_parse, num_workers, timeout, memory_limit, task_doc_kwargs
+        ):
+            if success:
+                summary["parsed"] += 1
+                _commit(writer.add(dir_name, result))
+            else:
+                summary["failed"] += 1
+                logger.info(f"Failed to parse {dir_name}: {result}")
+                manifest.add(
+                    [
+                        IngestionRecord(
+                            path=dir_name,
+                            fingerprint=fingerprints[dir_name],
+                            status="failed",
+                            error=result,
+                        )
+                    ]
+                )
+    finally:
+        _commit(writer.close())
+
+    return summary
@@ -1,27 +1,42 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
 import logging
+import time
 from collections import defaultdict
 from multiprocessing import get_context
+from multiprocessing.util import Finalize
 from os import PathLike, cpu_count
 from pathlib import Path
-from typing import ClassVar, Iterable
+from typing import TYPE_CHECKING, ClassVar, Iterable, Iterator
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field, PrivateAttr
 
+import emmet.core
+import pymatgen.core
 from emmet.cli.utils import EmmetCliError
 from emmet.core.vasp.utils import (
     CalculationLocator,
     FileMetadata,
-    recursive_discover_vasp_files,
+    iter_discover_vasp_files,
 )
 from emmet.core.vasp.validation import ValidationDoc
 
+if TYPE_CHECKING:
+    from emmet.cli.hash_cache import FileHashCache
+
 logger = logging.getLogger("emmet")
 
+# Cached validation results are only reused with the same versions of emmet-core
+# and pymatgen, which defines the input sets calculations are validated against
+_VALIDATOR_VERSION = (
+    f"emmet-core={getattr(emmet.core, '__version__', 'unknown')};"
+    f"pymatgen={getattr(pymatgen.core, '__version__', 'unknown')};"
+)
+
 
 class CalculationMetadata(BaseModel):
     id: UUID = Field(
@@ -41,10 +56,17 @@ class CalculationMetadata(BaseModel):
         description="Validation errors for this calculation", default_factory=list
     )
 
-    def validate_calculation(self, locator: CalculationLocator) -> bool:
+    # Whether the last call to validate_calculation ran the validator to
+    # completion, rather than failing with an error
+    _ran_validator: bool = PrivateAttr(default=False)
+
+    def validate_calculation(
+        self, locator: CalculationLocator, hash_cache: FileHashCache | None = None
+    ) -> bool:
         """Validate the calculation. Returns whether it's valid."""
+        self._ran_validator = False
         try:
-            self.refresh()
+            self.refresh(hash_cache=hash_cache)
             if self.calc_valid is None:
                 logger.debug(f"Validating calculation at {locator.path}")
                 validator = ValidationDoc.from_file_metadata(
@@ -52,6 +74,7 @@ class CalculationMetadata(BaseModel):
                 )
                 self.calc_valid = validator.valid
                 self.calc_validation_errors = validator.reasons
+                self._ran_validator = True
         except Exception as e:
             logger.info(f"Error validating calculation: {str(e)}")
             self.calc_valid = False
@@ -60,33 +83,98 @@ class CalculationMetadata(BaseModel):
             )
         return self.calc_valid
 
-    def refresh(self) -> None:
-        """Refreshes the information for the calculation (recalculates hashes and clears validation if any changes)"""
-        changed_files = False
-        for f in self.files:
-            cached_hash = f.hash
-            f.compute_hash()
-            changed_files |= cached_hash != f.hash
-        if changed_files:
+    def refresh(self, hash_cache: FileHashCache | None = None) -> None:
+        """Refreshes the information for the calculation (recalculates hashes and clears validation if any changes)
+
+        If a hash cache is provided, only files whose size, modification time
+        or inode changed since they were last hashed are read."""
+        previous_hashes = [f.hash for f in self.files]
+        if hash_cache is not None:
+            hash_cache.compute_hashes(self.files)
+        else:
+            for f in self.files:
+                f.compute_hash()
+        self._invalidate_if_changed(previous_hashes)
+
+    def get_validation_fingerprint(self) -> str | None:
+        """Hash the names and hashes of all files, to key cached validation results.
+
+        Returns None if any file has not been hashed."""
+        if any(f.hash is None for f in self.files):
+            return None
+        digest = hashlib.sha256(_VALIDATOR_VERSION.encode())
+        for name, file_hash in sorted((f.name, f.hash) for f in self.files):
+            digest.update(f"{name}:{file_hash};".encode())
+        return digest.hexdigest()
+
+    def _invalidate_if_changed(self, previous_hashes: list[str | None]) -> None:
+        if any(f.hash != h for f, h in zip(self.files, previous_hashes)):
             self.calc_valid = None
             self.calc_validation_errors.clear()
 
 
+def refresh_calculations(
+    calculations: list[tuple[CalculationLocator, CalculationMetadata]],
+    hash_cache: FileHashCache,
+) -> None:
+    """Refresh many calculations at once, hashing all of their files in one pool."""
+    previous_hashes = [[f.hash for f in cm.files] for _, cm in calculations]
+    hash_cache.compute_hashes(f for _, cm in calculations for f in cm.files)
+    for (_, cm), hashes in zip(calculations, previous_hashes):
+        cm._invalidate_if_changed(hashes)
+
+
+def index_calculations(
+    calculations: list[tuple[CalculationLocator, CalculationMetadata]],
+) -> dict[CalculationLocator, int]:
+    """Map each locator to the position of its first occurrence in `calculations`."""
+    index: dict[CalculationLocator, int] = {}
+    for i, (locator, _) in enumerate(calculations):
+        index.setdefault(locator, i)
+    return index
+
+
 def invoke_calc_refresh(args):
     path, cm = args
     cm.refresh()
     return path, cm
 
 
+# The hash cache of a validation worker process, see `init_validation_worker`
+_worker_hash_cache: FileHashCache | None = None
+
+
+def init_validation_worker(hash_cache: FileHashCache | None) -> None:
+    """Share one hash cache connection between the tasks of a worker process."""
+    global _worker_hash_cache
+    _worker_hash_cache = hash_cache
+    if hash_cache is not None:
+        Finalize(None, hash_cache.close, exitpriority=10)
+
+
 def invoke_calc_validation(args):
-    locator, cm = args
-    valid = cm.validate_calculation(locator)
-    return locator, valid, cm
+    """Validate a calculation, only returning what changed to keep results small."""
+    index, locator, cm, hash_cache = args
+    if hash_cache is None:
+        hash_cache = _worker_hash_cache
+    start = time.perf_counter()
+    valid = cm.validate_calculation(locator, hash_cache=hash_cache)
+    return (
+        index,
+        valid,
+        cm.calc_validation_errors,
+        [f.hash for f in cm.files],
+        cm._ran_validator,
+        time.perf_counter() - start,
+    )
 
 
 class Submission(BaseModel):
     PARALLEL_THRESHOLD: ClassVar[int] = 100
-    ITEMS_PER_OUTER_CHUNK: ClassVar[int] = 4 * PARALLEL_THRESHOLD
+    MAX_VALIDATION_WORKERS: ClassVar[int] = 100
+    # Small chunks let idle workers pick up the remaining work when
+    # some calculations take much longer to validate than others
+    MAX_VALIDATION_CHUNKSIZE: ClassVar[int] = 16
 
     id: UUID = Field(
         description="The identifier for this submission", default_factory=uuid4
@@ -114,23 +202,57 @@ class Submission(BaseModel):
         default=None
     )
 
+    # Pushes stored in a SubmissionStore which were not loaded, see load_history
+    _history_offset: int = PrivateAttr(default=0)
+    _history_store: Path | None = PrivateAttr(default=None)
+
     def last_pushed(
         self,
     ) -> list[tuple[CalculationLocator, CalculationMetadata]] | None:
         return self.calc_history[-1] if self.calc_history else None
 
+    def load_history(self) -> None:
+        """Load any pushes which were not loaded from a SubmissionStore."""
+        if self._history_offset:
+            from emmet.cli.submission_store import SubmissionStore
+
+            assert self._history_store is not None
+            earlier = SubmissionStore(self._history_store).load_history()
+            self.calc_history = earlier[: self._history_offset] + self.calc_history
+            self._history_offset = 0
+
     def save(self, path: Path) -> None:
-        """Save this submission to a JSON file."""
-        path.write_text(self.model_dump_json(indent=4))
+        """Save this submission to a JSON file or, if `path` ends in `.sqlite`,
+        to a SubmissionStore which only appends new pushes."""
+        from emmet.cli.submission_store import (
+            SUBMISSION_STORE_SUFFIX,
+            SubmissionStore,
+        )
+
+        if Path(path).suffix == SUBMISSION_STORE_SUFFIX:
+            SubmissionStore(path).save(self)
+        else:
+            self.load_history()
+            Path(path).write_text(self.model_dump_json(indent=4))
 
     @classmethod
     def load(
-        cls, path: Path
+        cls, path: Path, full_history: bool = False
     ) -> (
         "Submission"
     ):  # change this to use TypeVar (or self if min Python >= 3.11) if ever create subclasses
-        """Load a submission from a JSON file."""
-        content = path.read_text()
+        """Load a submission from a JSON file or a SubmissionStore.
+
+        From a SubmissionStore, only the latest push is loaded unless
+        `full_history` is set."""
+        from emmet.cli.submission_store import (
+            SUBMISSION_STORE_SUFFIX,
+            SubmissionStore,
+        )
+
+        if Path(path).suffix == SUBMISSION_STORE_SUFFIX:
+            return SubmissionStore(path).load(full_history=full_history)
+        content = Path(path).read_text()
         data = json.loads(content)
         return cls.model_validate(data)
 
@@ -149,30 +271,23 @@ class Submission(BaseModel):
     def _merge_calculations(
         self, cm: list[tuple[CalculationLocator, CalculationMetadata]]
     ):
-        new_calcs = []
-        existing_keys = {k for k, _ in self.calculations}
-        new_keys = {k for k, _ in cm}
-        keys = existing_keys | new_keys
-
-        for k in keys:
-            existing_calc = next((v for loc, v in self.calculations if loc == k), None)
-            new_calc = next((v for loc, v in cm if loc == k), None)
-
-            if existing_calc and new_calc:
-                new_calcs.append(
-                    (
-                        k,
-                        CalculationMetadata(
-                            id=existing_calc.id,
-                            files=list(set(existing_calc.files + new_calc.files)),
-                        ),
-                    )
-                )
+        merged: dict[CalculationLocator, CalculationMetadata] = {}
+        for k, v in self.calculations:
+            merged.setdefault(k, v)
+        added: dict[CalculationLocator, CalculationMetadata] = {}
+        for k, v in cm:
+            added.setdefault(k, v)
+
+        for k, new_calc in added.items():
+            existing_calc = merged.get(k)
+            if existing_calc is None:
+                merged[k] = new_calc
             else:
-                tmp = existing_calc or new_calc
-                assert tmp is not None
-                new_calcs.append((k, tmp))
-        self.calculations = new_calcs
+                merged[k] = CalculationMetadata(
+                    id=existing_calc.id,
+                    files=list(dict.fromkeys(existing_calc.files + new_calc.files)),
+                )
+        self.calculations = list(merged.items())
 
     def add_to(self, paths: Iterable[Path]) -> list[FileMetadata]:
         """Add all files in the paths to the submission. Performs de-duping"""
@@ -190,9 +305,10 @@ class Submission(BaseModel):
     def remove_from(self, paths: Iterable[Path]) -> list[FileMetadata]:
         """Remove all files in the submission that match one of the provided paths."""
 
+        paths = list(paths)
         removed_files = []
         calculations_to_remove = set()
-        files_to_remove = {}
+        files_to_remove: dict[CalculationLocator, set[FileMetadata]] = {}
 
         for calc_locator, calc_metadata in self.calculations:
             matched_entire_calc = any(
@@ -211,88 +327,184 @@ class Submission(BaseModel):
                 if any(fm.path.is_relative_to(rm_path) for rm_path in paths)
             ]
             if matching_files:
-                files_to_remove[calc_locator] = matching_files
+                files_to_remove[calc_locator] = set(matching_files)
                 removed_files.extend(matching_files)
 
-        # Remove entire calculations and update files
-        self.calculations = [
-            (loc, cm)
-            for loc, cm in self.calculations
-            if loc not in calculations_to_remove
-        ]
-
-        # Remove matching files from remaining calculations
-        for locator, files in files_to_remove.items():
-            for i, (loc, cm) in enumerate(self.calculations):
-                if loc == locator:
-                    remaining_files = [fm for fm in cm.files if fm not in files]
-                    self.calculations[i] = (
-                        loc,
-                        CalculationMetadata(id=cm.id, files=remaining_files),
-                    )
+        # Remove entire calculations, and matching files from remaining calculations
+        remaining_calculations = []
+        for loc, cm in self.calculations:
+            if loc in calculations_to_remove:
+                continue
+            if (files := files_to_remove.get(loc)) is not None:
+                remaining_files = [fm for fm in cm.files if fm not in files]
+                cm = CalculationMetadata(id=cm.id, files=remaining_files)
+            remaining_calculations.append((loc, cm))
+        self.calculations = remaining_calculations
 
         self._clear_pending()
 
         return removed_files
 
-    def validate_submission(self, check_all: bool = False) -> bool:
-        is_valid = True
+    def _validate_in_pool(
+        self,
+        calculations: list[tuple[CalculationLocator, CalculationMetadata]],
+        indices: list[int],
+        hash_cache: FileHashCache | None,
+        num_workers: int | None,
+    ) -> Iterator[tuple]:
+        num_workers = num_workers or min(
+            cpu_count() or 1, Submission.MAX_VALIDATION_WORKERS
+        )
+        chunksize = min(
+            Submission.MAX_VALIDATION_CHUNKSIZE,
+            max(1, len(indices) // (4 * num_workers)),
+        )
+        logger.debug(
+            f"Running validation in parallel for {len(indices)} calculations "
+            f"with {num_workers} processes and chunks of {chunksize}"
+        )
+        ctx = get_context("fork")
+        # Leaving the pool, including when the caller stops early, terminates it
+        # The cache is passed to each worker once, rather than with every task
+        with ctx.Pool(
+            processes=num_workers,
+            initializer=init_validation_worker,
+            initargs=(hash_cache,),
+        ) as pool:
+            yield from pool.imap_unordered(
+                invoke_calc_validation,
+                ((i, *calculations[i], None) for i in indices),
+                chunksize=chunksize,
+            )
+
+    def iter_validate(
+        self,
+        hash_cache: FileHashCache | None = None,
+        num_workers: int | None = None,
+    ) -> Iterator[tuple[CalculationLocator, bool, float]]:
+        """Validate each calculation, yielding results as they finish.
+
+        With a hash cache, calculations whose files are unchanged since they
+        were last validated are not validated again, and validation results
+        are cached by the hashes of the validated files. Closing the iterator
+        stops any validations still running.
+
+        Yields tuples of (locator, whether it is valid, time taken in seconds).
+        """
         calcs_to_check = (
             self.pending_calculations
             if self.pending_calculations
             else self.calculations
         )
 
-        total_items = len(calcs_to_check)
-        chunk_size = Submission.ITEMS_PER_OUTER_CHUNK
-
-        def num_procs():
-            num_processes = 1
-            if cpu_count() > 100:
-                num_processes = 100
-            else:
-                num_processes = cpu_count()
-            logger.debug(f"Recommending {num_processes} for pool size.")
-            return num_processes
-
-        if total_items > Submission.PARALLEL_THRESHOLD:
+        to_validate = list(range(len(calcs_to_check)))
+        if hash_cache is not None:
+            # Hash all changed files up front, so that refreshing each
+            # calculation during validation only hits the cache
+            refresh_calculations(calcs_to_check, hash_cache)
+
+            fingerprints = {
+                i: fingerprint
+                for i, (_, cm) in enumerate(calcs_to_check)
+                if cm.calc_valid is None
+                and (fingerprint := cm.get_validation_fingerprint())
+            }
+            cached = hash_cache.get_validations(fingerprints.values())
+            for i, fingerprint in fingerprints.items():
+                if fingerprint in cached:
+                    cm = calcs_to_check[i][1]
+                    cm.calc_valid, cm.calc_validation_errors = cached[fingerprint]
+
+            to_validate = []
+            for i, (locator, cm) in enumerate(calcs_to_check):
+                if cm.calc_valid is None:
+                    to_validate.append(i)
+                else:
+                    yield locator, cm.calc_valid, 0.0
             logger.debug(
-                f"Running validation in parallel for {total_items} calculations "
-                f"splitting into {len(calcs_to_check)/chunk_size}"
+                f"Reusing validation results for "
+                f"{len(calcs_to_check) - len(to_validate)} unchanged calculations"
             )
-            ctx = get_context("fork")
-            for i in range(0, total_items, chunk_size):
-                chunk = calcs_to_check[i : i + chunk_size]
-                logger.debug(
-                    f"Processing chunk {i//chunk_size + 1}: items {i}-{min(i+chunk_size, total_items)}"
-                )
 
-                with ctx.Pool(processes=num_procs()) as pool:
-                    results = pool.imap_unordered(invoke_calc_validation, chunk)
-                    processed = 0
-                    for locator, _, cm in results:
-                        # Update the calculation metadata in the list
-                        for j, (loc, _) in enumerate(chunk):
-                            if loc == locator:
-                                calcs_to_check[i + j] = (loc, cm)
-                        processed += 1
-                    logger.debug(f"Completed processing {processed} calculation")
-            return all(cm.calc_valid for _, cm in calcs_to_check)
+        if len(to_validate) > Submission.PARALLEL_THRESHOLD:
+            results = self._validate_in_pool(
+                calcs_to_check, to_validate, hash_cache, num_workers
+            )
         else:
-            logger.debug(f"Running validation serially for {total_items} calculations")
-            if not check_all:
-                logger.debug("Will fail fast if any calculation is invalid")
-            for i, (locator, cm) in enumerate(calcs_to_check):
-                is_valid = cm.validate_calculation(locator) and is_valid
-                if not is_valid and not check_all:
-                    return is_valid
+            logger.debug(
+                f"Running validation serially for {len(to_validate)} calculations"
+            )
+            results = (
+                invoke_calc_validation((i, *calcs_to_check[i], hash_cache))
+                for i in to_validate
+            )
 
-            return is_valid
+        validations = []
+        try:
+            for i, valid, errors, hashes, ran_validator, elapsed in results:
+                locator, cm = calcs_to_check[i]
+                for f, file_hash in zip(cm.files, hashes):
+                    f.hash = file_hash
+                cm.calc_valid = valid
+                cm.calc_validation_errors = errors
+                # Errors, e.g., from unreadable files, may be transient,
+                # so only results from the validator are cached
+                if (
+                    hash_cache is not None
+                    and ran_validator
+                    and (fingerprint := cm.get_validation_fingerprint())
+                ):
+                    validations.append((fingerprint, valid, errors))
+                yield locator, valid, elapsed
+        finally:
+            results.close()
+            if hash_cache is not None:
+                hash_cache.put_validations(validations)
+
+    def validate_submission(
+        self,
+        check_all: bool = False,
+        hash_cache: FileHashCache | None = None,
+        num_workers: int | None = None,
+    ) -> bool:
+        """Validate all calculations, reporting progress as they finish.
+
+        Unless `check_all`, validation stops at the first invalid calculation.
+        """
+        total_items = len(self.pending_calculations or self.calculations)
+        if not check_all:
+            logger.debug("Will fail fast if any calculation is invalid")
 
-    def _create_calculations_copy(self, refresh: bool = False):
+        is_valid = True
+        report_every = max(1, total_items // 10)
+        results = self.iter_validate(hash_cache=hash_cache, num_workers=num_workers)
+        try:
+            for num_done, (locator, valid, elapsed) in enumerate(results, 1):
+                logger.debug(
+                    f"Validated {locator.path} ({locator.modifier}) "
+                    f"in {elapsed:.2f} s, valid: {valid}"
+                )
+                if num_done % report_every == 0 or num_done == total_items:
+                    logger.info(f"Validated {num_done}/{total_items} calculations")
+                if not valid:
+                    is_valid = False
+                    if not check_all:
+                        break
+        finally:
+            results.close()
+        return is_valid
+
+    def _create_calculations_copy(
+        self, refresh: bool = False, hash_cache: FileHashCache | None = None
+    ):
         pending_calculations = copy.deepcopy(self.calculations)
         if refresh:
-            if len(pending_calculations) > Submission.PARALLEL_THRESHOLD:
+            if hash_cache is not None:
+                logger.debug(
+                    f"Running cached refresh for {len(pending_calculations)} calculations"
+                )
+                refresh_calculations(pending_calculations, hash_cache)
+            elif len(pending_calculations) > Submission.PARALLEL_THRESHOLD:
                 logger.debug(
                     f"Running refresh in parallel for {len(pending_calculations)} calculations"
                 )
@@ -302,11 +514,11 @@ class Submission(BaseModel):
                         invoke_calc_refresh,
                         [(locator.path, cm) for locator, cm in pending_calculations],
                     )
-                    for p, cm in results:
-                        # Update the calculation metadata in the list
-                        for i, (loc, _) in enumerate(pending_calculations):
-                            if loc.path == p:
-                                pending_calculations[i] = (loc, cm)
+                    # Results are in the same order as the calculations
+                    pending_calculations = [
+                        (loc, cm)
+                        for (loc, _), (_, cm) in zip(pending_calculations, results)
+                    ]
             else:
                 logger.debug(
                     f"Running refresh serially for {len(pending_calculations)} calculations"
@@ -315,11 +527,13 @@ class Submission(BaseModel):
                     cm.refresh()
         return pending_calculations
 
-    def stage_for_push(self) -> list[FileMetadata]:
+    def stage_for_push(
+        self, hash_cache: FileHashCache | None = None
+    ) -> list[FileMetadata]:
         """Stages submission for push. Returns the list of files that will need to be (re)pushed."""
         self.pending_calculations = self._create_calculations_copy()
 
-        if not self.validate_submission():
+        if not self.validate_submission(hash_cache=hash_cache):
             assert self.pending_calculations is not None
             self.calculations = copy.deepcopy(self.pending_calculations)
             self._clear_pending()
@@ -343,35 +557,39 @@ class Submission(BaseModel):
         if not previous:
             changes = {k: v.files for k, v in current}
         else:
+            previous_index = index_calculations(previous)
             for loc, cm in current:
-                prev_cm = next((cm_p for loc_p, cm_p in previous if loc_p == loc), None)
-                if prev_cm is None:
+                if (i := previous_index.get(loc)) is None:
                     changes[loc] = cm.files
                 else:
-                    file_changes = []
-                    for fm in cm.files:
-                        match = next(
-                            (item for item in prev_cm.files if item == fm), None
-                        )
-                        if match is None or fm.hash != match.hash:
-                            file_changes.append(fm)
+                    prev_hashes: dict[FileMetadata, str | None] = {}
+                    for item in previous[i][1].files:
+                        prev_hashes.setdefault(item, item.hash)
+                    file_changes = [
+                        fm
+                        for fm in cm.files
+                        if fm not in prev_hashes or fm.hash != prev_hashes[fm]
+                    ]
                     if file_changes:
                         changes[loc] = file_changes
         return changes
 
-    def push(self) -> None:
+    def push(self, hash_cache: FileHashCache | None = None) -> None:
         """Performs the push. Returns info about the push"""
         if not self.pending_calculations or not self._pending_push:
             raise EmmetCliError("Nothing is staged. Please stage before pushing.")
 
         if self.get_changed_files_per_calc_path(
-            self.pending_calculations, self._create_calculations_copy(refresh=True)
+            self.pending_calculations,
+            self._create_calculations_copy(refresh=True, hash_cache=hash_cache),
         ):
             raise EmmetCliError(
                 "Files for submission have changed since staging. Please re-stage before pushing."
             )
 
-        if not self.validate_submission():  # THIS SHOULD NEVER HAPPEN
+        if not self.validate_submission(
+            hash_cache=hash_cache
+        ):  # THIS SHOULD NEVER HAPPEN
             self.calculations = copy.deepcopy(self.pending_calculations)
             self._clear_pending()
             raise EmmetCliError(
@@ -400,8 +618,8 @@ def find_all_calculations(paths: Iterable[PathLike]):
         path = Path(path).resolve()
         logger.info(f"Checking path: {path}")
         if path.is_dir():
-            calcs = recursive_discover_vasp_files(path)
-            all_calculations.update(calcs)
+            for locator, files in iter_discover_vasp_files(path):
+                all_calculations[locator] = files
         else:
             parent = path.parent
             fm = FileMetadata(name=path.name, path=path)
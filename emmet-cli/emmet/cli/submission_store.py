@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+from uuid import UUID
+
+from emmet.cli.submission import CalculationMetadata, Submission
+from emmet.core.vasp.utils import CalculationLocator, FileMetadata
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger("emmet")
+
+SUBMISSION_STORE_SUFFIX = ".sqlite"
+
+CURRENT = "current"
+PENDING = "pending"
+HISTORY = "history"
+# Full copy of the calculations of the latest push
+LATEST_PUSH = "latest_push"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    push INTEGER NOT NULL DEFAULT 0,
+    path TEXT NOT NULL,
+    modifier TEXT,
+    uuid TEXT,
+    calc_valid INTEGER,
+    errors TEXT
+);
+CREATE INDEX IF NOT EXISTS calculations_by_snapshot
+    ON calculations (snapshot, push);
+CREATE TABLE IF NOT EXISTS files (
+    calculation INTEGER NOT NULL REFERENCES calculations (id),
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    hash TEXT,
+    removed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_by_calculation ON files (calculation);
+"""
+
+# (locator path, modifier) -> (uuid, calc_valid, errors), {file path: (name, hash)}
+_CalcKey = tuple[str, str | None]
+_CalcRow = tuple[str, int | None, str]
+_State = dict[_CalcKey, tuple[_CalcRow, dict[str, tuple[str, str | None]]]]
+
+
+def _to_state(
+    calculations: list[tuple[CalculationLocator, CalculationMetadata]],
+) -> _State:
+    state: _State = {}
+    for locator, cm in calculations:
+        files: dict[str, tuple[str, str | None]] = {}
+        for fm in cm.files:
+            files.setdefault(str(fm.path), (fm.name, fm.hash))
+        state.setdefault(
+            (str(locator.path), locator.modifier),
+            (
+                (
+                    str(cm.id),
+                    None if cm.calc_valid is None else int(cm.calc_valid),
+                    json.dumps(cm.calc_validation_errors),
+                ),
+                files,
+            ),
+        )
+    return state
+
+
+def _from_state(state: _State) -> list[tuple[CalculationLocator, CalculationMetadata]]:
+    # Stored data was validated when it was written, so skip validation here
+    return [
+        (
+            CalculationLocator.model_construct(path=Path(path), modifier=modifier),
+            CalculationMetadata.model_construct(
+                id=UUID(uuid),
+                files=[
+                    FileMetadata.model_construct(
+                        name=name, path=Path(file_path), hash=file_hash
+                    )
+                    for file_path, (name, file_hash) in files.items()
+                ],
+                calc_valid=None if calc_valid is None else bool(calc_valid),
+                calc_validation_errors=json.loads(errors),
+            ),
+        )
+        for (path, modifier), ((uuid, calc_valid, errors), files) in state.items()
+    ]
+
+
+def _diff_states(
+    previous: _State, current: _State
+) -> Iterator[tuple[_CalcKey, _CalcRow | None, list[tuple[str, str, Any, int]]]]:
+    """Yield the changes needed to turn `previous` into `current`.
+
+    Removed calculations are yielded with no row, and removed files
+    are flagged in the file rows.
+    """
+    for key, (row, files) in current.items():
+        prev_row, prev_files = previous.get(key, (None, {}))
+        file_changes = [
+            (path, name, file_hash, 0)
+            for path, (name, file_hash) in files.items()
+            if prev_files.get(path) != (name, file_hash)
+        ] + [
+            (path, name, None, 1)
+            for path, (name, _) in prev_files.items()
+            if path not in files
+        ]
+        if row != prev_row or file_changes:
+            yield key, row, file_changes
+    for key in previous.keys() - current.keys():
+        yield key, None, []
+
+
+class SubmissionStore:
+    """Compact on-disk store for a Submission, backed by SQLite.
+
+    The current and pending calculations are stored as rows of
+    calculations and files. Each push in the history is stored as
+    the changes made since the previous push rather than as a full
+    copy of every calculation, so the store grows with what changed.
+
+    A full copy of the latest push is also stored, so that by default
+    only it is read, which is all that is needed to stage and push;
+    use `Submission.load_history` to load every push.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @staticmethod
+    def _get_num_pushes(conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT value FROM metadata WHERE key = 'num_pushes'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _read_rows(
+        conn: sqlite3.Connection, snapshot: str, push_range: tuple[int, int] = (0, 0)
+    ) -> Iterator[tuple[int, _CalcKey, _CalcRow | None, list[tuple]]]:
+        files: dict[int, list[tuple]] = {}
+        for calculation, path, name, file_hash, removed in conn.execute(
+            "SELECT f.calculation, f.path, f.name, f.hash, f.removed "
+            "FROM files f JOIN calculations c ON f.calculation = c.id "
+            "WHERE c.snapshot = ? AND c.push BETWEEN ? AND ? ORDER BY f.rowid",
+            (snapshot, *push_range),
+        ):
+            files.setdefault(calculation, []).append((path, name, file_hash, removed))
+
+        for calc_id, push, path, modifier, uuid, calc_valid, errors in conn.execute(
+            "SELECT id, push, path, modifier, uuid, calc_valid, errors "
+            "FROM calculations WHERE snapshot = ? AND push BETWEEN ? AND ? "
+            "ORDER BY push, id",
+            (snapshot, *push_range),
+        ):
+            row = None if uuid is None else (uuid, calc_valid, errors)
+            yield push, (path, modifier), row, files.get(calc_id, [])
+
+    @classmethod
+    def _read_snapshot(cls, conn: sqlite3.Connection, snapshot: str) -> _State:
+        return {
+            key: (row, {path: (name, file_hash) for path, name, file_hash, _ in files})
+            for _, key, row, files in cls._read_rows(conn, snapshot)
+            if row is not None
+        }
+
+    @classmethod
+    def _replay_history(cls, conn: sqlite3.Connection, start: int) -> list[_State]:
+        """Apply the changes of each push in order, from the first push.
+
+        Returns the state after each push, from push `start` on.
+        """
+        changes_by_push: dict[int, list] = {}
+        for push, key, row, files in cls._read_rows(
+            conn, HISTORY, (0, cls._get_num_pushes(conn) - 1)
+        ):
+            changes_by_push.setdefault(push, []).append((key, row, files))
+
+        states: list[_State] = []
+        state: _State = {}
+        for push in range(cls._get_num_pushes(conn)):
+            for key, row, files in changes_by_push.get(push, []):
+                if row is None:
+                    state.pop(key, None)
+                    continue
+                calc_files = state[key][1] if key in state else {}
+                for path, name, file_hash, removed in files:
+                    if removed:
+                        calc_files.pop(path, None)
+                    else:
+                        calc_files[path] = (name, file_hash)
+                state[key] = (row, calc_files)
+            if push >= start:
+                states.append({k: (r, dict(f)) for k, (r, f) in state.items()})
+        return states
+
+    def load_history(self, start: int = 0) -> list[list]:
+        """Load the calculations of every push from push `start` on."""
+        with closing(self._connect()) as conn:
+            return [_from_state(s) for s in self._replay_history(conn, start)]
+
+    def load(self, full_history: bool = False) -> Submission:
+        """Load a submission, with only its latest push unless `full_history`."""
+        with closing(self._connect()) as conn:
+            metadata = dict(conn.execute("SELECT key, value FROM metadata"))
+            if "id" not in metadata:
+                raise ValueError(f"{self.path} is not a submission store.")
+            num_pushes = int(metadata.get("num_pushes", 0))
+            start = 0 if full_history else max(num_pushes - 1, 0)
+            if (
+                not full_history
+                and num_pushes
+                and metadata.get("latest_push") == str(num_pushes - 1)
+            ):
+                history = [self._read_snapshot(conn, LATEST_PUSH)]
+            else:
+                history = self._replay_history(conn, start)
+            pending = (
+                _from_state(self._read_snapshot(conn, PENDING))
+                if metadata.get("has_pending") == "1"
+                else None
+            )
+            sub = Submission.model_construct(
+                id=UUID(metadata["id"]),
+                calculations=_from_state(self._read_snapshot(conn, CURRENT)),
+                calc_history=[_from_state(s) for s in history],
+                pending_calculations=pending,
+            )
+        sub._history_offset = start
+        sub._history_store = self.path
+        return sub
+
+    def _write_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        snapshot: str,
+        changes: Iterator[tuple[_CalcKey, _CalcRow | None, list[tuple]]],
+        push: int = 0,
+    ) -> None:
+        file_rows = []
+        for (path, modifier), row, files in changes:
+            uuid, calc_valid, errors = row or (None, None, None)
+            calc_id = conn.execute(
+                "INSERT INTO calculations "
+                "(snapshot, push, path, modifier, uuid, calc_valid, errors) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (snapshot, push, path, modifier, uuid, calc_valid, errors),
+            ).lastrowid
+            file_rows.extend((calc_id, *f) for f in files)
+        conn.executemany(
+            "INSERT INTO files (calculation, path, name, hash, removed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            file_rows,
+        )
+
+    def _clear(self, conn: sqlite3.Connection, snapshots: tuple[str, ...]) -> None:
+        marks = ",".join("?" * len(snapshots))
+        conn.execute(
+            "DELETE FROM files WHERE calculation IN "
+            f"(SELECT id FROM calculations WHERE snapshot IN ({marks}))",
+            snapshots,
+        )
+        conn.execute(f"DELETE FROM calculations WHERE snapshot IN ({marks})", snapshots)
+
+    def save(self, submission: Submission) -> None:
+        """Save a submission, only appending pushes which are not yet stored."""
+        if submission._history_offset and (
+            submission._history_store is None
+            or submission._history_store.resolve() != self.path.resolve()
+        ):
+            submission.load_history()
+
+        with closing(self._connect()) as conn, conn:
+            stored_id = conn.execute(
+                "SELECT value FROM metadata WHERE key = 'id'"
+            ).fetchone()
+            num_stored = self._get_num_pushes(conn)
+            if stored_id != (str(submission.id),) or (
+                submission._history_store is None
+                or submission._history_store.resolve() != self.path.resolve()
+            ):
+                # Not this submission's store, so start from scratch
+                self._clear(conn, (CURRENT, PENDING, HISTORY, LATEST_PUSH))
+                num_stored = 0
+
+            offset = submission._history_offset
+            num_pushes = offset + len(submission.calc_history)
+            if num_pushes < num_stored:
+                raise ValueError(
+                    f"{self.path} has {num_stored} pushes, but the submission "
+                    f"being saved only has {num_pushes}."
+                )
+            if num_stored > offset:
+                previous = _to_state(submission.calc_history[num_stored - offset - 1])
+            else:
+                previous = {}
+            for push in range(num_stored, num_pushes):
+                state = _to_state(submission.calc_history[push - offset])
+                self._write_snapshot(
+                    conn, HISTORY, _diff_states(previous, state), push=push
+                )
+                previous = state
+
+            stored_latest = conn.execute(
+                "SELECT value FROM metadata WHERE key = 'latest_push'"
+            ).fetchone()
+            if num_pushes and (
+                num_pushes > num_stored or stored_latest != (str(num_pushes - 1),)
+            ):
+                # `previous` is now the state after the latest push
+                self._clear(conn, (LATEST_PUSH,))
+                self._write_snapshot(conn, LATEST_PUSH, _diff_states({}, previous))
+
+            self._clear(conn, (CURRENT, PENDING))
+            self._write_snapshot(
+                conn, CURRENT, _diff_states({}, _to_state(submission.calculations))
+            )
+            if submission.pending_calculations is not None:
+                self._write_snapshot(
+                    conn,
+                    PENDING,
+                    _diff_states({}, _to_state(submission.pending_calculations)),
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [
+                    ("id", str(submission.id)),
+                    ("num_pushes", str(num_pushes)),
+                    ("latest_push", str(num_pushes - 1)),
+                    (
+                        "has_pending",
+                        str(int(submission.pending_calculations is not None)),
+                    ),
+                ],
+            )
+
+        submission._history_store = self.path
+        logger.debug(
+            f"Saved submission {submission.id} to {self.path}, "
+            f"appending {num_pushes - num_stored} pushes."
+        )
@@ -1,12 +1,26 @@
 import logging
 from pathlib import Path
 import click
+from emmet.cli.hash_cache import DEFAULT_HASH_CACHE_NAME, FileHashCache
 from emmet.cli.submission import Submission
+from emmet.cli.submission_store import SUBMISSION_STORE_SUFFIX
 from emmet.cli.utils import EmmetCliError
 
 logger = logging.getLogger("emmet")
 
 
+def _get_hash_cache_path(ctx: click.Context) -> Path | None:
+    """Get the path to the file hash cache in the state directory, if any."""
+    state_manager = ctx.obj.get("state_manager")
+    if state_manager is None:
+        return None
+    return Path(state_manager.state_file).parent / DEFAULT_HASH_CACHE_NAME
+
+
+def _get_hash_cache(hash_cache_path: Path | None) -> FileHashCache | None:
+    return FileHashCache(hash_cache_path) if hash_cache_path else None
+
+
 @click.group()
 @click.pass_context
 def submit(ctx: click.Context) -> None:
@@ -43,7 +57,7 @@ def create(ctx: click.Context, paths: list[Path]) -> None:
 def _create_submission(paths: list[Path]) -> tuple[str, str]:
     """Helper function to create a submission that can run in a separate process."""
     submission = Submission.from_paths(paths=paths)
-    output_file = f"submission-{submission.id}.json"
+    output_file = f"submission-{submission.id}{SUBMISSION_STORE_SUFFIX}"
     submission.save(Path(output_file))
     return str(submission.id), output_file
 
@@ -110,10 +124,14 @@ def remove_from(
     click.echo("Use 'emmet tasks status <task_id>' to check the status")
 
 
-def _validate_submission(submission_path: Path, check_all: bool) -> bool:
+def _validate_submission(
+    submission_path: Path, check_all: bool, hash_cache_path: Path | None = None
+) -> bool:
     """Helper function to validate a submission that can run in a separate process."""
     sub = Submission.load(submission_path)
-    is_valid = sub.validate_submission(check_all=check_all)
+    is_valid = sub.validate_submission(
+        check_all=check_all, hash_cache=_get_hash_cache(hash_cache_path)
+    )
     sub.save(submission_path)
     return is_valid
 
@@ -129,22 +147,27 @@ def validate(ctx: click.Context, submission: Path, check_all: bool) -> None:
 
     Returns a task ID that can be used to check the status."""
     task_manager = ctx.obj["task_manager"]
-    task_id = task_manager.start_task(_validate_submission, Path(submission), check_all)
+    task_id = task_manager.start_task(
+        _validate_submission, Path(submission), check_all, _get_hash_cache_path(ctx)
+    )
     click.echo(f"Validation started. Task ID: {task_id}")
     click.echo("Use 'emmet tasks status <task_id>' to check the status")
 
 
-def _push_submission(submission_path: Path) -> tuple[bool, str]:
+def _push_submission(
+    submission_path: Path, hash_cache_path: Path | None = None
+) -> tuple[bool, str]:
     """Helper function to push a submission that can run in a separate process."""
     sub = Submission.load(submission_path)
-    updated_file_info = sub.stage_for_push()
+    hash_cache = _get_hash_cache(hash_cache_path)
+    updated_file_info = sub.stage_for_push(hash_cache=hash_cache)
     if not updated_file_info:
         return (
             False,
             "Files for submission have not changed since last update. Not pushing.",
         )
 
-    sub.push()
+    sub.push(hash_cache=hash_cache)
     sub.save(submission_path)
     return True, f"Successfully updated submission in {submission_path}"
 
@@ -157,6 +180,8 @@ def push(ctx: click.Context, submission: Path) -> None:
 
     Returns a task ID that can be used to check the status."""
     task_manager = ctx.obj["task_manager"]
-    task_id = task_manager.start_task(_push_submission, Path(submission))
+    task_id = task_manager.start_task(
+        _push_submission, Path(submission), _get_hash_cache_path(ctx)
+    )
     click.echo(f"Push started. Task ID: {task_id}")
     click.echo("Use 'emmet tasks status <task_id>' to check the status")
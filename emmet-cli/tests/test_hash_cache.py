@@ -0,0 +1,117 @@
+import os
+import pickle
+
+import pytest
+
+import emmet.cli.hash_cache as hash_cache_module
+from emmet.cli.hash_cache import RACY_WINDOW_NS, FileHashCache
+from emmet.cli.submission import CalculationMetadata
+from emmet.core.vasp.utils import FileMetadata
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = []
+    for index in range(3):
+        file_path = tmp_path / f"file-{index}"
+        file_path.write_text(f"initial content {index}")
+        _age(file_path)
+        files.append(FileMetadata(name=file_path.name, path=file_path))
+    return files
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+
+    def _counting_hash(path, *args, **kwargs):
+        calls.append(str(path))
+        return get_hash_blocked(path, *args, **kwargs)
+
+    get_hash_blocked = hash_cache_module.get_hash_blocked
+    monkeypatch.setattr(hash_cache_module, "get_hash_blocked", _counting_hash)
+    return calls
+
+
+def _age(path, seconds=60):
+    """Move the mtime of a file out of the racy window."""
+    mtime_ns = path.stat().st_mtime_ns - seconds * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_compute_hashes_uses_cache(tmp_path, files, hash_calls):
+    cache = FileHashCache(tmp_path / "cache" / "hashes.sqlite")
+    cache.compute_hashes(files)
+    assert len(hash_calls) == 3
+    expected = [fm.compute_hash() for fm in files]
+    assert [fm.hash for fm in files] == expected
+
+    # A new cache on the same database reuses the stored hashes
+    reloaded = [FileMetadata(name=fm.name, path=fm.path) for fm in files]
+    FileHashCache(cache.path).compute_hashes(reloaded)
+    assert len(hash_calls) == 3
+    assert [fm.hash for fm in reloaded] == expected
+
+    # Only the file whose stat changed is read again
+    files[1].path.write_text("changed content")
+    _age(files[1].path)
+    cache.compute_hashes(files)
+    assert hash_calls[3:] == [str(files[1].path.absolute())]
+    assert files[1].hash != expected[1]
+    assert files[1].hash == FileMetadata(name="", path=files[1].path).compute_hash()
+
+
+def test_recently_modified_files_are_not_cached(tmp_path, files, hash_calls):
+    cache = FileHashCache(tmp_path / "hashes.sqlite")
+    files[0].path.write_text("just modified")
+    assert (
+        os.stat(files[0].path).st_mtime_ns
+        > files[1].path.stat().st_mtime_ns + RACY_WINDOW_NS
+    )
+
+    cache.compute_hashes(files)
+    cache.compute_hashes(files)
+    assert hash_calls.count(str(files[0].path.absolute())) == 2
+    assert hash_calls.count(str(files[1].path.absolute())) == 1
+
+
+def test_compute_hashes_missing_file(tmp_path, files):
+    cache = FileHashCache(tmp_path / "hashes.sqlite")
+    files[0].path.unlink()
+    with pytest.raises(ValueError, match="Path does not exist"):
+        cache.compute_hashes(files)
+
+
+def test_cache_is_picklable(tmp_path, files):
+    cache = FileHashCache(tmp_path / "hashes.sqlite")
+    cache.compute_hashes(files)
+    unpickled = pickle.loads(pickle.dumps(cache))
+    assert unpickled._conn is None
+    reloaded = [FileMetadata(name=fm.name, path=fm.path) for fm in files]
+    unpickled.compute_hashes(reloaded)
+    assert [fm.hash for fm in reloaded] == [fm.hash for fm in files]
+    cache.close()
+    unpickled.close()
+
+
+def test_refresh_with_cache_invalidates_validation(tmp_path, files):
+    cache = FileHashCache(tmp_path / "hashes.sqlite")
+    cache.compute_hashes(files)
+    cm = CalculationMetadata(files=files, calc_valid=True)
+
+    cm.refresh(hash_cache=cache)
+    assert cm.calc_valid is True
+
+    files[2].path.write_text("changed content")
+    cm.refresh(hash_cache=cache)
+    assert cm.calc_valid is None
+
+
+def test_validation_cache(tmp_path):
+    cache = FileHashCache(tmp_path / "hashes.sqlite")
+    assert cache.get_validations(["a", "b"]) == {}
+    cache.put_validations([("a", True, []), ("b", False, ["bad INCAR"])])
+    assert FileHashCache(cache.path).get_validations(["a", "b", "c"]) == {
+        "a": (True, []),
+        "b": (False, ["bad INCAR"]),
+    }
@@ -0,0 +1,88 @@
+import gzip
+import json
+from pathlib import Path
+
+from emmet.cli.ingest import ingest
+from emmet.cli.ingestion import (
+    IngestionManifest,
+    ingest_calculations,
+    iter_task_docs,
+)
+from emmet.cli.utils import EmmetCliError
+from emmet.core.testing_utils import DataArchive
+
+
+def test_ingest_requires_paths(cli_runner, tmp_path):
+    result = cli_runner(ingest, ["--output-dir", str(tmp_path)])
+
+    assert result.exit_code != 0
+    assert isinstance(result.exception, EmmetCliError)
+    assert "Must provide at least one file or directory path to ingest" in str(
+        result.exception
+    )
+
+
+def test_ingest_calculations(validation_test_path, tmp_path):
+    output_dir = tmp_path / "ingested"
+    with DataArchive.extract(validation_test_path) as dir_name:
+        summary = ingest_calculations([dir_name], output_dir, num_workers=1)
+        assert summary == {"parsed": 1, "failed": 0, "skipped": 0}
+
+        with gzip.open(output_dir / "tasks-00000.jsonl.gz", "rt") as f:
+            docs = [json.loads(line) for line in f]
+        assert len(docs) == 1
+        assert docs[0]["calcs_reversed"]
+
+        manifest = IngestionManifest(output_dir / "manifest.jsonl")
+        assert [r.status for r in manifest.records.values()] == ["parsed"]
+        assert all(r.shard == "tasks-00000.jsonl.gz" for r in manifest.records.values())
+
+        # unchanged calculations are not parsed again
+        summary = ingest_calculations([dir_name], output_dir, num_workers=1)
+        assert summary == {"parsed": 0, "failed": 0, "skipped": 1}
+        assert not (output_dir / "tasks-00001.jsonl.gz").exists()
+        assert not list(output_dir.glob("*.partial"))
+
+
+def test_ingest_modified_calculation(validation_test_path, tmp_path):
+    output_dir = tmp_path / "ingested"
+    with DataArchive.extract(validation_test_path) as dir_name:
+        ingest_calculations([dir_name], output_dir, num_workers=1)
+
+        incar_path = Path(dir_name) / "INCAR.gz"
+        with gzip.open(incar_path, "rt") as f:
+            incar = f.read()
+        with gzip.open(incar_path, "wt") as f:
+            f.write(incar + "\n# modified\n")
+
+        summary = ingest_calculations([dir_name], output_dir, num_workers=1)
+        assert summary == {"parsed": 1, "failed": 0, "skipped": 0}
+
+    # The stale TaskDoc is left in the first shard
+    for shard in ("tasks-00000.jsonl.gz", "tasks-00001.jsonl.gz"):
+        with gzip.open(output_dir / shard, "rt") as f:
+            assert len(f.readlines()) == 1
+
+    manifest = IngestionManifest(output_dir / "manifest.jsonl")
+    assert [(r.shard, r.row) for r in manifest.records.values()] == [
+        ("tasks-00001.jsonl.gz", 0)
+    ]
+    task_docs = list(iter_task_docs(output_dir))
+    assert len(task_docs) == 1
+    assert task_docs[0].calcs_reversed
+
+
+def test_ingest_failures(tmp_dir, tmp_path):
+    output_dir = tmp_path / "ingested"
+    summary = ingest_calculations([tmp_dir], output_dir, num_workers=2, timeout=60)
+    assert summary["parsed"] == 0
+    assert summary["failed"] > 0
+
+    manifest = IngestionManifest(output_dir / "manifest.jsonl")
+    assert all(r.status == "failed" and r.error for r in manifest.records.values())
+
+    assert ingest_calculations([tmp_dir], output_dir)["skipped"] == summary["failed"]
+    assert (
+        ingest_calculations([tmp_dir], output_dir, retry_failed=True)["failed"]
+        == summary["failed"]
+    )
@@ -1,7 +1,18 @@
+import time
 from pathlib import Path
-from emmet.cli.submission import CalculationMetadata, CalculationLocator, Submission
+
+import emmet.cli.submission as submission_module
+from emmet.cli.hash_cache import FileHashCache
+from emmet.cli.submission import (
+    CalculationMetadata,
+    CalculationLocator,
+    Submission,
+    index_calculations,
+)
+from emmet.cli.submission_store import SubmissionStore
 from emmet.cli.utils import EmmetCliError
 from emmet.core.vasp.utils import FileMetadata
+from emmet.core.vasp.validation import ValidationDoc
 import pytest
 
 
@@ -123,6 +134,26 @@ def test_add_to(sub_file, tmp_structure):
     assert len(sub.calculations) == 9
 
 
+def test_add_to_merges_existing_calculation(sub_file, tmp_structure):
+    sub = Submission.load(Path(sub_file))
+    locator, cm = sub.calculations[0]
+
+    # Lookups resolve equivalent representations of the same path
+    same_locator = CalculationLocator(
+        path=locator.path / ".." / locator.path.name, modifier=locator.modifier
+    )
+    index = index_calculations(sub.calculations)
+    assert index[same_locator] == 0
+    assert CalculationLocator(path=Path("/missing")) not in index
+
+    sub.add_to([tmp_structure["other_calc/00/"], cm.files[0].path])
+    assert len(sub.calculations) == 8
+    merged = sub.calculations[index_calculations(sub.calculations)[locator]][1]
+    assert merged.id == cm.id
+    assert merged.files == cm.files
+    assert len({loc for loc, _ in sub.calculations}) == len(sub.calculations)
+
+
 def test_remove_from(sub_file, tmp_structure):
     sub = Submission.load(Path(sub_file))
 
@@ -250,3 +281,203 @@ def test_changed_files_to_push(validation_sub_file):
     assert len(changed) == 0
 
     # check that if file changed after stage then push raises exception
+
+
+def _dump(calculations):
+    return [(loc.path, loc.modifier, cm.model_dump()) for loc, cm in calculations]
+
+
+def test_submission_store(tmp_path, calculation_metadata, monkeypatch):
+    sub = Submission(
+        calculations=[(CalculationLocator(path=tmp_path), calculation_metadata)]
+    )
+    store_path = tmp_path / "submission.sqlite"
+    for content in ("first", "second"):
+        calculation_metadata.files[0].path.write_text(content)
+        sub.calculations = sub._create_calculations_copy(refresh=True)
+        sub.calc_history.append(sub._create_calculations_copy())
+        sub.save(store_path)
+
+    # Only the latest push is loaded by default
+    loaded = Submission.load(store_path)
+    assert loaded.id == sub.id
+    assert _dump(loaded.calculations) == _dump(sub.calculations)
+    assert len(loaded.calc_history) == 1
+    assert _dump(loaded.last_pushed()) == _dump(sub.last_pushed())
+    assert loaded.pending_calculations is None
+
+    # New pushes are appended to the store
+    calculation_metadata.files[1].path.unlink()
+    loaded.calculations[0][1].files.pop(1)
+    loaded.calc_history.append(loaded._create_calculations_copy())
+    loaded.pending_calculations = loaded._create_calculations_copy()
+    loaded.save(store_path)
+    sub.calc_history.append(loaded.last_pushed())
+
+    # The latest push is read without replaying the history
+    with monkeypatch.context() as m:
+        m.setattr(SubmissionStore, "_replay_history", None)
+        latest = Submission.load(store_path)
+    assert len(latest.calc_history) == 1
+    assert _dump(latest.last_pushed()) == _dump(sub.last_pushed())
+
+    full = Submission.load(store_path, full_history=True)
+    assert [_dump(calcs) for calcs in full.calc_history] == [
+        _dump(calcs) for calcs in sub.calc_history
+    ]
+    assert _dump(full.pending_calculations) == _dump(loaded.calculations)
+
+    # Saving to JSON includes the pushes which were not loaded
+    json_path = tmp_path / "submission.json"
+    loaded.save(json_path)
+    assert [_dump(calcs) for calcs in Submission.load(json_path).calc_history] == [
+        _dump(calcs) for calcs in sub.calc_history
+    ]
+
+
+def test_validate_submission_fails_fast(invalid_validation_sub_file, monkeypatch):
+    sub = Submission.load(Path(invalid_validation_sub_file))
+    locator, cm = sub.calculations[0]
+    sub.calculations = [
+        (
+            CalculationLocator(path=locator.path, modifier=str(i)),
+            cm.model_copy(deep=True),
+        )
+        for i in range(3)
+    ]
+
+    validated = []
+    validate_calculation = CalculationMetadata.validate_calculation
+
+    def _counting_validate(self, locator, hash_cache=None):
+        validated.append(locator)
+        return validate_calculation(self, locator, hash_cache=hash_cache)
+
+    monkeypatch.setattr(
+        CalculationMetadata, "validate_calculation", _counting_validate
+    )
+    assert sub.validate_submission() is False
+    assert len(validated) == 1
+    assert sub.validate_submission(check_all=True) is False
+    assert len(validated) == 4
+
+
+def test_validation_results_are_cached(validation_sub_file, tmp_path, monkeypatch):
+    hash_cache = FileHashCache(tmp_path / "hashes.sqlite")
+    sub = Submission.load(Path(validation_sub_file))
+    results = list(sub.iter_validate(hash_cache=hash_cache))
+    assert len(results) == len(sub.calculations)
+    assert all(valid for _, valid, _ in results)
+
+    validated = []
+    from_file_metadata = ValidationDoc.from_file_metadata
+
+    def _counting_validate(cls, *args, **kwargs):
+        validated.append(args)
+        return from_file_metadata(*args, **kwargs)
+
+    monkeypatch.setattr(
+        ValidationDoc, "from_file_metadata", classmethod(_counting_validate)
+    )
+    # A fresh copy of the submission reuses the cached results
+    sub = Submission.load(Path(validation_sub_file))
+    assert sub.validate_submission(hash_cache=hash_cache) is True
+    assert validated == []
+    assert all(cm.calc_valid for _, cm in sub.calculations)
+
+
+def test_validation_errors_are_not_cached(validation_sub_file, tmp_path, monkeypatch):
+    hash_cache = FileHashCache(tmp_path / "hashes.sqlite")
+
+    def _failing_validate(cls, *args, **kwargs):
+        raise OSError("Transient read error")
+
+    with monkeypatch.context() as m:
+        m.setattr(ValidationDoc, "from_file_metadata", classmethod(_failing_validate))
+        sub = Submission.load(Path(validation_sub_file))
+        results = list(sub.iter_validate(hash_cache=hash_cache))
+    assert not any(valid for _, valid, _ in results)
+    assert all(
+        "Error validating calculation: Transient read error"
+        in cm.calc_validation_errors
+        for _, cm in sub.calculations
+    )
+
+    # The errors were not cached, so the calculations are validated again
+    sub = Submission.load(Path(validation_sub_file))
+    assert sub.validate_submission(hash_cache=hash_cache) is True
+
+
+def _repeat_calculations(calculations, num_copies):
+    return [
+        (
+            CalculationLocator(path=locator.path, modifier=str(i)),
+            cm.model_copy(deep=True),
+        )
+        for i, (locator, cm) in enumerate(calculations * num_copies)
+    ]
+
+
+def test_validate_in_pool(
+    validation_sub_file, invalid_validation_sub_file, monkeypatch
+):
+    monkeypatch.setattr(Submission, "PARALLEL_THRESHOLD", 0)
+    sub = Submission.load(Path(validation_sub_file))
+    invalid_sub = Submission.load(Path(invalid_validation_sub_file))
+    sub.calculations = _repeat_calculations(
+        [sub.calculations[0], invalid_sub.calculations[0]], 4
+    )
+
+    # results finishing in any order are written back to their calculation
+    assert sub.validate_submission(check_all=True, num_workers=2) is False
+    assert [cm.calc_valid for _, cm in sub.calculations] == [True, False] * 4
+    assert all(
+        bool(cm.calc_validation_errors) == (not cm.calc_valid)
+        for _, cm in sub.calculations
+    )
+
+
+_invoke_calc_validation = submission_module.invoke_calc_validation
+
+
+def _check_worker_hash_cache(args):
+    """Check that the hash cache is set per worker, rather than per task."""
+    assert args[-1] is None
+    assert submission_module._worker_hash_cache is not None
+    return _invoke_calc_validation(args)
+
+
+def test_validate_in_pool_hash_cache(validation_sub_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(Submission, "PARALLEL_THRESHOLD", 0)
+    hash_cache = FileHashCache(tmp_path / "hashes.sqlite")
+    sub = Submission.load(Path(validation_sub_file))
+    sub.calculations = _repeat_calculations(sub.calculations, 4)
+
+    monkeypatch.setattr(
+        submission_module, "invoke_calc_validation", _check_worker_hash_cache
+    )
+    assert sub.validate_submission(hash_cache=hash_cache, num_workers=2) is True
+    assert all(cm.calc_valid for _, cm in sub.calculations)
+
+
+def _slow_unless_first(args):
+    """Validate the first calculation at once, and the others slowly."""
+    if args[0] > 0:
+        time.sleep(30)
+    return _invoke_calc_validation(args)
+
+
+def test_validate_in_pool_fails_fast(invalid_validation_sub_file, monkeypatch):
+    monkeypatch.setattr(Submission, "PARALLEL_THRESHOLD", 0)
+    sub = Submission.load(Path(invalid_validation_sub_file))
+    sub.calculations = _repeat_calculations(sub.calculations, 8)
+
+    # forked workers pick up the patched function
+    monkeypatch.setattr(submission_module, "invoke_calc_validation", _slow_unless_first)
+
+    start = time.perf_counter()
+    assert sub.validate_submission(num_workers=2) is False
+    # the pool was terminated rather than waiting on the remaining workers
+    assert time.perf_counter() - start < 20
+    assert sub.calculations[0][1].calc_valid is False
+    assert all(cm.calc_valid is None for _, cm in sub.calculations[1:])
@@ -11,7 +11,7 @@ import multiprocessing
 import os
 import re
 from time import time
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Iterator, Self
 
 import numpy as np
 import requests
@@ -272,14 +272,11 @@ class IcsdClient(BaseModel):
             _data.extend(data)
         return data
 
-    def search(
+    def _search_ids(
         self,
         subset: IcsdSubset | str | None = None,
-        properties: list[str | IcsdDataFields] | None = None,
-        include_cif: bool = False,
-        include_metadata: bool = False,
         **kwargs,
-    ) -> list:
+    ) -> list[str]:
 
         query_vars = []
         for k in IcsdAdvancedSearchKeys:
@@ -308,6 +305,74 @@ class IcsdClient(BaseModel):
         idxs: list[str] = []
         if matches := re.match(".*<idnums>(.*)</idnums>.*", response.content.decode()):
             idxs.extend(list(matches.groups())[0].split())
+        return idxs
+
+    def iter_search(
+        self,
+        subset: IcsdSubset | str | None = None,
+        properties: list[str | IcsdDataFields] | None = None,
+        include_cif: bool = False,
+        include_metadata: bool = False,
+        batch_size: int | None = None,
+        start_after: int | None = None,
+        **kwargs,
+    ) -> Iterator[tuple[int, list]]:
+        """Page through the results of a search.
+
+        Unlike `search`, results are not accumulated in memory. The ICSD
+        internal IDs matching the query are sorted numerically and
+        fetched in pages of at most `batch_size` (defaults to
+        `max_batch_size`).
+
+        Parameters
+        -----------
+        subset, properties, include_cif, include_metadata, **kwargs :
+            See `search`.
+        batch_size : int or None
+            The number of entries to fetch per page.
+        start_after : int or None
+            If not None, skip all entries with an internal ID less than or
+            equal to this value. Used to resume an interrupted search.
+
+        Yields
+        -----------
+        The largest ICSD internal ID in a page, and the documents in that page.
+        """
+        idxs = sorted(
+            (
+                idx
+                for idx in self._search_ids(subset=subset, **kwargs)
+                if start_after is None or int(idx) > start_after
+            ),
+            key=int,
+        )
+        batch_size = batch_size or self.max_batch_size
+
+        for istart in range(0, len(idxs), batch_size):
+            batch = idxs[istart : istart + batch_size]
+            data = self._search(
+                batch,
+                properties=properties,
+                include_cif=include_cif,
+                include_metadata=include_metadata,
+            )
+            if subset:
+                for doc in data:
+                    doc["subset"] = subset
+            if self.use_document_model:
+                data = [IcsdPropertyDoc(**props) for props in data]
+            yield int(batch[-1]), data
+
+    def search(
+        self,
+        subset: IcsdSubset | str | None = None,
+        properties: list[str | IcsdDataFields] | None = None,
+        include_cif: bool = False,
+        include_metadata: bool = False,
+        **kwargs,
+    ) -> list:
+
+        idxs = self._search_ids(subset=subset, **kwargs)
 
         if self.num_parallel_requests and len(idxs) > self.num_parallel_requests:
             batched_idxs = np.array_split(idxs, self.num_parallel_requests)
@@ -160,6 +160,229 @@ def vector_difference_matrix(
     return v_diff ** (0.5)
 
 
+def get_closest_vectors_blocked(
+    v: np.ndarray,
+    num: int,
+    queries: np.ndarray | None = None,
+    block_size: int = 1024,
+    dtype: np.dtype = np.dtype("float64"),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the closest vectors to each vector in v, block by block.
+
+    Equivalent to calling `SimilarityScorer._get_closest_vectors` for
+    each row of v, but distances are computed for tiles of `block_size`
+    rows at once via matrix products:
+        |v_i - v_j|^2 = |v_i|^2 + |v_j|^2 - 2 v_i . v_j
+    which keeps the memory cost at O(block_size * len(v)).
+
+    Parameters
+    -----------
+    v : numpy ndarray
+        List of vectors. Axis = 0 should indicate distinct vectors,
+        and axis = 1 their components.
+    num : int
+        The number of closest vectors to return for each vector.
+    queries : numpy ndarray of int or None (default)
+        The indices of v for which to find the closest vectors.
+        Defaults to all indices.
+    block_size : int = 1024
+        The number of rows of the distance matrix to compute at once.
+    dtype : the numpy dtype of the arrays used, defaults to float64
+
+    Returns
+    -----------
+    tuple of np.ndarray, np.ndarray
+        The indices of the `num` closest vectors for each query, excluding
+        the query itself, and their (unprocessed) distances, both with shape
+        (number of queries, num) and sorted by increasing distance.
+    """
+    x = np.asarray(v, dtype=dtype)
+    qidxs = np.arange(x.shape[0]) if queries is None else np.asarray(queries)
+    num = min(num, x.shape[0] - 1)
+
+    norms = np.einsum("ik,ik->i", x, x)
+    closest_idxs = np.zeros((len(qidxs), num), dtype=int)
+    closest_dist = np.zeros((len(qidxs), num), dtype=dtype)
+
+    for start in range(0, len(qidxs), block_size):
+        block = qidxs[start : start + block_size]
+        rows = np.arange(len(block))
+
+        sq_dist = norms[block, None] + norms[None, :] - 2.0 * (x[block] @ x.T)
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        # NaN distances (from NaN feature vectors) are ranked last but still
+        # ahead of each vector itself, which is excluded by sorting as NaN
+        nan_mask = np.isnan(sq_dist)
+        sq_dist[nan_mask] = np.finfo(dtype).max
+        sq_dist[rows, block] = np.nan
+
+        idxs = np.argpartition(sq_dist, num, axis=1)[:, :num]
+        subset = np.take_along_axis(sq_dist, idxs, axis=1)
+        subset[np.take_along_axis(nan_mask, idxs, axis=1)] = np.nan
+        order = np.argsort(subset, axis=1)
+
+        closest_idxs[start : start + len(block)] = np.take_along_axis(
+            idxs, order, axis=1
+        )
+        closest_dist[start : start + len(block)] = np.take_along_axis(
+            subset, order, axis=1
+        )
+
+    return closest_idxs, np.sqrt(closest_dist)
+
+
+class IVFIndex:
+    """Approximate nearest-neighbor index using an inverted file (IVF).
+
+    Vectors are clustered by k-means into `num_lists` cells. A query is
+    only compared against the vectors in the `num_probe` cells whose
+    centroids are closest to it, reducing the cost of finding the closest
+    vectors from O(N) to roughly O(N * num_probe / num_lists) per query.
+
+    Parameters
+    -----------
+    vectors : np.ndarray
+        The indexed vectors, with shape (number of vectors, dimension).
+    centroids : np.ndarray
+        The cell centroids, with shape (num_lists, dimension).
+    assignments : np.ndarray
+        The index of the cell each vector is assigned to.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        centroids: np.ndarray,
+        assignments: np.ndarray,
+    ) -> None:
+        self.vectors = vectors
+        self.centroids = centroids
+        self.assignments = assignments
+        self._lists = [
+            np.flatnonzero(assignments == icell) for icell in range(len(centroids))
+        ]
+
+    @classmethod
+    def from_vectors(
+        cls,
+        vectors: np.ndarray,
+        num_lists: int | None = None,
+        num_iter: int = 10,
+        block_size: int = 1024,
+        seed: int = 0,
+    ) -> IVFIndex:
+        """Build an index by k-means clustering of a set of vectors.
+
+        Parameters
+        -----------
+        vectors : np.ndarray
+            The vectors to index. Rows containing NaN are never returned
+            as neighbors.
+        num_lists : int or None
+            The number of cells. Defaults to sqrt(number of vectors).
+        num_iter : int = 10
+            The number of Lloyd iterations used in k-means.
+        block_size : int = 1024
+            The number of vectors to assign to cells at once.
+        seed : int = 0
+            Random seed used to initialize the centroids.
+
+        Returns
+        -----------
+        IVFIndex
+        """
+        x = np.asarray(vectors, dtype=float)
+        finite = np.flatnonzero(~np.any(np.isnan(x), axis=1))
+        if len(finite) == 0:
+            raise ValueError("Cannot build an index without any finite vectors.")
+        num_lists = min(
+            num_lists or max(1, int(np.sqrt(len(finite)))), max(1, len(finite))
+        )
+
+        # Only copy the finite rows once, rather than in every iteration
+        xf = x if len(finite) == len(x) else x[finite]
+        rng = np.random.default_rng(seed)
+        centroids = x[rng.choice(finite, size=num_lists, replace=False)].copy()
+        for _ in range(num_iter):
+            assignments = cls._assign(xf, centroids, block_size)
+            # Update all centroids at once, leaving those of empty cells in place
+            counts = np.bincount(assignments, minlength=num_lists)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, xf)
+            occupied = counts > 0
+            centroids[occupied] = sums[occupied] / counts[occupied, None]
+
+        assignments = np.full(len(x), -1, dtype=int)
+        assignments[finite] = cls._assign(xf, centroids, block_size)
+        return cls(x, centroids, assignments)
+
+    @staticmethod
+    def _assign(
+        vectors: np.ndarray, centroids: np.ndarray, block_size: int = 1024
+    ) -> np.ndarray:
+        """Return the closest centroid for each vector."""
+        cnorms = np.einsum("ik,ik->i", centroids, centroids)
+        return np.concatenate(
+            [
+                np.argmin(
+                    cnorms[None, :] - 2.0 * (vectors[i : i + block_size] @ centroids.T),
+                    axis=1,
+                )
+                for i in range(0, len(vectors), block_size)
+            ]
+        ).astype(int)
+
+    def query(
+        self, idx: int, num: int, num_probe: int = 8
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the approximate closest vectors to an indexed vector.
+
+        Parameters
+        -----------
+        idx : the index of the vector in the index to query
+        num : the number of closest vectors to return
+        num_probe : int = 8
+            The number of cells to search. Larger values are slower
+            but more accurate.
+
+        Returns
+        -----------
+        tuple of np.ndarray, np.ndarray
+            The indices of the closest vectors, excluding idx, and their
+            (unprocessed) distances, sorted by increasing distance.
+        """
+        target = self.vectors[idx]
+        cdist = np.linalg.norm(self.centroids - target, axis=1)
+        num_probe = min(num_probe, len(self.centroids))
+        cells = np.argpartition(cdist, num_probe - 1)[:num_probe]
+
+        candidates = np.concatenate([self._lists[icell] for icell in cells])
+        candidates = candidates[candidates != idx]
+        dist = np.linalg.norm(self.vectors[candidates] - target, axis=1)
+
+        num = min(num, len(candidates))
+        if num < len(candidates):
+            keep = np.argpartition(dist, num)[:num]
+            candidates, dist = candidates[keep], dist[keep]
+        order = np.argsort(dist)
+        return candidates[order], dist[order]
+
+    def save(self, file_path: str | Path) -> None:
+        """Save the index to a numpy .npz file."""
+        np.savez(
+            file_path,
+            vectors=self.vectors,
+            centroids=self.centroids,
+            assignments=self.assignments,
+        )
+
+    @classmethod
+    def load(cls, file_path: str | Path) -> IVFIndex:
+        """Load an index from a numpy .npz file."""
+        with np.load(file_path) as data:
+            return cls(data["vectors"], data["centroids"], data["assignments"])
+
+
 class SimilarityScorer:
     """Mixin for ranking the similarity between structures.
 
@@ -209,6 +432,7 @@ class SimilarityScorer:
         self,
         structures: list[Structure],
         num_procs: int = 1,
+        chunk_size: int | None = None,
     ):
         """Featurize structures using the user-defined _featurize_structure.
 
@@ -221,6 +445,9 @@ class SimilarityScorer:
         structures : list of Structure objects
         num_procs : int = 1
             Number of parallel processes to run in featurizing structures.
+        chunk_size : int or None (default)
+            Number of structures sent to each process at once.
+            If None, uses the default of `multiprocessing.Pool.map`.
 
         Returns
         -----------
@@ -228,7 +455,9 @@ class SimilarityScorer:
         """
         if num_procs > 1:
             with multiprocessing.Pool(num_procs) as pool:
-                _feature_vectors = pool.map(self._featurize_structure, structures)
+                _feature_vectors = pool.map(
+                    self._featurize_structure, structures, chunksize=chunk_size
+                )
         else:
             _feature_vectors = [
                 self._featurize_structure(structure) for structure in structures
@@ -544,6 +773,7 @@ class M3GNetSimilarity(SimilarityScorer):
         self,
         structures: list[Structure],
         num_procs: int = 1,
+        chunk_size: int | None = None,
     ):
         """Featurize structures using the user-defined _featurize_structure.
 
@@ -554,6 +784,8 @@ class M3GNetSimilarity(SimilarityScorer):
         structures : list of Structure objects
         num_procs : int = 1
             Number of parallel processes to run in featurizing structures.
+        chunk_size : int or None (default)
+            Unused, structures are split evenly across processes.
 
         Returns
         -----------
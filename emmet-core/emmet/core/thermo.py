@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from functools import cached_property
 from typing import TYPE_CHECKING, Sequence, overload
 
+import numpy as np
 from pydantic import BaseModel, Field
 from emmet.core.io.pymatgen import PhaseDiagram, ComputedEntry, ComputedStructureEntry
 
@@ -76,6 +78,120 @@ class DecompositionProduct(BaseModel):
     )
 
 
+def _get_decomps_and_e_above_hull(
+    pd: PhaseDiagram,
+    entries: Sequence[ComputedEntry | ComputedStructureEntry],
+    max_block_elements: int = 2**24,
+) -> list[tuple[dict, float]]:
+    """Batched equivalent of `PhaseDiagram.get_decomp_and_e_above_hull`.
+
+    The augmented inverse of each hull simplex is computed once, and the
+    barycentric coordinates of all compositions with respect to all simplices
+    are computed in blocks of NumPy operations. As in pymatgen, the first
+    simplex containing a composition is used to define its decomposition.
+
+    Entries which cannot be located on the hull, or whose energy is below it,
+    are evaluated with `PhaseDiagram.get_decomp_and_e_above_hull` to retain
+    pymatgen's error handling.
+
+    Args:
+        pd (PhaseDiagram): the phase diagram.
+        entries (Sequence[ComputedEntry | ComputedStructureEntry]): entries to evaluate.
+        max_block_elements (int): maximum size of intermediate barycentric coordinate
+            arrays, used to limit memory.
+
+    Returns:
+        list of (decomposition, energy above hull) for each entry.
+    """
+    stable_entries = pd.stable_entries
+    results: list[tuple[dict, float] | None] = [
+        ({entry: 1.0}, 0.0) if entry in stable_entries else None for entry in entries
+    ]
+    unstable = [idx for idx, res in enumerate(results) if res is None]
+
+    pd_elements = set(pd.elements)
+    located = [
+        idx for idx in unstable if set(entries[idx].composition.elements) <= pd_elements
+    ]
+    if located and len(pd.facets) > 0:
+        facets = np.array(pd.facets, dtype=int)
+        vertices = pd.qhull_data[facets, :-1]
+        aug_inv = np.linalg.inv(
+            np.concatenate([vertices, np.ones((*facets.shape, 1))], axis=-1)
+        )
+        coords = np.array(
+            [
+                [entries[idx].composition.get_atomic_fraction(el) for el in pd.elements[1:]]
+                + [1.0]
+                for idx in located
+            ]
+        )
+
+        tol = PhaseDiagram.numerical_tol / 10
+        block_size = max(1, max_block_elements // aug_inv[..., 0].size)
+        for start in range(0, len(located), block_size):
+            bary = np.einsum(
+                "nj,fji->nfi", coords[start : start + block_size], aug_inv
+            )
+            in_simplex = np.all(bary >= -tol, axis=-1)
+            first_facet = np.argmax(in_simplex, axis=1)
+            for jdx, idx in enumerate(located[start : start + block_size]):
+                if not in_simplex[jdx, first_facet[jdx]]:
+                    continue
+                decomp = {
+                    pd.qhull_entries[f]: amt
+                    for f, amt in zip(
+                        facets[first_facet[jdx]], bary[jdx, first_facet[jdx]]
+                    )
+                    if abs(amt) > PhaseDiagram.numerical_tol
+                }
+                e_above_hull = entries[idx].energy_per_atom - sum(
+                    e.energy_per_atom * n for e, n in decomp.items()
+                )
+                if e_above_hull >= -PhaseDiagram.numerical_tol:
+                    results[idx] = (decomp, e_above_hull)
+
+    return [
+        res or pd.get_decomp_and_e_above_hull(entries[idx])  # type: ignore[misc]
+        for idx, res in enumerate(results)
+    ]
+
+
+_PHASE_SEPARATION_PD: PhaseDiagram | None = None
+
+
+def _init_phase_separation_worker(pd: PhaseDiagram) -> None:
+    global _PHASE_SEPARATION_PD
+    _PHASE_SEPARATION_PD = pd
+
+
+def _get_decomp_and_phase_separation_energy(
+    entry: ComputedEntry | ComputedStructureEntry,
+    pd: PhaseDiagram | None = None,
+) -> tuple[list[dict], float] | None:
+    """Compute the decomposition enthalpy of an entry, None if this fails.
+
+    The decomposition is returned as DecompositionProduct-like dicts
+    so that results can be sent back from worker processes cheaply.
+    """
+    pd = pd or _PHASE_SEPARATION_PD
+    try:
+        decomp, energy = pd.get_decomp_and_phase_separation_energy(entry)  # type: ignore[union-attr, arg-type]
+    except ValueError:
+        # try/except so this quantity does not take down the builder if it fails:
+        # it includes an optimization step that can be fragile in some instances,
+        # most likely failure is ValueError, "invalid value encountered in true_divide"
+        return None
+    return [
+        {
+            "material_id": de.data["material_id"],  # type: ignore[union-attr]
+            "formula": de.composition.formula,
+            "amount": amt,
+        }
+        for de, amt in decomp.items()  # type: ignore[union-attr]
+    ], energy  # type: ignore[return-value]
+
+
 class ThermoDoc(PropertyDoc):
     """
     A thermo entry document
@@ -165,16 +281,27 @@ class ThermoDoc(PropertyDoc):
         thermo_type: ThermoType | RunType,
         phase_diagram: PhaseDiagram | None = None,
         use_max_chemsys: bool = False,
+        compute_decomposition_enthalpy: bool = True,
+        num_procs: int = 1,
         **kwargs,
     ):
         """Produce a list of ThermoDocs from a list of Entry objects
 
+        Energies above hull, decompositions and formation energies are evaluated
+        for all materials at once against the hull simplices, see
+        `_get_decomps_and_e_above_hull`.
+
         Args:
             entries (list[ComputedEntry| ComputedStructureEntry]): list of Entry objects
             thermo_type (ThermoType | RunType): Thermo type
             phase_diagram (PhaseDiagram | None, optional): Already built phase diagram. Defaults to None.
             use_max_chemsys (bool, optional): Whether to only produce thermo docs for materials
                 that match the largest chemsys represented in the list. Defaults to False.
+            compute_decomposition_enthalpy (bool, optional): Whether to compute the
+                decomposition enthalpy, which requires a constrained optimization for each
+                material. Defaults to True.
+            num_procs (int, optional): Number of processes used to compute decomposition
+                enthalpies. Defaults to 1.
 
         Returns:
             list[ThermoDoc]: list of built thermo doc objects.
@@ -206,18 +333,64 @@ class ThermoDoc(PropertyDoc):
                 entry.energy,
             )
 
-        for material_id, entry_group in entries_by_mpid.items():
-            if (
+        blessed_entries = {
+            material_id: sorted(entry_group, key=_energy_eval)[0]
+            for material_id, entry_group in entries_by_mpid.items()
+            if not (
                 use_max_chemsys
                 and entry_group[0].composition.chemical_system != chemsys
-            ):
-                continue
+            )
+        }
+        if not blessed_entries:
+            return docs
+
+        stable_entries = pd.stable_entries
+        decomps_and_e_above_hull = _get_decomps_and_e_above_hull(
+            pd, list(blessed_entries.values())
+        )
 
-            sorted_entries = sorted(entry_group, key=_energy_eval)
+        el_ref_energies = np.array(
+            [pd.el_refs[el].energy_per_atom for el in pd.elements]
+        )
+        formation_energies_per_atom = (
+            np.array(
+                [entry.energy for entry in blessed_entries.values()]
+            )
+            - np.array(
+                [
+                    [entry.composition[el] for el in pd.elements]
+                    for entry in blessed_entries.values()
+                ]
+            )
+            @ el_ref_energies
+        ) / np.array(
+            [entry.composition.num_atoms for entry in blessed_entries.values()]
+        )
 
-            blessed_entry = sorted_entries[0]
+        phase_separation: list[tuple[list[dict], float] | None] = []
+        if compute_decomposition_enthalpy and num_procs > 1:
+            with ProcessPoolExecutor(
+                max_workers=num_procs,
+                initializer=_init_phase_separation_worker,
+                initargs=(pd,),
+            ) as pool:
+                phase_separation = list(
+                    pool.map(
+                        _get_decomp_and_phase_separation_energy,
+                        blessed_entries.values(),
+                        chunksize=max(1, len(blessed_entries) // (4 * num_procs)),
+                    )
+                )
+        elif compute_decomposition_enthalpy:
+            phase_separation = [
+                _get_decomp_and_phase_separation_energy(entry, pd=pd)
+                for entry in blessed_entries.values()
+            ]
 
-            (decomp, ehull) = pd.get_decomp_and_e_above_hull(blessed_entry)  # type: ignore[arg-type]
+        for idx, (material_id, blessed_entry) in enumerate(blessed_entries.items()):
+            entry_group = entries_by_mpid[material_id]
+
+            (decomp, ehull) = decomps_and_e_above_hull[idx]
 
             builder_meta = EmmetMeta(license=blessed_entry.data.get("license"))  # type: ignore[call-arg]
 
@@ -229,9 +402,9 @@ class ThermoDoc(PropertyDoc):
                 / blessed_entry.composition.num_atoms,
                 "energy_per_atom": blessed_entry.energy
                 / blessed_entry.composition.num_atoms,
-                "formation_energy_per_atom": pd.get_form_energy_per_atom(blessed_entry),  # type: ignore[arg-type]
+                "formation_energy_per_atom": formation_energies_per_atom[idx],
                 "energy_above_hull": ehull,
-                "is_stable": blessed_entry in pd.stable_entries,
+                "is_stable": blessed_entry in stable_entries,
                 "builder_meta": builder_meta.model_dump(),
             }
 
@@ -256,26 +429,16 @@ class ThermoDoc(PropertyDoc):
                     for de, amt in decomp.items()  # type: ignore[union-attr]
                 ]
 
-            try:
-                decomp, energy = pd.get_decomp_and_phase_separation_energy(
-                    blessed_entry  # type: ignore[arg-type]
-                )
-                d["decomposition_enthalpy"] = energy
-                d["decomposition_enthalpy_decomposes_to"] = [
-                    {
-                        "material_id": de.data["material_id"],  # type: ignore[union-attr]
-                        "formula": de.composition.formula,
-                        "amount": amt,
-                    }
-                    for de, amt in decomp.items()  # type: ignore[union-attr]
-                ]
-            except ValueError:
-                # try/except so this quantity does not take down the builder if it fails:
-                # it includes an optimization step that can be fragile in some instances,
-                # most likely failure is ValueError, "invalid value encountered in true_divide"
-                d["warnings"] = [
-                    "Could not calculate decomposition enthalpy for this entry."
-                ]
+            if compute_decomposition_enthalpy:
+                if phase_separation[idx] is None:
+                    d["warnings"] = [
+                        "Could not calculate decomposition enthalpy for this entry."
+                    ]
+                else:
+                    (
+                        d["decomposition_enthalpy_decomposes_to"],
+                        d["decomposition_enthalpy"],
+                    ) = phase_separation[idx]
 
             d["energy_type"] = blessed_entry.parameters.get("run_type", "Unknown")
             d["entry_types"] = []
@@ -303,13 +466,23 @@ class ThermoDoc(PropertyDoc):
         return docs
 
     @staticmethod
-    def construct_phase_diagram(entries) -> PhaseDiagram:
+    def construct_phase_diagram(
+        entries, subsystem_stable_entry_ids: dict[str, set[str]] | None = None
+    ) -> PhaseDiagram:
         """
         Efficienty construct a phase diagram using only the lowest entries at every composition
         represented in the entry data passed.
 
+        If the stable entries of lower-order subsystems are already known, entries in those
+        subsystems which are not stable there are also excluded from the hull construction:
+        an entry above the hull of a subsystem is necessarily above the hull of the full system.
+
         Args:
             entries (list[ComputedStructureEntry]): list of corrected pymatgen entry objects.
+            subsystem_stable_entry_ids (dict[str, set[str]] | None): map of dash-delimited
+                subsystem chemsys to the entry IDs which are stable in that subsystem.
+                The stable sets must have been computed from the same (identically corrected)
+                entries as are passed in `entries`.
 
         Returns:
             PhaseDiagram: Pymatgen PhaseDiagram object
@@ -318,11 +491,34 @@ class ThermoDoc(PropertyDoc):
         for e in entries:
             entries_by_comp[e.composition.reduced_formula].append(e)
 
+        if subsystem_stable_entry_ids:
+            subsystems = {
+                frozenset(chemsys.split("-")): stable_ids
+                for chemsys, stable_ids in subsystem_stable_entry_ids.items()
+            }
+
+            # Entries with the same energy at a composition are interchangeable, so a
+            # composition is kept if any of its entries is stable in each subsystem
+            def _is_candidate(comp_entries) -> bool:
+                elements = {el.symbol for el in comp_entries[0].composition.elements}
+                return all(
+                    any(e.entry_id in stable_ids for e in comp_entries)
+                    for subsystem, stable_ids in subsystems.items()
+                    if elements <= subsystem
+                )
+
+            entries_by_comp = {
+                comp: comp_entries
+                for comp, comp_entries in entries_by_comp.items()
+                if _is_candidate(comp_entries)
+            }
+
         # Only use lowest entry per composition to speed up QHull in Phase Diagram
         reduced_entries = [
             sorted(comp_entries, key=lambda e: e.energy_per_atom)[0]
             for comp_entries in entries_by_comp.values()
         ]
+
         pd = PhaseDiagram(reduced_entries)
 
         # Add back all entries, not just those on the hull
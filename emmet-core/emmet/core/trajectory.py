@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -26,16 +28,20 @@ logger = logging.getLogger(__name__)
 
 try:
     import pyarrow as pa
+    import pyarrow.dataset as pa_ds
     import pyarrow.parquet as pa_pq
+    from pyarrow import Schema as ArrowSchema
     from pyarrow import Table as ArrowTable
 
 except ImportError:
     pa = None  # type: ignore[assignment]
+    pa_ds = None  # type: ignore[assignment]
     pa_pq = None  # type: ignore[assignment]
+    ArrowSchema = None  # type: ignore[assignment]
     ArrowTable = None  # type: ignore[assignment]
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
     from typing import Any
 
     from typing_extensions import Self
@@ -118,6 +124,436 @@ def _order_z_list(new_z: list[int], ref_z: list[int]) -> tuple[list[int], bool]:
     return reordered_index, True
 
 
+@dataclass
+class TrajectoryFrame:
+    """A single frame of a TrajectoryArrays.
+
+    All arrays are views into the parent TrajectoryArrays, not copies.
+    """
+
+    elements: np.ndarray
+    cart_coords: np.ndarray
+    lattice: np.ndarray | None
+    properties: dict[str, np.ndarray]
+
+    def to_pmg(self) -> Structure | Molecule:
+        """Create a pymatgen Structure (periodic) or Molecule for this frame."""
+        species = [Element.from_Z(int(z)) for z in self.elements]
+        site_properties = {}
+        if (magmoms := self.properties.get("magmoms")) is not None:
+            site_properties["magmoms"] = magmoms.tolist()
+
+        if self.lattice is None:
+            return Molecule(
+                species=species,
+                coords=self.cart_coords,
+                site_properties=site_properties,
+            )
+        return Structure(
+            lattice=self.lattice,
+            species=species,
+            coords=self.cart_coords,
+            coords_are_cartesian=True,
+            site_properties=site_properties,
+        )
+
+
+@dataclass
+class TrajectoryArrays:
+    """Array-backed, compact storage for an atomistic trajectory.
+
+    Rather than nested lists of Python floats, each per-frame quantity is
+    stored as a single contiguous array whose leading dimension is the
+    ionic step, e.g., `cart_coords` has shape (steps, sites, 3).
+    Frames can be accessed lazily with `frame` or `iter_frames`, and the
+    arrays are shared with Arrow tensor columns without copying.
+
+    Frames without coordinates are stored as NaN.
+    """
+
+    elements: np.ndarray
+    cart_coords: np.ndarray
+    lattice: np.ndarray | None = None
+    properties: dict[str, np.ndarray] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def num_ionic_steps(self) -> int:
+        return self.cart_coords.shape[0]
+
+    @property
+    def constant_lattice(self) -> bool:
+        return self.lattice is not None and self.lattice.shape[0] == 1
+
+    def __len__(self) -> int:
+        return self.num_ionic_steps
+
+    def frame(self, index: int) -> TrajectoryFrame:
+        """Get a view of a single frame."""
+        lattice = None
+        if self.lattice is not None:
+            lattice = self.lattice[0 if self.constant_lattice else index]
+        return TrajectoryFrame(
+            elements=self.elements,
+            cart_coords=self.cart_coords[index],
+            lattice=lattice,
+            properties={k: v[index] for k, v in self.properties.items()},
+        )
+
+    def iter_frames(self) -> Iterator[TrajectoryFrame]:
+        """Lazily iterate over views of each frame."""
+        for index in range(self.num_ionic_steps):
+            yield self.frame(index)
+
+    def __getitem__(self, index: int | slice) -> TrajectoryArrays:
+        """Get a subset of frames. Slices return views, not copies."""
+        _slice = slice(index, index + 1 or None) if isinstance(index, int) else index
+        return type(self)(
+            elements=self.elements,
+            cart_coords=self.cart_coords[_slice],
+            lattice=(
+                self.lattice
+                if self.lattice is None or self.constant_lattice
+                else self.lattice[_slice]
+            ),
+            properties={k: v[_slice] for k, v in self.properties.items()},
+            metadata=self.metadata,
+        )
+
+    @classmethod
+    def from_trajectory(
+        cls, traj: AtomRelaxTrajectory, dtype: np.dtype | type = np.float64
+    ) -> Self:
+        """Create from a list-backed trajectory model.
+
+        Parameters
+        -----------
+        traj : AtomRelaxTrajectory or subclass
+        dtype : numpy dtype, defaults to np.float64
+            The floating point type used to store per-frame data.
+            Use np.float32 to halve memory usage.
+
+        Per-frame data which cannot be represented as a numeric array,
+        e.g., electronic steps, is not stored.
+        """
+        num_sites = len(traj.elements)
+        cart_coords = np.full((traj.num_ionic_steps, num_sites, 3), np.nan, dtype=dtype)
+        for istep, coords in enumerate(traj.cart_coords):
+            if coords is not None:
+                cart_coords[istep] = coords
+
+        properties = {}
+        for k in sorted(traj.ionic_step_properties):
+            if (v := getattr(traj, k, None)) is None or k == "lattice":
+                continue
+            try:
+                arr = np.asarray(v, dtype=dtype)
+            except (TypeError, ValueError):
+                # Non-numeric data, e.g., electronic steps
+                continue
+            if arr.ndim > 0 and arr.shape[0] == traj.num_ionic_steps:
+                properties[k] = arr
+
+        # Excluded fields, e.g., `ionic_step_properties`, are not metadata,
+        # and the rest are dumped to JSON-compatible types for `to_arrow`
+        metadata_fields = {
+            k
+            for k, field_info in traj.__class__.model_fields.items()
+            if not field_info.exclude
+        } - (
+            {"elements", "cart_coords", "lattice", "num_ionic_steps"}
+            | traj.ionic_step_properties
+        )
+        metadata = traj.model_dump(
+            mode="json", include=metadata_fields, exclude_none=True
+        )
+
+        return cls(
+            elements=np.asarray(traj.elements, dtype=np.int64),
+            cart_coords=cart_coords,
+            lattice=(
+                np.asarray(traj.lattice, dtype=dtype) if traj.lattice else None
+            ),
+            properties=properties,
+            metadata=metadata,
+        )
+
+    def to_trajectory(self, traj_cls: type[AtomRelaxTrajectory] | None = None):
+        """Convert back to a list-backed trajectory model.
+
+        Parameters
+        -----------
+        traj_cls : type or None
+            The trajectory class to create. Defaults to AtomRelaxTrajectory.
+        """
+        traj_cls = traj_cls or AtomRelaxTrajectory
+        cart_coords = [
+            None if np.isnan(coords).any() else coords.tolist()
+            for coords in self.cart_coords
+        ]
+        config: dict[str, Any] = {
+            "elements": self.elements.tolist(),
+            "cart_coords": cart_coords,
+            "lattice": None if self.lattice is None else self.lattice.tolist(),
+            **{
+                k: v.tolist()
+                for k, v in self.properties.items()
+                if k in traj_cls.model_fields
+            },
+            **{k: v for k, v in self.metadata.items() if k in traj_cls.model_fields},
+        }
+        return traj_cls(**config)
+
+    @requires(
+        pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+    )
+    def to_arrow(self) -> ArrowTable:
+        """Create a PyArrow Table with one row per frame.
+
+        Each per-frame quantity is stored as a fixed-shape tensor column,
+        which wraps the underlying array without copying it. Data which
+        does not vary between frames (elements, a constant lattice and
+        any metadata) is stored in the schema metadata.
+        """
+        columns = {
+            "cart_coords": np.ascontiguousarray(self.cart_coords),
+            **{k: np.ascontiguousarray(v) for k, v in self.properties.items()},
+        }
+        if self.lattice is not None and not self.constant_lattice:
+            columns["lattice"] = np.ascontiguousarray(self.lattice)
+
+        arrays = {
+            k: (
+                pa.FixedShapeTensorArray.from_numpy_ndarray(v)
+                if v.ndim > 1
+                else pa.array(v)
+            )
+            for k, v in columns.items()
+        }
+        schema_metadata = {
+            "elements": json.dumps(self.elements.tolist()),
+            "metadata": json.dumps(self.metadata),
+        }
+        if self.constant_lattice:
+            schema_metadata["lattice"] = json.dumps(self.lattice.tolist())  # type: ignore[union-attr]
+        return pa.table(arrays).replace_schema_metadata(schema_metadata)
+
+    @classmethod
+    @requires(
+        pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+    )
+    def from_arrow(cls, pa_table: ArrowTable) -> Self:
+        """Create from a PyArrow Table made by `to_arrow`.
+
+        Tensor columns held in a single chunk are read without copying.
+        """
+        schema_metadata = {
+            k.decode(): json.loads(v)
+            for k, v in (pa_table.schema.metadata or {}).items()
+        }
+
+        columns = {}
+        for k in pa_table.column_names:
+            col = pa_table[k].combine_chunks()
+            if isinstance(col.type, pa.FixedShapeTensorType):
+                columns[k] = col.to_numpy_ndarray()
+            else:
+                columns[k] = col.to_numpy()
+
+        lattice = columns.pop("lattice", None)
+        if lattice is None and (const_lattice := schema_metadata.get("lattice")):
+            lattice = np.asarray(const_lattice, dtype=columns["cart_coords"].dtype)
+
+        return cls(
+            elements=np.asarray(schema_metadata["elements"], dtype=np.int64),
+            cart_coords=columns.pop("cart_coords"),
+            lattice=lattice,
+            properties=columns,
+            metadata=schema_metadata.get("metadata", {}),
+        )
+
+    @requires(
+        pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+    )
+    def to_frame_table(self, identifier: str | None = None) -> ArrowTable:
+        """Create a PyArrow Table with one row per frame for a multi-trajectory dataset.
+
+        Unlike `to_arrow`, every row is self-contained, so that tables from
+        trajectories with different numbers of sites can be concatenated.
+        Each row holds the trajectory identifier, its step index, elements,
+        lattice, and the max force on any site (if forces are available),
+        which allows Parquet readers to filter rows by these columns.
+        Per-site quantities are stored as variable-length lists wrapping
+        the underlying arrays without copying. Trajectory metadata is stored
+        as a JSON string in every row, which Parquet dictionary-encodes.
+
+        Parameters
+        -----------
+        identifier : str or None
+            Identifier of the trajectory. Defaults to the identifier
+            stored in `metadata`, if any.
+        """
+        num_steps = self.num_ionic_steps
+        num_sites = len(self.elements)
+        identifier = identifier or self.metadata.get("identifier")
+
+        columns: dict[str, Any] = {
+            "identifier": pa.array([identifier] * num_steps, type=pa.string()),
+            "step": pa.array(np.arange(num_steps, dtype=np.int32)),
+            "metadata": pa.array(
+                [json.dumps(self.metadata)] * num_steps, type=pa.string()
+            ),
+            "elements": _to_site_list_array(
+                np.broadcast_to(self.elements, (num_steps, num_sites))
+            ),
+            "lattice": (
+                _to_site_list_array(
+                    np.broadcast_to(self.lattice, (num_steps, 3, 3))
+                    if self.constant_lattice
+                    else self.lattice,  # type: ignore[arg-type]
+                    per_site=False,
+                )
+                if self.lattice is not None
+                else pa.nulls(num_steps, type=pa.list_(pa.float64(), 9))
+            ),
+            "cart_coords": _to_site_list_array(self.cart_coords),
+        }
+        if (forces := self.properties.get("forces")) is not None:
+            columns["max_force"] = pa.array(
+                np.linalg.norm(forces, axis=-1).max(axis=-1)
+            )
+
+        fields = [pa.field(k, v.type) for k, v in columns.items()]
+        for k, v in self.properties.items():
+            per_site = v.ndim > 1 and v.shape[1] == num_sites
+            columns[k] = _to_site_list_array(v, per_site=per_site)
+            # Shape of each row, with -1 standing in for the number of sites
+            shape = [-1] * per_site + list(v.shape[1 + per_site :])
+            fields.append(
+                pa.field(k, columns[k].type, metadata={"shape": json.dumps(shape)})
+            )
+
+        return pa.Table.from_arrays(list(columns.values()), schema=pa.schema(fields))
+
+    @classmethod
+    @requires(
+        pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+    )
+    def from_frame_table(
+        cls, pa_table: ArrowTable, identifier: str | None = None
+    ) -> Self:
+        """Create from a table of frames, e.g., from `read_trajectory_frames`.
+
+        Only the frames present in the table are included, sorted by step.
+
+        Parameters
+        -----------
+        pa_table : pyarrow Table
+            Table with the layout of `to_frame_table`.
+        identifier : str or None
+            If the table contains frames from multiple trajectories,
+            the identifier of the trajectory to return.
+        """
+        if "identifier" in pa_table.column_names:
+            if identifier is not None:
+                pa_table = pa_table.filter(pa_ds.field("identifier") == identifier)
+            if len(pa_table.column("identifier").unique()) > 1:
+                raise ValueError(
+                    "Table contains frames from multiple trajectories, "
+                    "please specify an identifier."
+                )
+        elif identifier is not None:
+            raise ValueError(
+                "Table has no identifier column to select a trajectory from."
+            )
+        if pa_table.num_rows == 0:
+            raise ValueError(
+                "Table contains no frames"
+                + (f" for trajectory {identifier}." if identifier is not None else ".")
+            )
+        if "step" in pa_table.column_names:
+            pa_table = pa_table.sort_by("step")
+
+        elements = _from_site_list_array(pa_table["elements"])
+        num_sites = elements.shape[1]
+
+        lattice = None
+        if pa_table["lattice"].null_count == 0:
+            lattice = _from_site_list_array(pa_table["lattice"]).reshape(-1, 3, 3)
+
+        properties = {}
+        for fld in pa_table.schema:
+            if fld.name in {
+                "identifier",
+                "step",
+                "metadata",
+                "elements",
+                "lattice",
+                "cart_coords",
+                "max_force",
+            }:
+                continue
+            if pa_table[fld.name].null_count == pa_table.num_rows:
+                # Filled in for a trajectory without this property
+                continue
+            shape = json.loads((fld.metadata or {}).get(b"shape", b"[]"))
+            properties[fld.name] = _from_site_list_array(pa_table[fld.name]).reshape(
+                -1, *[num_sites if dim == -1 else dim for dim in shape]
+            )
+
+        metadata = {}
+        if "metadata" in pa_table.column_names:
+            metadata = json.loads(pa_table["metadata"][0].as_py())
+        return cls(
+            elements=elements[0].astype(np.int64),
+            cart_coords=_from_site_list_array(pa_table["cart_coords"]).reshape(
+                -1, num_sites, 3
+            ),
+            lattice=lattice,
+            properties=properties,
+            metadata=metadata,
+        )
+
+
+def _to_site_list_array(arr: np.ndarray, per_site: bool = True) -> Any:
+    """Wrap an array of shape (steps, ...) as an Arrow list array without copying.
+
+    If `per_site`, the second dimension is stored as a variable-length list
+    of fixed-size lists (or scalars, if the array is 2D). Otherwise, each
+    row is stored as a single fixed-size list.
+    """
+    arr = np.ascontiguousarray(arr)
+    if arr.ndim == 1:
+        return pa.array(arr)
+
+    values = pa.array(arr.reshape(-1))
+    if not per_site:
+        return pa.FixedSizeListArray.from_arrays(values, int(np.prod(arr.shape[1:])))
+
+    if arr.ndim > 2:
+        values = pa.FixedSizeListArray.from_arrays(
+            values, int(np.prod(arr.shape[2:]))
+        )
+    num_steps, num_sites = arr.shape[:2]
+    offsets = np.arange(0, num_steps * num_sites + 1, num_sites, dtype=np.int32)
+    return pa.ListArray.from_arrays(pa.array(offsets), values)
+
+
+def _from_site_list_array(column: Any) -> np.ndarray:
+    """Invert `_to_site_list_array`, returning an array of shape (steps, -1)."""
+    column = column.combine_chunks() if hasattr(column, "combine_chunks") else column
+    num_rows = len(column)
+    if not pa.types.is_list(column.type) and not pa.types.is_fixed_size_list(
+        column.type
+    ):
+        return column.to_numpy(zero_copy_only=False)
+
+    values = column.flatten()
+    while pa.types.is_fixed_size_list(values.type) or pa.types.is_list(values.type):
+        values = values.flatten()
+    return values.to_numpy(zero_copy_only=False).reshape(num_rows, -1)
+
+
 class AtomRelaxTrajectory(BaseModel):
     """Atomistic only, low-memory schema for relaxation trajectories that can interface with parquet, pymatgen, and ASE."""
 
@@ -220,6 +656,10 @@ class AtomRelaxTrajectory(BaseModel):
                 config[k] = v
         return type(self)(**config)
 
+    def to_arrays(self, dtype: np.dtype | type = np.float64) -> TrajectoryArrays:
+        """Convert to compact, array-backed storage. See TrajectoryArrays."""
+        return TrajectoryArrays.from_trajectory(self, dtype=dtype)
+
     @staticmethod
     def reorder_sites(
         structure: Structure | Molecule, ref_z: list[int]
@@ -812,3 +1252,170 @@ class RelaxTrajectory(AtomRelaxTrajectory):
 
 class Trajectory(RelaxTrajectory, _MDMixin):
     """Trajectory with flexibility for electronic structure molecular dynamics."""
+
+
+@requires(
+    pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+)
+def write_trajectory_frames(
+    trajectories: Iterable[AtomRelaxTrajectory | TrajectoryArrays],
+    file_name: str | Path,
+    row_group_size: int = 10_000,
+    schema: ArrowSchema | None = None,
+    **writer_kwargs,
+) -> None:
+    """Write trajectories to a Parquet file with one row per frame.
+
+    Trajectories are converted and written one at a time, so only about
+    one row group of frames is held in memory. Frames are written in the
+    order of `trajectories`, and in step order within a trajectory: pass
+    trajectories sorted by identifier so that the statistics of each row
+    group cover a narrow range of identifiers. Readers can then skip
+    row groups when filtering, see `read_trajectory_frames`.
+
+    Parameters
+    -----------
+    trajectories : iterable of AtomRelaxTrajectory or TrajectoryArrays
+    file_name : str or Path
+        The Parquet file to write.
+    row_group_size : int = 10,000
+        The maximum number of frames per row group.
+    schema : pyarrow Schema or None
+        The schema of the file. Defaults to that of the first trajectory,
+        and columns missing from later trajectories are filled with nulls.
+        Pass a schema if later trajectories have columns that the first
+        does not, e.g., from `TrajectoryArrays.to_frame_table`.
+    **writer_kwargs
+        Any other kwargs to pass to pyarrow.parquet.ParquetWriter
+    """
+    writer = None
+    buffered: list[ArrowTable] = []
+    num_buffered = 0
+
+    def _flush(final: bool = False) -> None:
+        # Only write whole row groups, carrying any remainder over to the
+        # next flush, so that row groups do not shrink between flushes
+        nonlocal num_buffered
+        if not buffered:
+            return
+        table = pa.concat_tables(buffered)
+        num_written = (
+            table.num_rows
+            if final
+            else row_group_size * (table.num_rows // row_group_size)
+        )
+        if num_written > 0:
+            writer.write_table(  # type: ignore[union-attr]
+                table.slice(0, num_written), row_group_size=row_group_size
+            )
+        buffered.clear()
+        if num_written < table.num_rows:
+            buffered.append(table.slice(num_written))
+        num_buffered = table.num_rows - num_written
+
+    try:
+        for traj in trajectories:
+            table = (
+                traj if isinstance(traj, TrajectoryArrays) else traj.to_arrays()
+            ).to_frame_table()
+            if writer is None:
+                schema = schema or table.schema
+                writer = pa_pq.ParquetWriter(file_name, schema, **writer_kwargs)
+            buffered.append(_conform_to_schema(table, schema))  # type: ignore[arg-type]
+            num_buffered += table.num_rows
+            if num_buffered >= row_group_size:
+                _flush()
+        _flush(final=True)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _conform_to_schema(table: ArrowTable, schema: ArrowSchema) -> ArrowTable:
+    """Order and cast the columns of a table to a schema, filling any gaps with nulls."""
+    if extra := set(table.column_names) - set(schema.names):
+        raise ValueError(
+            f"Columns {sorted(extra)} are not in the schema of the file, "
+            "pass a schema which includes them."
+        )
+    return pa.Table.from_arrays(
+        [
+            (
+                table[fld.name].cast(fld.type)
+                if fld.name in table.column_names
+                else pa.nulls(table.num_rows, type=fld.type)
+            )
+            for fld in schema
+        ],
+        schema=schema,
+    )
+
+
+@requires(
+    pa is not None, message="pyarrow must be installed to de-/serialize to parquet"
+)
+def read_trajectory_frames(
+    source: str | Path | list[str | Path],
+    identifier: str | Iterable[str] | None = None,
+    steps: tuple[int | None, int | None] | None = None,
+    energy: tuple[float | None, float | None] | None = None,
+    max_force: float | None = None,
+    columns: list[str] | None = None,
+    **dataset_kwargs,
+) -> ArrowTable:
+    """Read selected frames from Parquet files written by `write_trajectory_frames`.
+
+    Filters are pushed down to the Parquet reader, so row groups whose
+    statistics exclude all matching frames are not decoded.
+
+    Parameters
+    -----------
+    source : str, Path, or list thereof
+        Parquet file(s) or directory. Can be a remote path, e.g., AWS.
+    identifier : str, iterable of str, or None
+        If not None, only return frames from these trajectories.
+    steps : tuple of (int or None, int or None), or None
+        If not None, a half-open range [start, stop) of step indices.
+    energy : tuple of (float or None, float or None), or None
+        If not None, a closed range of energies.
+    max_force : float or None
+        If not None, only return frames where the largest force on any
+        site does not exceed this value.
+    columns : list of str or None
+        If not None, only read these columns.
+    **dataset_kwargs
+        Any other kwargs to pass to pyarrow.dataset.dataset
+
+    Returns
+    -----------
+    pyarrow.Table with one row per frame. Use
+    `TrajectoryArrays.from_frame_table` to convert to arrays.
+    """
+    conditions = []
+    if identifier is not None:
+        identifiers = [identifier] if isinstance(identifier, str) else list(identifier)
+        conditions.append(pa_ds.field("identifier").isin(identifiers))
+    for name, bounds, upper_inclusive in (
+        ("step", steps, False),
+        ("energy", energy, True),
+    ):
+        if bounds is None:
+            continue
+        lower, upper = bounds
+        if lower is not None:
+            conditions.append(pa_ds.field(name) >= lower)
+        if upper is not None:
+            conditions.append(
+                pa_ds.field(name) <= upper
+                if upper_inclusive
+                else pa_ds.field(name) < upper
+            )
+    if max_force is not None:
+        conditions.append(pa_ds.field("max_force") <= max_force)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    dataset = pa_ds.dataset(source, format="parquet", **dataset_kwargs)
+    return dataset.to_table(columns=columns, filter=expression)
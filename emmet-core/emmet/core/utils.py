@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import copy
 import datetime
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
 import hashlib
 import inspect
 import logging
+import os
 from enum import Enum
 from importlib import import_module
 from itertools import groupby
@@ -58,6 +61,10 @@ logger = logging.getLogger(__name__)
 
 SETTINGS = EmmetSettings()
 
+# Below this many structures, the cost of dispatching work to a process pool
+# outweighs that of grouping the structures serially
+GROUP_STRUCTURES_PARALLEL_THRESHOLD = 32
+
 
 def type_override(overrides: dict[str, Any]):
     """
@@ -136,6 +143,22 @@ def get_num_formula_units(composition: dict[Any, int | float]) -> int:
     return num_form_u
 
 
+def _group_indices_by_structure_matching(
+    sm: StructureMatcher, structures: list[Structure]
+) -> list[list[int]]:
+    """Group structures with a StructureMatcher, returning indices into `structures`.
+
+    Indices are returned rather than structures so that the groups can be
+    mapped back onto the caller's objects after a round trip through a
+    worker process.
+    """
+    index = {id(struc): idx for idx, struc in enumerate(structures)}
+    return [
+        [index[id(struc)] for struc in group]
+        for group in sm.group_structures(structures)
+    ]
+
+
 def group_structures(
     structures: list[Structure],
     ltol: float = SETTINGS.LTOL,
@@ -143,16 +166,31 @@ def group_structures(
     angle_tol: float = SETTINGS.ANGLE_TOL,
     symprec: float = SETTINGS.SYMPREC,
     comparator: AbstractComparator = ElementComparator(),
+    num_procs: int = 1,
+    executor: Executor | None = None,
 ) -> Iterator[list[Structure]]:
     """
     Groups structures according to space group and structure matching
 
+    The space group of each structure is computed exactly once. When
+    `num_procs > 1` or an `executor` is given, both the space group analysis
+    and the structure matching within each space group bucket are distributed
+    over a process pool, unless there are fewer than
+    GROUP_STRUCTURES_PARALLEL_THRESHOLD structures. The groups yielded are
+    identical to, and in the same order as, the serial case.
+
     Args:
         structures ([Structure]): list of structures to group
         ltol (float): StructureMatcher tuning parameter for matching tasks to materials
         stol (float): StructureMatcher tuning parameter for matching tasks to materials
         angle_tol (float): StructureMatcher tuning parameter for matching tasks to materials
         symprec (float): symmetry tolerance for space group finding
+        comparator (AbstractComparator): StructureMatcher comparator
+        num_procs (int): number of worker processes, defaults to 1 (serial).
+            With an `executor`, only used to size chunks of work, and
+            defaults to `os.cpu_count()`.
+        executor (Executor): optional pool to reuse across calls, e.g., one per
+            formula group. It is not shut down by this function.
     """
 
     sm = StructureMatcher(
@@ -166,13 +204,63 @@ def group_structures(
         comparator=comparator,
     )
 
-    def _get_sg(struc):
-        return get_sg(struc, symprec=symprec)
+    structures = list(structures)
+    _get_sg = partial(get_sg, symprec=symprec)
+
+    pool: Executor | None = None
+    if len(structures) >= GROUP_STRUCTURES_PARALLEL_THRESHOLD:
+        if executor is not None:
+            pool = executor
+            # Only used to size chunks of work for the executor
+            num_procs = num_procs if num_procs > 1 else os.cpu_count() or 1
+        elif num_procs > 1:
+            pool = ProcessPoolExecutor(max_workers=num_procs)
+    try:
+        # First group by spacegroup number then by structure matching
+        if pool:
+            space_groups = list(
+                pool.map(
+                    _get_sg,
+                    structures,
+                    chunksize=max(1, len(structures) // (4 * num_procs)),
+                )
+            )
+        else:
+            space_groups = [_get_sg(struc) for struc in structures]
+
+        buckets: list[list[Structure]] = [
+            [structures[idx] for idx, _ in pregroup]
+            for _, pregroup in groupby(
+                sorted(enumerate(space_groups), key=lambda x: x[1]),
+                key=lambda x: x[1],
+            )
+        ]
 
-    # First group by spacegroup number then by structure matching
-    for _, pregroup in groupby(sorted(structures, key=_get_sg), key=_get_sg):
-        for group in sm.group_structures(list(pregroup)):
-            yield group
+        if pool is None:
+            for bucket in buckets:
+                yield from sm.group_structures(bucket)
+            return
+
+        # Submit the largest buckets first to balance load across workers,
+        # but yield results in space group order.
+        futures: dict[int, Future] = {}
+        for ibucket in sorted(
+            range(len(buckets)), key=lambda idx: len(buckets[idx]), reverse=True
+        ):
+            if len(buckets[ibucket]) > 1:
+                futures[ibucket] = pool.submit(
+                    _group_indices_by_structure_matching, sm, buckets[ibucket]
+                )
+
+        for ibucket, bucket in enumerate(buckets):
+            if ibucket not in futures:
+                yield bucket
+                continue
+            for group in futures.pop(ibucket).result():
+                yield [bucket[idx] for idx in group]
+    finally:
+        if pool and pool is not executor:
+            pool.shutdown(wait=True, cancel_futures=True)
 
 
 def undeform_structure(structure: Structure, transformations: dict) -> Structure:
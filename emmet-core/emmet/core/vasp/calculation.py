@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
+import xml.etree.ElementTree as ET
 from copy import deepcopy
 from datetime import datetime
 from functools import cached_property
@@ -1112,8 +1113,12 @@ class Calculation(CalculationBaseModel):
         outcar_file = dir_name / outcar_file
         contcar_file = dir_name / contcar_file
 
-        vasprun_kwargs = vasprun_kwargs if vasprun_kwargs else {}
+        vasprun_kwargs = dict(vasprun_kwargs) if vasprun_kwargs else {}
         volumetric_files = [dir_name / v for v in (volumetric_files or [])]
+        # Parse projected eigenvalues in the same pass as everything else
+        # so that the band structure does not need a second parse.
+        if _bandstructure_needs_projections(parse_bandstructure, vasprun_file):
+            vasprun_kwargs.setdefault("parse_projected_eigen", True)
         vasprun = Vasprun(vasprun_file, **vasprun_kwargs)
         outcar = Outcar(outcar_file)
         if (
@@ -1400,20 +1405,65 @@ def _parse_dos(
     return None
 
 
+def _read_vasprun_incar(vasprun_file: Path | str) -> dict[str, Any]:
+    """Read only the INCAR block at the top of a vasprun.xml file.
+
+    The file is parsed incrementally and reading stops once the
+    INCAR block has closed, so this is cheap even for very large files.
+    """
+    incar: dict[str, Any] = {}
+    casts = {"int": int, "logical": lambda x: x.strip().upper() in ("T", "TRUE")}
+    with zopen(vasprun_file, "rb") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag == "incar":
+                for item in elem.findall("i"):
+                    cast = casts.get(item.attrib.get("type", ""), str)
+                    try:
+                        incar[item.attrib["name"]] = cast((item.text or "").strip())
+                    except ValueError:
+                        incar[item.attrib["name"]] = item.text
+                break
+    return incar
+
+
+def _bandstructure_needs_projections(
+    parse_mode: str | bool, vasprun_file: Path | str
+) -> bool:
+    """Determine whether _parse_bandstructure will need projected eigenvalues."""
+    if parse_mode == "auto":
+        try:
+            incar = _read_vasprun_incar(vasprun_file)
+        except Exception:
+            return False
+        return incar.get("NSW", 0) <= 1 and incar.get("ICHARG", 0) > 10
+    return bool(parse_mode)
+
+
 def _parse_bandstructure(
     parse_mode: str | bool,
     vasprun: Vasprun,
     use_emmet_models: bool,
 ) -> ElectronicBS | BandStructure | None:
-    """Parse band structure. See Calculation.from_vasp_files for supported arguments."""
-    vasprun_file = vasprun.filename
+    """Parse band structure. See Calculation.from_vasp_files for supported arguments.
+
+    The band structure is taken from `vasprun` if it already holds the
+    eigenvalues (and projections, if needed); the file is only re-parsed
+    with BSVasprun otherwise.
+    """
+
+    def _get_bs_vasprun(projections: bool) -> Vasprun:
+        if getattr(vasprun, "eigenvalues", None) and (
+            not projections or vasprun.projected_eigenvalues is not None
+        ):
+            return vasprun
+        return BSVasprun(vasprun.filename, parse_projected_eigen=projections)
 
     bs: ElectronicBS | BandStructure | None = None
     # only save the bandstructure if not moving ions
     if parse_mode == "auto" and vasprun.incar.get("NSW", 0) <= 1:
         if vasprun.incar.get("ICHARG", 0) > 10:
             # NSCF calculation
-            bs_vrun = BSVasprun(vasprun_file, parse_projected_eigen=True)
+            bs_vrun = _get_bs_vasprun(projections=True)
             try:
                 # try parsing line mode
                 bs = bs_vrun.get_band_structure(line_mode=True, efermi="smart")
@@ -1422,12 +1472,12 @@ def _parse_bandstructure(
                 bs = bs_vrun.get_band_structure(efermi="smart")
         else:
             # Not a NSCF calculation
-            bs_vrun = BSVasprun(vasprun_file, parse_projected_eigen=False)
+            bs_vrun = _get_bs_vasprun(projections=False)
             bs = bs_vrun.get_band_structure(efermi="smart")
 
     elif parse_mode:
         # legacy line/True behavior for bandstructure_mode
-        bs_vrun = BSVasprun(vasprun_file, parse_projected_eigen=True)
+        bs_vrun = _get_bs_vasprun(projections=True)
         bs = bs_vrun.get_band_structure(line_mode=parse_mode == "line", efermi="smart")
 
     if bs and use_emmet_models:
@@ -147,7 +147,7 @@ class ChgcarLike(BaseModel):
 
         return cls(  # type: ignore[call-arg]
             labels=labels,
-            data=[vd.data[vlab].flatten(order="C") for vlab in labels],  # type: ignore[misc]
+            data=[vd.data[vlab].ravel(order="C") for vlab in labels],  # type: ignore[misc]
             data_rank=[vd.data[vlab].shape for vlab in labels],  # type: ignore[misc]
             data_aug=data_aug,
             structure=(
@@ -4,15 +4,19 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 from emmet.core.utils import get_hash_blocked
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from concurrent.futures import Future
     from typing import Any
 
     from emmet.core.types.typing import FSPathType
@@ -92,17 +96,24 @@ class CalculationLocator(BaseModel):
         description="Optional modifier for the calculation", default=None
     )
 
+    _resolved: tuple[Path, Path] | None = PrivateAttr(default=None)
+
+    @property
+    def resolved_path(self) -> Path:
+        """The resolved calculation path, only computed once per path."""
+        if self._resolved is None or self._resolved[0] is not self.path:
+            self._resolved = (self.path, self.path.resolve())
+        return self._resolved[1]
+
     def __hash__(self) -> int:
         # Resolve path to handle different representations of same path
-        return hash((self.path.resolve(), self.modifier))
+        return hash((self.resolved_path, self.modifier))
 
-    # You might not need custom __eq__ in Pydantic v2
-    # But if you keep it, consider path resolution:
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, CalculationLocator):
             return False
         return (
-            self.path.resolve() == other.path.resolve()
+            self.resolved_path == other.resolved_path
             and self.modifier == other.modifier
         )
 
@@ -161,6 +172,43 @@ for v in VASP_RAW_DATA_ORG.values():
 
 VASP_RAW_DATA_ORG["input"].extend([f"{f}.orig" for f in VASP_INPUT_FILES])
 
+# Matches any file name containing the name of a VASP file
+_VASP_FILE_MATCHER = re.compile(
+    "|".join(re.escape(f) for f in sorted(_vasp_files, key=len, reverse=True))
+)
+
+
+def _scan_vasp_directory(
+    target_dir: FSPathType,
+) -> tuple[list[str], list[FileMetadata]]:
+    """List a directory once, returning its sub-directories and VASP files."""
+    sub_dirs: list[str] = []
+    vasp_files: list[FileMetadata] = []
+    with os.scandir(target_dir) as scan_dir:
+        for p in scan_dir:
+            if p.is_dir():
+                sub_dirs.append(p.path)
+            elif p.is_file() and _VASP_FILE_MATCHER.search(p.name):
+                vasp_files.append(FileMetadata(name=p.name, path=Path(p.path)))
+    return sub_dirs, vasp_files
+
+
+def _group_by_calc_suffix(
+    vasp_files: list[FileMetadata],
+) -> dict[str, list[FileMetadata]]:
+    by_suffix = defaultdict(list)
+    for file_meta in vasp_files:
+        by_suffix[file_meta.calc_suffix].append(file_meta)
+    return dict(by_suffix)
+
+
+def _has_required_vasp_files(vasp_files: list[FileMetadata]) -> bool:
+    """Check if the minimum number of VASP files needed for parsing are present."""
+    # TODO: update with vaspout.h5 parsing
+    return all(
+        any(f in file.name for file in vasp_files) for f in REQUIRED_VASP_FILES
+    )
+
 
 def discover_vasp_files(
     target_dir: FSPathType,
@@ -177,17 +225,8 @@ def discover_vasp_files(
     List of FileMetadata for the identified files.
     """
 
-    head_dir = Path(target_dir)
-    vasp_files: list[FileMetadata] = []
-    with os.scandir(head_dir) as scan_dir:
-        for p in scan_dir:
-            # Check that at least one VASP file matches the file name
-            if p.is_file() and any(f for f in _vasp_files if f in p.name):
-                vasp_files.append(FileMetadata(name=p.name, path=Path(p.path)))
-    by_suffix = defaultdict(list)
-    for file_meta in vasp_files:
-        by_suffix[file_meta.calc_suffix].append(file_meta)
-    return dict(by_suffix)  # type: ignore[arg-type]
+    _, vasp_files = _scan_vasp_directory(target_dir)
+    return _group_by_calc_suffix(vasp_files)
 
 
 def discover_and_sort_vasp_files(
@@ -235,13 +274,18 @@ def discover_and_sort_vasp_files(
     return dict(by_type)
 
 
-def recursive_discover_vasp_files(
+def iter_discover_vasp_files(
     target_dir: FSPathType,
     only_valid: bool = False,
     max_depth: int | None = None,
-) -> dict[CalculationLocator, list[FileMetadata]]:
+    num_workers: int | None = None,
+) -> Iterator[tuple[CalculationLocator, list[FileMetadata]]]:
     """
-    Recursively scan a target directory and identify VASP files.
+    Recursively scan a target directory, yielding calculations as they are found.
+
+    Each directory is listed only once, and directories are listed
+    concurrently in a thread pool, which helps on network and parallel
+    file systems. The order in which calculations are yielded is not fixed.
 
     Parameters
     -----------
@@ -253,53 +297,81 @@ def recursive_discover_vasp_files(
         If an int, the maximum depth with which directories are scanned
         for VASP files. For example, if max_depth == 1, this would only
         search `target_dir` and any immediate sub-directories in `target_dir`.
+    num_workers : int or None (default)
+        The number of threads used to list directories.
 
     Returns
     -----------
-    dict of Path  to list of FileMetadata identified as VASP files.
+    Iterator of CalculationLocator and the list of FileMetadata
+    identified as VASP files for that calculation.
     """
-
-    head_dir = Path(target_dir).resolve()
-
-    if max_depth and (max_depth < 0 or not isinstance(max_depth, int)):
+    if max_depth is not None and (max_depth < 0 or not isinstance(max_depth, int)):
         raise ValueError(
             "The maximum path depth should be a non-negative integer, "
             "with zero indicating that only the current directory should "
             "be searched."
         )
 
-    def _path_depth_check(tpath: FSPathType) -> bool:
-        if max_depth and (tp := Path(tpath).resolve()) != head_dir:
-            for depth, parent in enumerate(tp.parents):
-                if parent == head_dir:
-                    break
-            return depth + 1 <= max_depth
-        return True
+    head_dir = Path(target_dir).resolve()
+    pool = ThreadPoolExecutor(max_workers=num_workers)
+    try:
+        pending: dict[Future, tuple[Path, int]] = {
+            pool.submit(_scan_vasp_directory, head_dir): (head_dir, 0)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                tdir, depth = pending.pop(future)
+                sub_dirs, vasp_files = future.result()
+                if max_depth is None or depth < max_depth:
+                    for sub_dir in sub_dirs:
+                        pending[pool.submit(_scan_vasp_directory, sub_dir)] = (
+                            Path(sub_dir),
+                            depth + 1,
+                        )
 
-    def _recursive_discover_vasp_files(
-        tdir: FSPathType, paths: dict[CalculationLocator, list[FileMetadata]]
-    ) -> None:
-        if Path(tdir).is_dir() and _path_depth_check(tdir):
-            with os.scandir(tdir) as scan_dir:
-                for p in scan_dir:
-                    _recursive_discover_vasp_files(p, paths)
-
-            if tpaths_by_suffix := discover_vasp_files(tdir):
-                for calc_suffix, tpaths in tpaths_by_suffix.items():
-                    # Check if minimum number of VASP files are present
-                    # TODO: update with vaspout.h5 parsing
-                    if only_valid and any(
-                        not any(f in file.name for file in tpaths)
-                        for f in REQUIRED_VASP_FILES
-                    ):
+                for calc_suffix, tpaths in _group_by_calc_suffix(vasp_files).items():
+                    if only_valid and not _has_required_vasp_files(tpaths):
                         # Incomplete calculation input/output
                         continue
-                    paths[
-                        CalculationLocator(
-                            path=Path(tdir).resolve(), modifier=calc_suffix
-                        )
-                    ] = tpaths
+                    yield CalculationLocator(path=tdir, modifier=calc_suffix), tpaths
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
-    vasp_files: dict[CalculationLocator, list[FileMetadata]] = {}
-    _recursive_discover_vasp_files(target_dir, vasp_files)
-    return vasp_files
+def recursive_discover_vasp_files(
+    target_dir: FSPathType,
+    only_valid: bool = False,
+    max_depth: int | None = None,
+    num_workers: int | None = None,
+) -> dict[CalculationLocator, list[FileMetadata]]:
+    """
+    Recursively scan a target directory and identify VASP files.
+
+    See `iter_discover_vasp_files` to stream calculations as they are found.
+
+    Parameters
+    -----------
+    target_dir : FSPathType
+    only_valid : bool = False (default)
+        Whether to only include directories which have the required
+        minimum number of input and output files for parsing.
+    max_depth : non-negative int or None (default)
+        If an int, the maximum depth with which directories are scanned
+        for VASP files. For example, if max_depth == 1, this would only
+        search `target_dir` and any immediate sub-directories in `target_dir`.
+    num_workers : int or None (default)
+        The number of threads used to list directories.
+
+    Returns
+    -----------
+    dict of Path  to list of FileMetadata identified as VASP files.
+    """
+    return dict(
+        iter_discover_vasp_files(
+            target_dir,
+            only_valid=only_valid,
+            max_depth=max_depth,
+            num_workers=num_workers,
+        )
+    )
@@ -271,3 +271,48 @@ def test_PotcarSpec(test_dir):
     except (OSError, ValueError):
         # missing Pymatgen POTCARs, cannot perform test
         assert True
+
+
+@pytest.mark.parametrize("parse_bandstructure", ["auto", True])
+def test_calculation_bandstructure_single_parse(
+    test_dir, monkeypatch, parse_bandstructure
+):
+    import numpy as np
+
+    import emmet.core.vasp.calculation as calculation_module
+    from emmet.core.vasp.calculation import BSVasprun, Calculation
+
+    test_object = get_test_object("SiNonSCFUniform")
+    files = test_object.task_files["standard"]
+
+    with DataArchive.extract(
+        test_dir / "vasp" / f"{test_object.folder}.json.gz"
+    ) as dir_name:
+        # The band structure as built from a second parse with BSVasprun
+        bs_vrun = BSVasprun(
+            f"{dir_name}/{files['vasprun_file']}", parse_projected_eigen=True
+        )
+        try:
+            expected = bs_vrun.get_band_structure(line_mode=True, efermi="smart")
+        except Exception:
+            expected = bs_vrun.get_band_structure(efermi="smart")
+
+        def _no_reparse(*args, **kwargs):
+            raise AssertionError("vasprun.xml should only be parsed once")
+
+        monkeypatch.setattr(calculation_module, "BSVasprun", _no_reparse)
+        _, objects = Calculation.from_vasp_files(
+            dir_name,
+            "standard",
+            parse_bandstructure=parse_bandstructure,
+            use_emmet_models=False,
+            **files,
+        )
+
+    bs = objects["bandstructure"]
+    assert bs.efermi == pytest.approx(expected.efermi)
+    assert len(bs.kpoints) == len(expected.kpoints)
+    assert bs.bands.keys() == expected.bands.keys()
+    for spin, bands in expected.bands.items():
+        assert np.allclose(bs.bands[spin], bands)
+        assert np.allclose(bs.projections[spin], expected.projections[spin])
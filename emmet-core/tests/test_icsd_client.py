@@ -0,0 +1,41 @@
+import pytest
+
+from emmet.core.connectors.icsd.client import IcsdClient
+from emmet.core.connectors.icsd.enums import IcsdSubset
+
+
+@pytest.fixture
+def searched(monkeypatch):
+    searched = []
+
+    def _search_ids(self, subset=None, **kwargs):
+        return ["12", "3", "7", "100", "25"]
+
+    def _search(self, idxs, **kwargs):
+        searched.append(idxs)
+        return [{"collection_code": int(idx)} for idx in idxs]
+
+    monkeypatch.setattr(IcsdClient, "_search_ids", _search_ids)
+    monkeypatch.setattr(IcsdClient, "_search", _search)
+    return searched
+
+
+def test_iter_search(searched):
+    client = IcsdClient(
+        username="user", password="password", max_batch_size=3, use_document_model=False
+    )
+    pages = list(client.iter_search(subset=IcsdSubset.EXPERIMENTAL_INORGANIC))
+    # IDs are paged through in numerical order, with the last ID of each page
+    assert [last_id for last_id, _ in pages] == [12, 100]
+    assert searched == [["3", "7", "12"], ["25", "100"]]
+    assert all(
+        doc["subset"] == IcsdSubset.EXPERIMENTAL_INORGANIC
+        for _, docs in pages
+        for doc in docs
+    )
+
+    searched.clear()
+    pages = list(client.iter_search(batch_size=1, start_after=12))
+    assert [last_id for last_id, _ in pages] == [25, 100]
+    assert searched == [["25"], ["100"]]
+    assert list(client.iter_search(start_after=100)) == []
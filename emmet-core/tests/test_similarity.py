@@ -9,6 +9,7 @@ import numpy as np
 
 from emmet.core.similarity import (
     CrystalNNSimilarity,
+    IVFIndex,
     M3GNetSimilarity,
     matgl,
     vector_difference_matrix,
@@ -17,6 +18,7 @@ from emmet.core.similarity import (
     SimilarityEntry,
     _vector_from_hex_and_norm,
     _vector_to_hex_and_norm,
+    get_closest_vectors_blocked,
 )
 
 
@@ -154,6 +156,29 @@ def test_vector_diff_mat():
     assert np.all(np.abs(brute_force_diffs - vector_difference_matrix(vectors)) < 1e-12)
 
 
+def test_closest_vectors(tmp_dir):
+
+    vectors = np.random.default_rng(42).random((200, 11))
+    num = 5
+    idxs, dists = get_closest_vectors_blocked(vectors, num, block_size=17)
+    assert idxs.shape == dists.shape == (vectors.shape[0], num)
+
+    for i in range(vectors.shape[0]):
+        ref_idxs, ref_scores = SimilarityScorer._get_closest_vectors(i, vectors, num)
+        assert np.all(idxs[i] == ref_idxs)
+        assert np.allclose(SimilarityScorer._post_process_distance(dists[i]), ref_scores)
+
+    # Approximate index should recover the exact neighbors when all cells are probed
+    index = IVFIndex.from_vectors(vectors, num_lists=8)
+    index.save("ivf_index.npz")
+    loaded = IVFIndex.load("ivf_index.npz")
+    assert np.all(loaded.assignments == index.assignments)
+    for i in range(vectors.shape[0]):
+        ann_idxs, ann_dists = loaded.query(i, num, num_probe=8)
+        assert np.all(ann_idxs == idxs[i])
+        assert np.allclose(ann_dists, dists[i])
+
+
 def test_vendi():
 
     assert all(
@@ -1,9 +1,12 @@
+import re
+
 import pytest
 from monty.serialization import loadfn
 from pydantic import TypeAdapter
 
 from emmet.core import ARROW_COMPATIBLE
-from emmet.core.thermo import ThermoDoc
+from emmet.core.io.pymatgen import PhaseDiagram
+from emmet.core.thermo import ThermoDoc, _get_decomps_and_e_above_hull
 
 if ARROW_COMPATIBLE:
     import pyarrow as pa
@@ -155,6 +158,106 @@ def test_from_entries(entries):
     assert all([d.is_stable for d in docs if d != unstable_doc])
 
 
+@pytest.fixture(scope="module")
+def li_fe_o_entries(test_dir):
+    return loadfn(test_dir / "Li-Fe-O.json.gz")
+
+
+def _summarize_decomp(decomp):
+    return {entry.entry_id: pytest.approx(amt) for entry, amt in decomp.items()}
+
+
+def _fe_o_entries(li_fe_o_entries):
+    return [
+        entry
+        for entry in li_fe_o_entries
+        if entry.composition.chemical_system in {"Fe", "O", "Fe-O"}
+    ]
+
+
+def _summarize_doc(doc):
+    return (
+        doc.material_id,
+        doc.energy_above_hull,
+        doc.decomposition_enthalpy,
+        [
+            product.model_dump()
+            for product in doc.decomposition_enthalpy_decomposes_to or []
+        ],
+        doc.warnings,
+    )
+
+
+def test_from_entries_parallel(li_fe_o_entries):
+    entries = _fe_o_entries(li_fe_o_entries)
+    serial = ThermoDoc.from_entries(entries, thermo_type="GGA_GGA+U", deprecated=False)
+    parallel = ThermoDoc.from_entries(
+        entries, thermo_type="GGA_GGA+U", num_procs=2, deprecated=False
+    )
+    assert any(doc.decomposition_enthalpy is not None for doc in serial)
+    assert [_summarize_doc(doc) for doc in parallel] == [
+        _summarize_doc(doc) for doc in serial
+    ]
+
+
+def test_from_entries_without_decomposition_enthalpy(li_fe_o_entries):
+    entries = _fe_o_entries(li_fe_o_entries)
+    serial = ThermoDoc.from_entries(entries, thermo_type="GGA_GGA+U", deprecated=False)
+    docs = ThermoDoc.from_entries(
+        entries,
+        thermo_type="GGA_GGA+U",
+        compute_decomposition_enthalpy=False,
+        deprecated=False,
+    )
+    assert [doc.material_id for doc in docs] == [doc.material_id for doc in serial]
+    for doc, ref_doc in zip(docs, serial):
+        assert doc.decomposition_enthalpy is None
+        assert doc.decomposition_enthalpy_decomposes_to is None
+        assert doc.warnings == []
+        assert doc.energy_above_hull == ref_doc.energy_above_hull
+
+
+@pytest.mark.parametrize("max_block_elements", [2**24, 64])
+def test_get_decomps_and_e_above_hull(li_fe_o_entries, max_block_elements):
+    pd = PhaseDiagram(li_fe_o_entries)
+    assert len(pd.unstable_entries) > 0
+
+    results = _get_decomps_and_e_above_hull(
+        pd, li_fe_o_entries, max_block_elements=max_block_elements
+    )
+    assert len(results) == len(li_fe_o_entries)
+    for entry, (decomp, e_above_hull) in zip(li_fe_o_entries, results):
+        expected_decomp, expected_e_above_hull = pd.get_decomp_and_e_above_hull(entry)
+        assert e_above_hull == pytest.approx(expected_e_above_hull, abs=1e-10)
+        assert _summarize_decomp(decomp) == _summarize_decomp(expected_decomp)
+
+
+def test_get_decomps_and_e_above_hull_fallback(li_fe_o_entries):
+    fe_o_entries = [
+        entry
+        for entry in li_fe_o_entries
+        if entry.composition.chemical_system in {"Fe", "O", "Fe-O"}
+    ]
+    pd = PhaseDiagram(fe_o_entries)
+
+    # Entries below the hull, or outside of its chemical system, are
+    # evaluated by pymatgen, which raises the same errors
+    below_hull = min(
+        (e for e in fe_o_entries if e.composition.reduced_formula == "Fe2O3"),
+        key=lambda e: e.energy_per_atom,
+    ).copy()
+    below_hull.entry_id = "below-hull"
+    below_hull.correction -= 5.0
+    outside = next(
+        e for e in li_fe_o_entries if e.composition.chemical_system == "Fe-Li-O"
+    )
+    for entry in (below_hull, outside):
+        with pytest.raises(ValueError) as expected:
+            pd.get_decomp_and_e_above_hull(entry)
+        with pytest.raises(ValueError, match=re.escape(str(expected.value))):
+            _get_decomps_and_e_above_hull(pd, [fe_o_entries[0], entry])
+
+
 @pytest.mark.skipif(
     not ARROW_COMPATIBLE, reason="pyarrow must be installed to run this test."
 )
@@ -1,13 +1,24 @@
 import numpy as np
+import pytest
 from pytest import approx, fixture
 
 from monty.serialization import loadfn
 from emmet.core.io.pymatgen import Element, Structure, Molecule
 from pymatgen.core.trajectory import Trajectory as PmgTraj
 
+from emmet.core import ARROW_COMPATIBLE
 from emmet.core.tasks import TaskDoc
 from emmet.core.testing_utils import DataArchive
-from emmet.core.trajectory import Trajectory, RelaxTrajectory
+from emmet.core.trajectory import (
+    Trajectory,
+    TrajectoryArrays,
+    RelaxTrajectory,
+    read_trajectory_frames,
+    write_trajectory_frames,
+)
+
+if ARROW_COMPATIBLE:
+    import pyarrow.parquet as pa_pq
 
 
 @fixture(scope="module")
@@ -160,6 +171,154 @@ def test_pmg(si_traj):
     )
 
 
+def test_arrays(si_traj):
+    traj = si_traj[0]
+    arrays = traj.to_arrays()
+
+    assert arrays.cart_coords.shape == (traj.num_ionic_steps, len(traj.elements), 3)
+    assert arrays.properties["forces"].shape == arrays.cart_coords.shape
+    assert arrays.properties["energy"] == approx(traj.energy)
+    assert "electronic_steps" not in arrays.properties
+    assert "ionic_step_properties" not in arrays.metadata
+    assert arrays.metadata["task_type"] == traj.task_type.value
+
+    # frames and slices are views
+    frame = arrays.frame(-1)
+    assert np.shares_memory(frame.cart_coords, arrays.cart_coords)
+    assert np.shares_memory(arrays[1:3].cart_coords, arrays.cart_coords)
+    assert len(arrays[1:3]) == 2
+    # pymatgen frames also carry per-frame properties, so only compare sites
+    structure = frame.to_pmg()
+    ref_structure = traj.to_pmg(indices=traj.num_ionic_steps - 1)[0]
+    assert structure.lattice == ref_structure.lattice
+    assert structure.species == ref_structure.species
+    assert np.all(structure.cart_coords == ref_structure.cart_coords)
+
+    roundtrip = arrays.to_trajectory(RelaxTrajectory)
+    for k in ("cart_coords", "lattice", "energy", "forces", "stress", "task_type"):
+        assert np.all(np.array(getattr(roundtrip, k)) == np.array(getattr(traj, k)))
+
+    compact = traj.to_arrays(dtype=np.float32)
+    assert compact.cart_coords.dtype == np.float32
+    assert compact.cart_coords.nbytes == arrays.cart_coords.nbytes // 2
+
+
+@pytest.mark.skipif(
+    not ARROW_COMPATIBLE, reason="pyarrow must be installed to run this test."
+)
+def test_arrays_arrow(si_traj):
+    arrays = si_traj[0].to_arrays()
+    table = arrays.to_arrow()
+    assert table.num_rows == len(arrays)
+
+    new_arrays = TrajectoryArrays.from_arrow(table)
+    assert np.all(new_arrays.cart_coords == arrays.cart_coords)
+    assert np.all(new_arrays.lattice == arrays.lattice)
+    assert np.all(new_arrays.elements == arrays.elements)
+    assert set(new_arrays.properties) == set(arrays.properties)
+    for k, v in arrays.properties.items():
+        assert np.all(new_arrays.properties[k] == v)
+    assert new_arrays.metadata == arrays.metadata
+
+
+@pytest.mark.skipif(
+    not ARROW_COMPATIBLE, reason="pyarrow must be installed to run this test."
+)
+def test_frame_parquet(si_traj, tmp_dir):
+    trajs = [
+        traj.model_copy(update={"identifier": f"traj-{i}"})
+        for i, traj in enumerate(si_traj)
+    ]
+    write_trajectory_frames(trajs, "frames.parquet", row_group_size=2)
+
+    table = read_trajectory_frames("frames.parquet")
+    assert table.num_rows == sum(len(traj) for traj in trajs)
+
+    arrays = TrajectoryArrays.from_frame_table(table, identifier="traj-0")
+    ref = trajs[0].to_arrays()
+    assert np.all(arrays.cart_coords == ref.cart_coords)
+    assert np.all(arrays.lattice == ref.lattice)
+    for k, v in ref.properties.items():
+        assert np.all(arrays.properties[k] == v)
+
+    subset = read_trajectory_frames(
+        "frames.parquet", identifier="traj-0", steps=(1, 3)
+    )
+    assert subset["step"].to_pylist() == [1, 2]
+    assert np.all(
+        TrajectoryArrays.from_frame_table(subset).cart_coords == ref.cart_coords[1:3]
+    )
+
+    max_forces = table["max_force"].to_numpy()
+    for max_force in (max_forces.min(), max_forces.max()):
+        low_force = read_trajectory_frames("frames.parquet", max_force=max_force)
+        assert low_force.num_rows == (max_forces <= max_force).sum()
+    assert read_trajectory_frames("frames.parquet", max_force=-1.0).num_rows == 0
+    with pytest.raises(ValueError, match="no frames"):
+        TrajectoryArrays.from_frame_table(
+            read_trajectory_frames("frames.parquet", max_force=-1.0)
+        )
+    with pytest.raises(ValueError, match="no frames for trajectory missing"):
+        TrajectoryArrays.from_frame_table(table, identifier="missing")
+
+    no_ids = read_trajectory_frames(
+        "frames.parquet",
+        identifier="traj-0",
+        columns=["step", "elements", "lattice", "cart_coords"],
+    )
+    assert np.all(
+        TrajectoryArrays.from_frame_table(no_ids).cart_coords == ref.cart_coords
+    )
+
+    emin = min(trajs[0].energy)
+    assert read_trajectory_frames(
+        "frames.parquet", identifier="traj-0", energy=(None, emin)
+    )["energy"].to_pylist() == [e for e in trajs[0].energy if e <= emin]
+
+
+@pytest.mark.skipif(
+    not ARROW_COMPATIBLE, reason="pyarrow must be installed to run this test."
+)
+def test_frame_parquet_multiple_trajectories(si_traj, tmp_dir):
+    trajs = [
+        traj.model_copy(update={"identifier": f"traj-{i}"}).to_arrays()
+        for i, traj in enumerate(si_traj * 2)
+    ]
+    # Columns missing from later trajectories are filled with nulls
+    trajs[-1].properties.pop("stress")
+
+    write_trajectory_frames(iter(trajs), "frames.parquet", row_group_size=3)
+    metadata = pa_pq.ParquetFile("frames.parquet").metadata
+    assert metadata.num_row_groups > 1
+    # Only the last row group is smaller than row_group_size
+    assert all(
+        metadata.row_group(i).num_rows == 3
+        for i in range(metadata.num_row_groups - 1)
+    )
+    table = read_trajectory_frames("frames.parquet")
+    assert table["identifier"].unique().to_pylist() == [
+        traj.metadata["identifier"] for traj in trajs
+    ]
+
+    for traj in trajs:
+        identifier = traj.metadata["identifier"]
+        arrays = TrajectoryArrays.from_frame_table(table, identifier=identifier)
+        assert arrays.metadata == traj.metadata
+        assert np.all(arrays.cart_coords == traj.cart_coords)
+        assert np.all(arrays.lattice == traj.lattice)
+        assert set(arrays.properties) == set(traj.properties)
+        for k, v in traj.properties.items():
+            assert np.all(arrays.properties[k] == v)
+
+    # Columns missing from the first trajectory need an explicit schema
+    with pytest.raises(ValueError, match="not in the schema"):
+        write_trajectory_frames(trajs[::-1], "reversed.parquet")
+    write_trajectory_frames(
+        trajs[::-1], "reversed.parquet", schema=trajs[0].to_frame_table().schema
+    )
+    assert read_trajectory_frames("reversed.parquet").num_rows == table.num_rows
+
+
 def test_mixed_calc_type(test_dir):
     # Test that Trajectory correctly creates new Trajectories for every
     # sequential calculation of different CalcType
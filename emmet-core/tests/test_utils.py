@@ -1,6 +1,8 @@
 import datetime
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -8,12 +10,14 @@ from bson.objectid import ObjectId
 from monty.json import MSONable
 from monty.serialization import loadfn
 
+from emmet.core.io.pymatgen import Lattice, Structure
 from emmet.core.tasks import TaskDoc
 from emmet.core.utils import (
     convert_datetime,
     dynamic_import,
     get_flat_models_from_model,
     get_hash_blocked,
+    group_structures,
     jsanitize,
     utcnow,
 )
@@ -126,6 +130,54 @@ def test_model_flatten():
     }
 
 
+def test_group_structures():
+    si = Structure(
+        Lattice.cubic(5.47),
+        ["Si"] * 2,
+        [[0.0, 0.0, 0.0], [0.25, 0.25, 0.25]],
+    ).to_conventional()
+    fcc = Structure(Lattice.cubic(3.6), ["Si"], [[0.0, 0.0, 0.0]])
+    bcc = Structure(Lattice.cubic(3.0), ["Si"] * 2, [[0, 0, 0], [0.5, 0.5, 0.5]])
+    structures = [
+        si,
+        fcc,
+        si.copy().scale_lattice(1.05 * si.volume),
+        bcc,
+        fcc.copy().scale_lattice(1.1 * fcc.volume),
+        si.copy().perturb(0.01, min_distance=0.005, seed=42),
+    ]
+    for idx, struct in enumerate(structures):
+        struct.index = idx
+
+    serial = [[s.index for s in group] for group in group_structures(structures)]
+    assert sorted(sorted(group) for group in serial) == [[0, 2, 5], [1, 4], [3]]
+
+    # Small sets of structures are grouped serially, without a pool
+    with patch("emmet.core.utils.ProcessPoolExecutor") as mock_pool:
+        assert [
+            [s.index for s in group]
+            for group in group_structures(structures, num_procs=2)
+        ] == serial
+        mock_pool.assert_not_called()
+
+    with patch("emmet.core.utils.GROUP_STRUCTURES_PARALLEL_THRESHOLD", 0):
+        parallel = list(group_structures(structures, num_procs=2))
+        assert [[s.index for s in group] for group in parallel] == serial
+        # Original objects are returned, not worker copies
+        assert all(
+            s is structures[s.index] for group in parallel for s in group  # type: ignore[index]
+        )
+
+        # An injected executor is reused and left running
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for _ in range(2):
+                assert [
+                    [s.index for s in group]
+                    for group in group_structures(structures, executor=executor)
+                ] == serial
+            assert executor.submit(int, 1).result() == 1
+
+
 def test_import():
 
     assert dynamic_import("emmet.core.tasks.TaskDoc") == TaskDoc
@@ -5,6 +5,7 @@ from pathlib import Path
 import pytest
 
 from emmet.core.vasp.utils import (
+    iter_discover_vasp_files,
     recursive_discover_vasp_files,
     discover_and_sort_vasp_files,
     FileMetadata,
@@ -82,6 +83,19 @@ def test_file_discovery():
 
         assert len(recursive_discover_vasp_files(tmp_dir, max_depth=2)) == 4
         assert len(recursive_discover_vasp_files(tmp_dir, max_depth=1)) == 1
+        assert len(recursive_discover_vasp_files(tmp_dir, max_depth=0)) == 0
+
+        # streamed results match, regardless of the number of threads
+        for num_workers in (1, 4):
+            streamed = list(iter_discover_vasp_files(tmp_dir, num_workers=num_workers))
+            assert len(streamed) == len(vasp_files)
+            assert {
+                locator: {file_meta.path for file_meta in files}
+                for locator, files in streamed
+            } == {
+                locator: {file_meta.path for file_meta in files}
+                for locator, files in vasp_files.items()
+            }
 
         files_by_calc_suffix = discover_and_sort_vasp_files(
             tmp_dir / "block_2025_02_30/launcher_2025_02_31/launcher_2025_02_31_0001"
@@ -174,3 +174,21 @@ def test_from_file_meta_and_dir(test_dir):
             # these contain time-stamped fields that won't match
             continue
         assert getattr(valid_doc_from_meta, k) == getattr(valid_doc_from_dir, k)
+
+
+def test_read_vasprun_incar(test_dir):
+    from emmet.core.vasp.calculation import (
+        _bandstructure_needs_projections,
+        _read_vasprun_incar,
+    )
+
+    vasprun_file = test_dir / "lobster/mp-2534/vasprun.xml.gz"
+    incar = _read_vasprun_incar(vasprun_file)
+    assert incar["NSW"] == 0
+    assert incar["ISPIN"] == 2
+    assert incar["LWAVE"] is True
+
+    # not an NSCF calculation
+    assert not _bandstructure_needs_projections("auto", vasprun_file)
+    assert _bandstructure_needs_projections("line", vasprun_file)
+    assert not _bandstructure_needs_projections(False, vasprun_file)